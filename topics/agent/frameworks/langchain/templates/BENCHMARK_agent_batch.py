@@ -0,0 +1,56 @@
+"""Benchmark: sequential `run_agent` versus `run_agents_batch` against a fake model with latency.
+
+Run with `python -m topics.agent.frameworks.langchain.templates.BENCHMARK_agent_batch`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from topics.agent.frameworks.langchain.templates.SKELETON_langchain_agent import (
+    CHAT_MODELS,
+    AgentConfig,
+    AgentInput,
+    run_agent,
+    run_agents_batch,
+)
+from topics.agent.frameworks.langchain.templates.fake_chat_models import ToolCallingFakeChatModel, structured_replies
+
+
+REQUESTS = 100
+MODEL_LATENCY_S = 0.02
+
+
+class SlowToolCallingFakeChatModel(ToolCallingFakeChatModel):
+    """Fake chat model that sleeps `MODEL_LATENCY_S` per call to stand in for provider latency."""
+
+    def _generate(self, *args, **kwargs):
+        time.sleep(MODEL_LATENCY_S)
+        return super()._generate(*args, **kwargs)
+
+    async def _agenerate(self, *args, **kwargs):
+        await asyncio.sleep(MODEL_LATENCY_S)
+        return super()._generate(*args, **kwargs)
+
+
+def main() -> None:
+    CHAT_MODELS["fake:slow"] = SlowToolCallingFakeChatModel(messages=structured_replies())
+    config = AgentConfig(model="fake:slow")
+    agent_inputs = [AgentInput(user_query=f"query {index}") for index in range(REQUESTS)]
+
+    start = time.perf_counter()
+    for agent_input in agent_inputs:
+        run_agent(agent_input, config)
+    sequential_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    run_agents_batch(agent_inputs, config, max_concurrency=16)
+    batch_s = time.perf_counter() - start
+
+    print(f"sequential run_agent: {REQUESTS / sequential_s:,.1f} requests/s")
+    print(f"run_agents_batch(16): {REQUESTS / batch_s:,.1f} requests/s")
+
+
+if __name__ == "__main__":
+    main()
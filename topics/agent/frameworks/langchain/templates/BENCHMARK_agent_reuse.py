@@ -0,0 +1,53 @@
+"""Benchmark: per-request `create_agent` (cold) versus cached `get_agent` (warm) latency.
+
+Uses a tool-calling fake chat model, so no provider calls are made.
+Run with `python -m topics.agent.frameworks.langchain.templates.BENCHMARK_agent_reuse`.
+"""
+
+from __future__ import annotations
+
+import time
+
+from langchain.agents import create_agent
+
+from topics.agent.frameworks.langchain.templates.SKELETON_langchain_agent import (
+    CHAT_MODELS,
+    TOOL_REGISTRY,
+    AgentConfig,
+    AgentInput,
+    AgentOutput,
+    run_agent,
+)
+from topics.agent.frameworks.langchain.templates.fake_chat_models import ToolCallingFakeChatModel, structured_replies
+
+
+REQUESTS = 200
+
+
+def _ms_per_request(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        fn()
+    return (time.perf_counter() - start) * 1000 / REQUESTS
+
+
+def main() -> None:
+    CHAT_MODELS["fake:structured"] = ToolCallingFakeChatModel(messages=structured_replies())
+    config = AgentConfig(model="fake:structured")
+    agent_input = AgentInput(user_query="What is the answer?")
+
+    def cold() -> None:
+        agent = create_agent(
+            model=CHAT_MODELS[config.model],
+            tools=[TOOL_REGISTRY[name] for name in config.tool_names],
+            system_prompt=config.system_prompt,
+            response_format=AgentOutput,
+        )
+        agent.invoke({"messages": [{"role": "user", "content": agent_input.user_query}]})
+
+    print(f"cold (create_agent per request): {_ms_per_request(cold):.2f} ms/request")
+    print(f"warm (cached get_agent):         {_ms_per_request(lambda: run_agent(agent_input, config)):.2f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,23 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
+import threading
 import time
 import uuid
-from logging.handlers import RotatingFileHandler
-from pathlib import Path
+from collections.abc import AsyncIterator, Iterator
 from typing import Any
 
 from langchain.agents import create_agent
-from langchain_core.tools import tool
-from pydantic import BaseModel, Field
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+from langchain_core.tools import BaseTool, tool
+from pydantic import BaseModel, ConfigDict, Field
+
+from topics.agent.shared.logging_adapter import build_file_logger, log_event
+from topics.agent.shared.structured_models import AgentStep
+from topics.agent.shared.tool_cache import cacheable
 
 
 class AgentInput(BaseModel):
@@ -24,73 +30,300 @@ class AgentOutput(BaseModel):
     tool_used: str | None = Field(default=None, description="Tool used if any")
 
 
+class AgentError(BaseModel):
+    request_id: str = Field(..., description="request_id of the item's invoke_failed log event")
+    index: int = Field(..., description="Position of the failed item in the batch input")
+    error_type: str = Field(..., description="Exception class name")
+    error_message: str = Field(..., description="Exception message")
+
+
+class AgentStreamEvent(BaseModel):
+    """One incremental event of a streamed run; `step.operation` says which payload is set.
+
+    Operations: `model_token` (token), `tool_call_start` / `tool_call_end` (step.tool_name),
+    `final_output` (output).
+    """
+
+    step: AgentStep
+    token: str | None = None
+    output: AgentOutput | None = None
+
+
 class SearchArgs(BaseModel):
     query: str = Field(..., description="Search query")
 
 
+@cacheable(ttl_s=600)
 @tool(args_schema=SearchArgs)
 def dummy_search(query: str) -> str:
     """Search an internal corpus (stub)."""
     return f"top result for: {query}"
 
 
+class AgentConfig(BaseModel):
+    """Hashable agent configuration; each distinct value is compiled once by `get_agent`."""
+
+    model_config = ConfigDict(frozen=True)
+
+    model: str = Field(default="openai:gpt-4o-mini", description="Provider model id or CHAT_MODELS key")
+    tool_names: tuple[str, ...] = Field(default=("dummy_search",), description="Keys of TOOL_REGISTRY")
+    system_prompt: str = "You are a precise assistant. Always return structured output."
+
+
+TOOL_REGISTRY: dict[str, BaseTool] = {"dummy_search": dummy_search}
+
+# Pre-built chat model instances (e.g. fakes in tests/benchmarks) addressable by AgentConfig.model.
+CHAT_MODELS: dict[str, BaseChatModel] = {}
+
+_agents: dict[AgentConfig, Any] = {}
+_agents_lock = threading.Lock()
+
+
+def get_agent(config: AgentConfig | None = None) -> Any:
+    """Return the compiled agent for `config`, building it on first use only.
+
+    Compiled agents keep no per-request state, so one instance is shared by concurrent callers;
+    the lock only guards the first build of each configuration.
+    """
+    config = config or AgentConfig()
+    agent = _agents.get(config)
+    if agent is not None:
+        return agent
+    with _agents_lock:
+        agent = _agents.get(config)
+        if agent is None:
+            agent = create_agent(
+                model=CHAT_MODELS.get(config.model, config.model),
+                tools=[TOOL_REGISTRY[name] for name in config.tool_names],
+                system_prompt=config.system_prompt,
+                response_format=AgentOutput,
+            )
+            _agents[config] = agent
+    return agent
+
+
+def clear_agent_cache() -> None:
+    with _agents_lock:
+        _agents.clear()
+
+
 def build_logger(
     logger_name: str = "langchain_agent",
     log_file: str = "logs/langchain_agent.log",
     max_bytes: int = 10 * 1024 * 1024,
     backup_count: int = 5,
+    *,
+    async_mode: bool = False,
 ) -> logging.Logger:
-    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
-    logger = logging.getLogger(logger_name)
-    logger.setLevel(logging.DEBUG)
-    logger.handlers.clear()
+    # async_mode=True moves file writes and rotation off the request path onto a writer thread.
+    return build_file_logger(logger_name, log_file, max_bytes, backup_count, async_mode=async_mode)
 
-    handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
-    handler.setLevel(logging.DEBUG)
-    handler.setFormatter(logging.Formatter('%(message)s'))
-    logger.addHandler(handler)
-    return logger
 
-
-def log_event(logger: logging.Logger, **payload: Any) -> None:
-    logger.debug(json.dumps(payload, ensure_ascii=False))
-
-
-def run_agent(agent_input: AgentInput) -> AgentOutput:
-    request_id = str(uuid.uuid4())
-    logger = build_logger()
-
-    agent = create_agent(
-        model="openai:gpt-4o-mini",
-        tools=[dummy_search],
-        system_prompt="You are a precise assistant. Always return structured output.",
-        response_format=AgentOutput,
-    )
-
-    start = time.perf_counter()
+def _log_start(logger: logging.Logger, request_id: str, agent_input: AgentInput) -> None:
     log_event(
         logger,
-        timestamp=time.strftime("%Y-%m-%dT%H:%M:%S%z"),
         request_id=request_id,
         agent_type="create_agent",
         operation="invoke_start",
         status="pending",
-        input=agent_input.model_dump(),
+        input=agent_input,
     )
 
-    result = agent.invoke({"messages": [{"role": "user", "content": agent_input.user_query}]})
+
+def _log_failure(logger: logging.Logger, request_id: str, start: float, exc: Exception) -> None:
+    log_event(
+        logger,
+        request_id=request_id,
+        agent_type="create_agent",
+        operation="invoke_failed",
+        status="failure",
+        duration_ms=int((time.perf_counter() - start) * 1000),
+        error_type=type(exc).__name__,
+        error_message=str(exc),
+    )
+
+
+def _complete(logger: logging.Logger, request_id: str, start: float, result: dict[str, Any]) -> AgentOutput:
     structured = result["structured_response"]
     duration_ms = int((time.perf_counter() - start) * 1000)
 
     log_event(
         logger,
-        timestamp=time.strftime("%Y-%m-%dT%H:%M:%S%z"),
         request_id=request_id,
         agent_type="create_agent",
         operation="invoke_complete",
         status="success",
         duration_ms=duration_ms,
-        output=structured.model_dump(),
+        output=structured,
     )
 
     return structured
+
+
+def run_agent(agent_input: AgentInput, config: AgentConfig | None = None) -> AgentOutput:
+    request_id = str(uuid.uuid4())
+    logger = build_logger()
+    agent = get_agent(config)
+
+    start = time.perf_counter()
+    _log_start(logger, request_id, agent_input)
+    try:
+        result = agent.invoke({"messages": [{"role": "user", "content": agent_input.user_query}]})
+    except Exception as exc:
+        _log_failure(logger, request_id, start, exc)
+        raise
+    return _complete(logger, request_id, start, result)
+
+
+async def arun_agent(agent_input: AgentInput, config: AgentConfig | None = None) -> AgentOutput:
+    return await _arun_agent(agent_input, config, str(uuid.uuid4()))
+
+
+async def _arun_agent(agent_input: AgentInput, config: AgentConfig | None, request_id: str) -> AgentOutput:
+    logger = build_logger()
+    agent = get_agent(config)
+
+    start = time.perf_counter()
+    _log_start(logger, request_id, agent_input)
+    try:
+        result = await agent.ainvoke({"messages": [{"role": "user", "content": agent_input.user_query}]})
+    except Exception as exc:
+        _log_failure(logger, request_id, start, exc)
+        raise
+    return _complete(logger, request_id, start, result)
+
+
+async def arun_agents_batch(
+    agent_inputs: list[AgentInput],
+    config: AgentConfig | None = None,
+    max_concurrency: int = 8,
+) -> list[AgentOutput | AgentError]:
+    """Run many inputs concurrently, at most `max_concurrency` at once, in input order.
+
+    A failing item yields an `AgentError` instead of aborting the batch; every item is logged
+    with its own `request_id` and `duration_ms`, and an `AgentError` carries that `request_id`
+    and the item's `index`.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be >= 1")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(index: int, agent_input: AgentInput) -> AgentOutput | AgentError:
+        request_id = str(uuid.uuid4())
+        async with semaphore:
+            try:
+                return await _arun_agent(agent_input, config, request_id)
+            except Exception as exc:
+                return AgentError(
+                    request_id=request_id, index=index, error_type=type(exc).__name__, error_message=str(exc)
+                )
+
+    return list(await asyncio.gather(*(run_one(index, agent_input) for index, agent_input in enumerate(agent_inputs))))
+
+
+def run_agents_batch(
+    agent_inputs: list[AgentInput],
+    config: AgentConfig | None = None,
+    max_concurrency: int = 8,
+) -> list[AgentOutput | AgentError]:
+    """Blocking entry point for batch jobs; do not call from inside a running event loop."""
+    return asyncio.run(arun_agents_batch(agent_inputs, config, max_concurrency))
+
+
+_STREAM_MODES = ["messages", "updates"]
+
+
+class _StreamTranslator:
+    """Maps LangGraph `messages`/`updates` stream parts onto `AgentStreamEvent`s for one request."""
+
+    def __init__(self, request_id: str) -> None:
+        self.request_id = request_id
+        self.output: AgentOutput | None = None
+
+    def translate(self, mode: str, chunk: Any) -> Iterator[AgentStreamEvent]:
+        if mode == "messages":
+            message, _metadata = chunk
+            if isinstance(message, AIMessageChunk) and message.content:
+                yield AgentStreamEvent(
+                    step=AgentStep(step_id=message.id or self.request_id, operation="model_token", status="pending"),
+                    token=message.text,
+                )
+            return
+
+        for node_update in chunk.values():
+            if not isinstance(node_update, dict):
+                continue
+            for message in node_update.get("messages", ()):
+                if isinstance(message, AIMessage):
+                    for tool_call in message.tool_calls:
+                        # The structured-output pseudo tool is reported as `final_output` instead.
+                        if tool_call["name"] == AgentOutput.__name__:
+                            continue
+                        yield AgentStreamEvent(
+                            step=AgentStep(
+                                step_id=tool_call["id"] or self.request_id,
+                                operation="tool_call_start",
+                                status="pending",
+                                tool_name=tool_call["name"],
+                            )
+                        )
+                elif isinstance(message, ToolMessage) and message.name != AgentOutput.__name__:
+                    yield AgentStreamEvent(
+                        step=AgentStep(
+                            step_id=message.tool_call_id,
+                            operation="tool_call_end",
+                            status="failure" if message.status == "error" else "success",
+                            tool_name=message.name,
+                        )
+                    )
+            structured = node_update.get("structured_response")
+            if structured is not None:
+                self.output = structured
+                yield AgentStreamEvent(
+                    step=AgentStep(step_id=self.request_id, operation="final_output", status="success"),
+                    output=structured,
+                )
+
+
+def stream_agent(agent_input: AgentInput, config: AgentConfig | None = None) -> Iterator[AgentStreamEvent]:
+    """Yield tokens, tool call start/end and the final `AgentOutput` as they are produced.
+
+    Logging matches `run_agent`: one `invoke_start` and one `invoke_complete` or `invoke_failed`
+    per request, so `duration_ms` still measures the whole run rather than time to first event.
+    """
+    request_id = str(uuid.uuid4())
+    logger = build_logger()
+    agent = get_agent(config)
+    translator = _StreamTranslator(request_id)
+
+    start = time.perf_counter()
+    _log_start(logger, request_id, agent_input)
+    try:
+        for mode, chunk in agent.stream(
+            {"messages": [{"role": "user", "content": agent_input.user_query}]}, stream_mode=_STREAM_MODES
+        ):
+            yield from translator.translate(mode, chunk)
+    except Exception as exc:
+        _log_failure(logger, request_id, start, exc)
+        raise
+    _complete(logger, request_id, start, {"structured_response": translator.output})
+
+
+async def astream_agent(agent_input: AgentInput, config: AgentConfig | None = None) -> AsyncIterator[AgentStreamEvent]:
+    request_id = str(uuid.uuid4())
+    logger = build_logger()
+    agent = get_agent(config)
+    translator = _StreamTranslator(request_id)
+
+    start = time.perf_counter()
+    _log_start(logger, request_id, agent_input)
+    try:
+        async for mode, chunk in agent.astream(
+            {"messages": [{"role": "user", "content": agent_input.user_query}]}, stream_mode=_STREAM_MODES
+        ):
+            for event in translator.translate(mode, chunk):
+                yield event
+    except Exception as exc:
+        _log_failure(logger, request_id, start, exc)
+        raise
+    _complete(logger, request_id, start, {"structured_response": translator.output})
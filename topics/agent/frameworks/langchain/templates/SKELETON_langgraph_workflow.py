@@ -1,6 +1,11 @@
+from functools import partial
+
 from langgraph.graph import StateGraph, START, END
 from typing_extensions import TypedDict
 
+from topics.agent.shared.logging_adapter import build_topic_logger
+from topics.agent.shared.node_metrics import NodeMetrics
+
 # Define a shared state type
 class WorkflowState(TypedDict):
     user_input: str
@@ -14,10 +19,13 @@ def agent_one(state: WorkflowState) -> dict:
 def agent_two(state: WorkflowState) -> dict:
     return {"ai2_output": state["ai1_output"][::-1]}
 
+# Per-node wall/CPU time, state size and token events, plus node_metrics.summary()
+node_metrics = NodeMetrics(partial(build_topic_logger, "agent", "workflow_nodes"), graph_name="workflow")
+
 # 1) Build graph
 graph = StateGraph(WorkflowState)
-graph.add_node("agent1", agent_one)
-graph.add_node("agent2", agent_two)
+graph.add_node("agent1", node_metrics.wrap("agent1", agent_one))
+graph.add_node("agent2", node_metrics.wrap("agent2", agent_two))
 graph.add_edge(START, "agent1")
 graph.add_edge("agent1", "agent2")
 graph.add_edge("agent2", END)
@@ -25,5 +33,7 @@ graph.add_edge("agent2", END)
 # 2) Run workflow
 if __name__ == "__main__":
     initial = {"user_input": "hello"}
-    result = graph.invoke(initial)
+    result = graph.compile().invoke(initial)
     print(result)
+    for row in node_metrics.summary():
+        print(row.model_dump())
@@ -0,0 +1,24 @@
+"""Scripted chat models for tests and benchmarks of the LangChain agent skeleton; no provider calls."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+
+class ToolCallingFakeChatModel(GenericFakeChatModel):
+    """`GenericFakeChatModel` that accepts `bind_tools`, as `create_agent` requires."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def structured_replies(answer: str = "42") -> Iterator[AIMessage]:
+    """Endless replies that call the `AgentOutput` response tool with `answer`."""
+    while True:
+        yield AIMessage(
+            content="",
+            tool_calls=[{"name": "AgentOutput", "args": {"answer": answer, "tool_used": None}, "id": "call_1"}],
+        )
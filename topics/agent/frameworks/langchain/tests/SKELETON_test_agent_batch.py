@@ -0,0 +1,59 @@
+import asyncio
+import json
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from topics.agent.frameworks.langchain.templates.SKELETON_langchain_agent import (
+    CHAT_MODELS,
+    AgentConfig,
+    AgentError,
+    AgentInput,
+    AgentOutput,
+    build_logger,
+    run_agents_batch,
+)
+from topics.agent.frameworks.langchain.templates.fake_chat_models import ToolCallingFakeChatModel
+
+
+class EchoingFakeChatModel(ToolCallingFakeChatModel):
+    """Answers with the user query after a short await; fails on queries containing 'boom'."""
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(0.01)
+        query = messages[-1].content
+        if "boom" in query:
+            raise ValueError(f"model failed on {query}")
+        self.messages = iter([
+            AIMessage(
+                content="",
+                tool_calls=[{"name": "AgentOutput", "args": {"answer": query, "tool_used": None}, "id": "call_1"}],
+            )
+        ])
+        return self._generate(messages, stop=stop, run_manager=None, **kwargs)
+
+
+def test_run_agents_batch_returns_outputs_and_structured_errors_in_order() -> None:
+    CHAT_MODELS["fake:echo"] = EchoingFakeChatModel(messages=iter([]))
+    agent_inputs = [AgentInput(user_query=query) for query in ["a", "boom", "c"]]
+
+    results = run_agents_batch(agent_inputs, AgentConfig(model="fake:echo", tool_names=()), max_concurrency=2)
+
+    assert isinstance(results[0], AgentOutput) and results[0].answer == "a"
+    error = results[1]
+    assert isinstance(error, AgentError) and error.index == 1
+    assert (error.error_type, error.error_message) == ("ValueError", "model failed on boom")
+    assert isinstance(results[2], AgentOutput) and results[2].answer == "c"
+
+    for handler in build_logger().handlers:
+        handler.flush()
+    log_file = build_logger().handlers[0].baseFilename
+    with open(log_file, encoding="utf-8") as handle:
+        events = [json.loads(line) for line in handle]
+    failed = [event for event in events if event["operation"] == "invoke_failed"]
+    assert error.request_id in {event["request_id"] for event in failed}
+
+
+def test_run_agents_batch_rejects_non_positive_concurrency() -> None:
+    with pytest.raises(ValueError, match="max_concurrency"):
+        run_agents_batch([AgentInput(user_query="a")], max_concurrency=0)
@@ -0,0 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from topics.agent.frameworks.langchain.templates.SKELETON_langchain_agent import (
+    CHAT_MODELS,
+    AgentConfig,
+    AgentInput,
+    clear_agent_cache,
+    get_agent,
+    run_agent,
+)
+from topics.agent.frameworks.langchain.templates.fake_chat_models import ToolCallingFakeChatModel, structured_replies
+
+
+def test_get_agent_builds_each_config_once() -> None:
+    CHAT_MODELS["fake:structured"] = ToolCallingFakeChatModel(messages=structured_replies())
+    clear_agent_cache()
+    config = AgentConfig(model="fake:structured")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        agents = list(pool.map(lambda _: get_agent(AgentConfig(model="fake:structured")), range(16)))
+
+    assert all(agent is agents[0] for agent in agents)
+    assert get_agent(config.model_copy(update={"tool_names": ()})) is not agents[0]
+    assert run_agent(AgentInput(user_query="q"), config).answer == "42"
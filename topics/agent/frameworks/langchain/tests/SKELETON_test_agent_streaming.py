@@ -0,0 +1,73 @@
+import asyncio
+import json
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+
+from topics.agent.frameworks.langchain.templates.SKELETON_langchain_agent import (
+    CHAT_MODELS,
+    AgentConfig,
+    AgentInput,
+    AgentOutput,
+    astream_agent,
+    stream_agent,
+)
+from topics.agent.frameworks.langchain.templates.fake_chat_models import ToolCallingFakeChatModel
+
+
+class StreamingFakeChatModel(ToolCallingFakeChatModel):
+    """Streams content word by word, then the scripted tool calls as a single chunk."""
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        message = next(self.messages)
+        for word in message.content.split():
+            yield ChatGenerationChunk(message=AIMessageChunk(content=f"{word} "))
+        tool_call_chunks = [
+            {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": index}
+            for index, call in enumerate(message.tool_calls)
+        ]
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=tool_call_chunks))
+
+
+def _script() -> StreamingFakeChatModel:
+    return StreamingFakeChatModel(
+        messages=iter([
+            AIMessage(
+                content="Let me search",
+                tool_calls=[{"name": "dummy_search", "args": {"query": "x"}, "id": "call_1"}],
+            ),
+            AIMessage(
+                content="Found it",
+                tool_calls=[{"name": "AgentOutput", "args": {"answer": "42", "tool_used": "dummy_search"}, "id": "call_2"}],
+            ),
+        ])
+    )
+
+
+def _expected_operations() -> list[str]:
+    return ["model_token"] * 3 + ["tool_call_start", "tool_call_end"] + ["model_token"] * 2 + ["final_output"]
+
+
+def test_stream_agent_yields_tokens_tool_steps_and_final_output_in_order() -> None:
+    CHAT_MODELS["fake:stream"] = _script()
+
+    events = list(stream_agent(AgentInput(user_query="x"), AgentConfig(model="fake:stream")))
+
+    assert [event.step.operation for event in events] == _expected_operations()
+    assert "".join(event.token for event in events if event.token) == "Let me search Found it "
+    tool_start, tool_end = events[3], events[4]
+    assert (tool_start.step.tool_name, tool_start.step.step_id, tool_start.step.status) == ("dummy_search", "call_1", "pending")
+    assert (tool_end.step.tool_name, tool_end.step.step_id, tool_end.step.status) == ("dummy_search", "call_1", "success")
+    assert events[-1].output == AgentOutput(answer="42", tool_used="dummy_search")
+
+
+def test_astream_agent_matches_sync_event_sequence() -> None:
+    CHAT_MODELS["fake:astream"] = _script()
+
+    async def collect():
+        return [event async for event in astream_agent(AgentInput(user_query="x"), AgentConfig(model="fake:astream"))]
+
+    events = asyncio.run(collect())
+
+    assert [event.step.operation for event in events] == _expected_operations()
+    assert events[-1].output == AgentOutput(answer="42", tool_used="dummy_search")
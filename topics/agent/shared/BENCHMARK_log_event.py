@@ -0,0 +1,60 @@
+"""Micro-benchmark: structured events/sec for `log_event` versus the previous json.dumps path.
+
+Run with `python -m topics.agent.shared.BENCHMARK_log_event`.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from datetime import datetime, UTC
+
+from pydantic import BaseModel
+
+from topics.agent.shared.logging_adapter import log_event, serialize_event_json, set_event_serializer
+
+
+class SampleOutput(BaseModel):
+    answer: str
+    tool_used: str | None
+    citations: list[str]
+
+
+EVENTS = 50_000
+OUTPUT = SampleOutput(answer="x" * 200, tool_used="dummy_search", citations=[f"doc-{i}" for i in range(10)])
+
+
+def _baseline_log_event(logger: logging.Logger, **payload) -> None:
+    # Previous call sites passed `model.model_dump()` and always serialized.
+    payload = {key: value.model_dump() if isinstance(value, BaseModel) else value for key, value in payload.items()}
+    payload.setdefault("timestamp", datetime.now(UTC).isoformat())
+    logger.debug(json.dumps(payload, ensure_ascii=False))
+
+
+def _events_per_sec(emit, logger: logging.Logger, output) -> float:
+    start = time.perf_counter()
+    for index in range(EVENTS):
+        emit(logger, request_id=str(index), operation="invoke_complete", status="success", output=output)
+    return EVENTS / (time.perf_counter() - start)
+
+
+def main() -> None:
+    logger = logging.getLogger("benchmark.log_event")
+    logger.propagate = False
+    logger.addHandler(logging.NullHandler())
+
+    logger.setLevel(logging.DEBUG)
+    print(f"baseline json.dumps(model_dump()): {_events_per_sec(_baseline_log_event, logger, OUTPUT):,.0f} events/s")
+    print(f"log_event (default serializer):    {_events_per_sec(log_event, logger, OUTPUT):,.0f} events/s")
+    set_event_serializer(serialize_event_json)
+    print(f"log_event (stdlib serializer):     {_events_per_sec(log_event, logger, OUTPUT):,.0f} events/s")
+    set_event_serializer(None)
+
+    logger.setLevel(logging.INFO)
+    print(f"baseline, DEBUG disabled:          {_events_per_sec(_baseline_log_event, logger, OUTPUT):,.0f} events/s")
+    print(f"log_event, DEBUG disabled:         {_events_per_sec(log_event, logger, OUTPUT):,.0f} events/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import json
+import logging
+import queue
+import threading
+
+import pytest
+
+from pydantic import BaseModel
+
+from topics.agent.shared.logging_adapter import (
+    BoundedQueueHandler,
+    DatedRotatingFileHandler,
+    build_file_logger,
+    build_topic_logger,
+    dropped_record_counts,
+    log_event,
+    serialize_event_json,
+    set_event_serializer,
+    shutdown_loggers,
+)
+
+
+def test_async_topic_logger_flushes_on_shutdown(tmp_path) -> None:
+    logger = build_topic_logger("agent", "async_test", log_dir=str(tmp_path), async_mode=True)
+
+    assert isinstance(logger.handlers[0], BoundedQueueHandler)
+    for index in range(100):
+        log_event(logger, request_id=f"r{index}", operation="invoke_start", status="pending")
+    shutdown_loggers()
+
+    (log_file,) = tmp_path.glob("agent_async_test_*.log")
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["request_id"] for line in lines] == [f"r{i}" for i in range(100)]
+
+
+def test_bounded_queue_handler_drops_when_full() -> None:
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1), overflow="drop")
+    record = logging.makeLogRecord({"msg": "event"})
+
+    handler.emit(record)
+    handler.emit(record)
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+def test_dropped_records_are_counted_and_reported_on_shutdown(tmp_path) -> None:
+    logger = build_topic_logger("agent", "drop_test", log_dir=str(tmp_path), async_mode=True, queue_size=1)
+    (handler,) = logger.handlers
+    release = threading.Event()
+    original_get = handler.queue.get
+
+    # Hold the writer back so the one-slot queue overflows deterministically.
+    def slow_get(*args, **kwargs):
+        release.wait(timeout=5)
+        return original_get(*args, **kwargs)
+
+    handler.queue.get = slow_get
+    for index in range(50):
+        log_event(logger, request_id=f"r{index}", operation="invoke_start", status="pending")
+    dropped = dropped_record_counts()["agent.drop_test"]
+    assert dropped > 0
+    release.set()
+
+    with pytest.warns(RuntimeWarning, match="dropped"):
+        shutdown_loggers()
+
+    (log_file,) = tmp_path.glob("agent_drop_test_*.log")
+    events = [json.loads(line) for line in log_file.read_text(encoding="utf-8").splitlines()]
+    assert events[-1]["operation"] == "log_records_dropped"
+    assert events[-1]["dropped"] == dropped
+    assert len(events) - 1 + dropped == 50
+
+
+def test_build_file_logger_reuses_handlers_until_config_changes(tmp_path) -> None:
+    first = build_file_logger("agent.registry_test", tmp_path / "a.log")
+    handler = first.handlers[0]
+
+    again = build_file_logger("agent.registry_test", tmp_path / "a.log")
+    assert again is first
+    assert again.handlers == [handler]
+
+    moved = build_file_logger("agent.registry_test", tmp_path / "b.log")
+    assert moved.handlers[0] is not handler
+    assert handler.stream is None
+    shutdown_loggers()
+
+
+def test_topic_logger_rolls_over_to_new_date_file(tmp_path) -> None:
+    logger = build_topic_logger("agent", "rollover_test", log_dir=str(tmp_path))
+    handler = logger.handlers[0]
+    assert isinstance(handler, DatedRotatingFileHandler)
+
+    record = logger.makeRecord(logger.name, logging.DEBUG, __file__, 0, "next day", (), None)
+    record.created = handler._rollover_at + 1
+    logger.handle(record)
+    shutdown_loggers()
+
+    assert len(list(tmp_path.glob("agent_rollover_test_*.log"))) == 2
+
+
+class _Output(BaseModel):
+    answer: str
+    tool_used: str | None = None
+
+
+def test_log_event_encodes_models_with_each_serializer(tmp_path) -> None:
+    logger = build_file_logger("agent.serializer_test", tmp_path / "events.log")
+
+    log_event(logger, request_id="default", output=_Output(answer="héllo"))
+    set_event_serializer(serialize_event_json)
+    log_event(logger, request_id="stdlib", output=_Output(answer="héllo"))
+    set_event_serializer(None)
+    shutdown_loggers()
+
+    events = [json.loads(line) for line in (tmp_path / "events.log").read_text(encoding="utf-8").splitlines()]
+    assert [event["output"] for event in events] == [{"answer": "héllo", "tool_used": None}] * 2
+    assert all(event["timestamp"].endswith("+00:00") for event in events)
+
+
+def test_log_event_skips_serialization_when_debug_disabled(tmp_path) -> None:
+    calls: list[dict] = []
+    logger = build_file_logger("agent.disabled_test", tmp_path / "events.log")
+    logger.setLevel(logging.INFO)
+    set_event_serializer(lambda payload: calls.append(payload) or "{}")
+
+    log_event(logger, request_id="r1", output=_Output(answer="a"))
+    set_event_serializer(None)
+    shutdown_loggers()
+
+    assert calls == []
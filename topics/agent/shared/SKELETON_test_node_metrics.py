@@ -0,0 +1,98 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from topics.agent.shared.logging_adapter import build_file_logger
+from topics.agent.shared.node_metrics import NodeMetrics, state_chars
+
+
+def test_wrapped_nodes_log_timing_size_and_tokens(tmp_path) -> None:
+    log_file = tmp_path / "nodes.log"
+    metrics = NodeMetrics(build_file_logger("node_metrics_test", log_file), graph_name="g")
+
+    def llm_node(state: dict) -> dict:
+        reply = AIMessage(content="hello", usage_metadata={"input_tokens": 7, "output_tokens": 3, "total_tokens": 10})
+        return {"messages": [reply]}
+
+    def failing_node(state: dict) -> dict:
+        raise ValueError("boom")
+
+    wrapped = metrics.wrap("llm", llm_node)
+    assert wrapped.__name__ == "llm_node"
+    assert wrapped({"messages": [AIMessage(content="abc")]})["messages"][0].content == "hello"
+    with pytest.raises(ValueError):
+        metrics.wrap("broken", failing_node)({"question": "q"})
+
+    events = [json.loads(line) for line in log_file.read_text(encoding="utf-8").splitlines()]
+    assert [(e["node"], e["operation"], e["status"]) for e in events] == [
+        ("llm", "node_complete", "success"),
+        ("broken", "node_failed", "failure"),
+    ]
+    assert (events[0]["input_chars"], events[0]["output_chars"]) == (3, 5)
+    assert (events[0]["input_tokens"], events[0]["output_tokens"]) == (7, 3)
+    assert events[1]["error_type"] == "ValueError"
+    assert {"wall_ms", "cpu_ms", "timestamp", "graph"} <= events[0].keys()
+
+
+def test_summary_histogram_ranks_slowest_node_first() -> None:
+    metrics = NodeMetrics()
+
+    async def slow(state: dict) -> dict:
+        await asyncio.sleep(0.03)
+        return {}
+
+    def fast(state: dict) -> dict:
+        return {}
+
+    slow_node, fast_node = metrics.wrap("slow", slow), metrics.wrap("fast", fast)
+    for _ in range(5):
+        asyncio.run(slow_node({}))
+        fast_node({})
+
+    slow_row, fast_row = metrics.summary()
+    assert (slow_row.node, slow_row.calls, fast_row.node) == ("slow", 5, "fast")
+    assert 20 <= slow_row.wall_ms_p50 <= slow_row.wall_ms_p95 <= 50
+    assert slow_row.wall_ms_p95 <= slow_row.wall_ms_max
+    assert fast_row.wall_ms_p95 <= 1
+
+
+def test_state_chars_counts_strings_and_message_contents() -> None:
+    state = {"messages": [AIMessage(content="abcd")], "note": "xy", "count": 3}
+    assert state_chars(state) == 6
+
+
+def test_logger_factory_runs_on_first_node_call_only(tmp_path) -> None:
+    built: list[str] = []
+
+    def factory():
+        built.append("logger")
+        return build_file_logger("node_metrics_lazy_test", tmp_path / "lazy.log")
+
+    metrics = NodeMetrics(factory, graph_name="g")
+    node = metrics.wrap("noop", lambda state: {})
+    assert built == []
+
+    node({})
+    node({})
+
+    assert built == ["logger"]
+    assert len((tmp_path / "lazy.log").read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_importing_workflow_skeleton_creates_no_log_files(tmp_path) -> None:
+    root = Path(__file__).resolve().parents[3]
+    subprocess.run(
+        [sys.executable, "-c", "import topics.agent.frameworks.langchain.templates.SKELETON_langgraph_workflow"],
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": str(root)},
+        check=True,
+    )
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,183 @@
+import asyncio
+import random
+import threading
+
+import pytest
+
+from topics.agent.shared.routing_policy import (
+    CompiledRuleRouter,
+    MemoizedRouter,
+    RoutingDecision,
+    RoutingPolicy,
+    aexecute_batch_with_policy,
+    execute_batch_with_policy,
+    execute_with_policy,
+    route_by_rules,
+)
+
+
+RULES = {
+    "refund": "billing_tool",
+    "Invoice": "billing_tool",
+    "search": "search_tool",
+    "arch": "search_tool",
+    "he": "greeting_tool",
+    "she": "pronoun_tool",
+    "HERS": "pronoun_tool",
+}
+
+
+def test_compiled_router_matches_route_by_rules_first_match_wins() -> None:
+    router = CompiledRuleRouter(RULES)
+
+    for user_input in ["Please SEARCH for my invoice", "ushers", "she sells", "nothing here", "", "hers"]:
+        assert execute_with_policy(user_input, router) == route_by_rules(user_input, RULES)
+
+
+def test_compiled_router_agrees_with_route_by_rules_on_random_inputs() -> None:
+    rng = random.Random(7)
+    alphabet = "abcehnrsdfuIHE "
+    rules = {
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))): f"tool_{index}"
+        for index in range(200)
+    }
+    router = CompiledRuleRouter(rules)
+
+    for _ in range(500):
+        user_input = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert router(user_input) == route_by_rules(user_input, rules)
+
+
+def test_compiled_router_empty_keyword_always_matches() -> None:
+    rules = {"billing": "billing_tool", "": "catch_all"}
+
+    assert CompiledRuleRouter(rules)("no match") == route_by_rules("no match", rules)
+
+
+def test_compiled_router_routes_consistently_while_rules_change() -> None:
+    small = {"refund": "billing_tool"}
+    large = {f"kw{index:03d}": f"tool_{index}" for index in range(200)} | {"refund": "billing_tool"}
+    router = CompiledRuleRouter(small)
+    stop = threading.Event()
+    errors: list[object] = []
+
+    def swap_rules() -> None:
+        while not stop.is_set():
+            router.update_rules(large)
+            router.update_rules(small)
+
+    def route() -> None:
+        for _ in range(2_000):
+            try:
+                decision = router("kw150 then refund")
+            except Exception as exc:  # noqa: BLE001 - collected for the assertion below
+                errors.append(exc)
+                continue
+            if decision.tool_name not in {"tool_150", "billing_tool"}:
+                errors.append(decision)
+
+    swapper = threading.Thread(target=swap_rules)
+    swapper.start()
+    routers = [threading.Thread(target=route) for _ in range(4)]
+    for thread in routers:
+        thread.start()
+    for thread in routers:
+        thread.join()
+    stop.set()
+    swapper.join()
+
+    assert errors == []
+    assert router.rules_version > 0
+
+
+def test_batch_routing_deduplicates_and_keeps_order() -> None:
+    calls: list[str] = []
+    router = CompiledRuleRouter(RULES)
+
+    def counting_router(user_input: str) -> RoutingDecision:
+        calls.append(user_input)
+        return router(user_input)
+
+    inputs = ["refund please", "hello", "refund please", "search docs", "hello"]
+    decisions = execute_batch_with_policy(iter(inputs), counting_router)
+
+    assert [decision.tool_name for decision in decisions] == [
+        "billing_tool",
+        "greeting_tool",
+        "billing_tool",
+        "search_tool",
+        "greeting_tool",
+    ]
+    assert calls == ["refund please", "hello", "search docs"]
+
+
+def test_async_batch_routing_runs_io_bound_router_concurrently() -> None:
+    in_flight = 0
+    peak = 0
+
+    async def classifier(user_input: str) -> RoutingDecision:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return route_by_rules(user_input, RULES)
+
+    inputs = [f"search item {index % 20}" for index in range(60)]
+    decisions = asyncio.run(aexecute_batch_with_policy(inputs, classifier, max_concurrency=8))
+
+    assert decisions == [route_by_rules(user_input, RULES) for user_input in inputs]
+    assert peak == 8
+
+
+def test_async_batch_routing_wraps_sync_router() -> None:
+    inputs = ["refund", "she", "refund", "nothing"]
+
+    decisions = asyncio.run(aexecute_batch_with_policy(inputs, CompiledRuleRouter(RULES)))
+
+    assert [decision.tool_name for decision in decisions] == ["billing_tool", "greeting_tool", "billing_tool", "default"]
+
+
+def test_async_batch_routing_rejects_non_positive_concurrency() -> None:
+    with pytest.raises(ValueError, match="max_concurrency"):
+        asyncio.run(aexecute_batch_with_policy(["a"], CompiledRuleRouter(RULES), max_concurrency=0))
+
+
+def test_memoized_router_counts_hits_and_evicts_lru() -> None:
+    router = MemoizedRouter(CompiledRuleRouter(RULES), RoutingPolicy(name="rules"), max_size=2)
+
+    for user_input in ["Refund", "refund", "search", "invoice", "refund"]:
+        assert execute_with_policy(user_input, router) == route_by_rules(user_input, RULES)
+
+    stats = router.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 4, 2)
+    assert stats.hit_rate == 0.2
+
+
+def test_memoized_router_invalidates_on_rule_change_and_ttl() -> None:
+    compiled = CompiledRuleRouter(RULES)
+    router = MemoizedRouter(compiled, RoutingPolicy(name="rules"))
+
+    assert router("refund").tool_name == "billing_tool"
+    compiled.update_rules({"refund": "refund_tool"})
+    assert router("refund").tool_name == "refund_tool"
+
+    expiring = MemoizedRouter(compiled, RoutingPolicy(name="rules"), ttl_s=0.0)
+    expiring("refund")
+    expiring("refund")
+    assert expiring.stats().hits == 0
+
+
+def test_memoized_router_bypasses_non_deterministic_policy() -> None:
+    calls: list[str] = []
+
+    def sampling_router(user_input: str) -> RoutingDecision:
+        calls.append(user_input)
+        return RoutingDecision(tool_name="llm_choice", reason="sampled", confidence=0.6)
+
+    router = MemoizedRouter(sampling_router, RoutingPolicy(name="llm", deterministic=False))
+    router("same")
+    router("same")
+
+    assert calls == ["same", "same"]
+    assert router.stats().size == 0
@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import time
+
+from langchain_core.tools import tool
+from pydantic import BaseModel, Field
+
+from topics.agent.shared.tool_cache import DiskToolCache, InMemoryToolCache, cacheable
+
+
+class LookupArgs(BaseModel):
+    query: str
+    top_k: int = Field(default=3)
+
+
+def test_cacheable_tool_keys_on_validated_args_and_skips_repeat_calls() -> None:
+    calls: list[tuple[str, int]] = []
+
+    @tool(args_schema=LookupArgs)
+    @cacheable(LookupArgs)
+    def lookup(query: str, top_k: int = 3) -> str:
+        """Look something up."""
+        calls.append((query, top_k))
+        return f"{query}:{top_k}"
+
+    assert lookup.invoke({"query": "x"}) == "x:3"
+    assert lookup.invoke({"query": "x", "top_k": 3}) == "x:3"
+    assert lookup.invoke({"query": "x", "top_k": "3"}) == "x:3"
+    assert lookup.invoke({"query": "x", "top_k": 5}) == "x:5"
+
+    assert calls == [("x", 3), ("x", 5)]
+    stats = lookup.func.cache_stats()
+    assert (stats.hits, stats.misses, stats.size) == (2, 2, 2)
+
+
+def test_in_memory_cache_evicts_lru_and_expires_by_ttl() -> None:
+    store = InMemoryToolCache(max_entries=2)
+    calls: list[str] = []
+
+    @cacheable(LookupArgs, cache=store, ttl_s=0.05)
+    def lookup(query: str, top_k: int = 3) -> str:
+        calls.append(query)
+        return query
+
+    lookup("a")
+    lookup("b")
+    lookup("a")
+    lookup("c")
+    lookup("b")
+    assert calls == ["a", "b", "c", "b"]
+
+    time.sleep(0.06)
+    lookup("b")
+    assert calls == ["a", "b", "c", "b", "b"]
+
+
+def test_failures_are_not_cached_and_async_tools_are_supported() -> None:
+    attempts: list[str] = []
+
+    @cacheable(LookupArgs)
+    async def flaky(query: str, top_k: int = 3) -> str:
+        attempts.append(query)
+        if len(attempts) == 1:
+            raise RuntimeError("transient")
+        return query.upper()
+
+    async def scenario() -> list[str]:
+        try:
+            await flaky("q")
+        except RuntimeError:
+            pass
+        return [await flaky("q"), await flaky(query="q")]
+
+    assert asyncio.run(scenario()) == ["Q", "Q"]
+    assert attempts == ["q", "q"]
+
+
+def test_disk_cache_survives_reopen_and_honours_ttl(tmp_path) -> None:
+    path = str(tmp_path / "tools.sqlite")
+    calls: list[str] = []
+
+    def build(store: DiskToolCache):
+        @cacheable(LookupArgs, cache=store, ttl_s=None, name="lookup")
+        def lookup(query: str, top_k: int = 3) -> dict[str, str]:
+            calls.append(query)
+            return {"hit": query}
+
+        return lookup
+
+    first = DiskToolCache(path)
+    assert build(first)("a") == {"hit": "a"}
+    first.close()
+
+    second = DiskToolCache(path)
+    assert build(second)("a") == {"hit": "a"}
+    assert calls == ["a"]
+
+    second.set("expired", "value", ttl_s=-1)
+    assert len(second) == 1
+    second.close()
+
+
+def test_disk_cache_keeps_tuples_and_skips_unserializable_results(tmp_path, caplog) -> None:
+    store = DiskToolCache(str(tmp_path / "tools.sqlite"))
+    calls: list[str] = []
+
+    @cacheable(ttl_s=None, cache=store)
+    @tool(args_schema=LookupArgs, response_format="content_and_artifact")
+    def lookup(query: str, top_k: int = 3) -> tuple[str, dict[str, list[int]]]:
+        """Look something up, returning an artifact."""
+        calls.append(query)
+        return f"found {query}", {"ids": [1, 2]}
+
+    @cacheable(LookupArgs, cache=store, ttl_s=None)
+    def opaque(query: str, top_k: int = 3) -> object:
+        calls.append(f"opaque:{query}")
+        return {1: object()}
+
+    call = {"name": "lookup", "args": {"query": "x"}, "id": "c1", "type": "tool_call"}
+    first, second = lookup.invoke(call), lookup.invoke(call)
+    assert second.content == first.content == "found x"
+    assert second.artifact == {"ids": [1, 2]}
+
+    with caplog.at_level(logging.WARNING, logger="topics.agent.shared.tool_cache"):
+        assert list(opaque("y")) == list(opaque("y")) == [1]
+    assert calls == ["x", "opaque:y", "opaque:y"]
+    assert "tool_cache_write_skipped" in caplog.text
+    store.close()
+
+
+def test_cacheable_above_tool_uses_registered_name_and_schema() -> None:
+    calls: list[str] = []
+
+    @cacheable(ttl_s=None)
+    @tool("custom_lookup", args_schema=LookupArgs)
+    def lookup(query: str, top_k: int = 3) -> str:
+        """Look something up."""
+        calls.append(query)
+        return f"{query}:{top_k}"
+
+    assert lookup.name == "custom_lookup"
+    assert lookup.args_schema is LookupArgs
+    assert lookup.invoke({"query": "x"}) == lookup.invoke({"query": "x", "top_k": "3"}) == "x:3"
+    assert calls == ["x"]
+    assert lookup.func.cache_stats().hits == 1
+
+
+def test_same_named_tools_from_different_modules_do_not_share_entries() -> None:
+    store = InMemoryToolCache()
+
+    def make(module: str, result: str):
+        def search(query: str, top_k: int = 3) -> str:
+            """Search."""
+            return result
+
+        search.__module__ = module
+        return cacheable(ttl_s=None, cache=store)(tool(args_schema=LookupArgs)(search))
+
+    web, docs = make("tools.web", "web"), make("tools.docs", "docs")
+
+    assert web.name == docs.name == "search"
+    assert [web.invoke({"query": "q"}), docs.invoke({"query": "q"})] == ["web", "docs"]
+    assert len(store) == 2
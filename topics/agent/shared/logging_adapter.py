@@ -2,16 +2,214 @@
 
 from __future__ import annotations
 
+import atexit
 import json
 import logging
-from datetime import datetime, UTC
-from logging.handlers import RotatingFileHandler
+import os
+import queue
+import threading
+import time
+import warnings
+from datetime import datetime, timedelta, UTC
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Literal, NamedTuple
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 DEFAULT_MAX_BYTES = 10 * 1024 * 1024
 DEFAULT_BACKUP_COUNT = 5
+DEFAULT_QUEUE_SIZE = 10_000
+
+OverflowPolicy = Literal["drop", "block"]
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler over a bounded queue that drops (and counts) or blocks when the writer falls behind.
+
+    Dropped records are reported by `dropped_record_counts()` and, when the logger is released
+    (`shutdown_loggers()` or reconfiguration), by a `log_records_dropped` event in its file plus
+    a RuntimeWarning.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow: OverflowPolicy = "drop") -> None:
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    @property
+    def dropped(self) -> int:
+        with self._dropped_lock:
+            return self._dropped
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+
+
+class _DrainingQueueListener(QueueListener):
+    """QueueListener whose stop sentinel waits for room instead of raising on a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class DatedRotatingFileHandler(RotatingFileHandler):
+    """Size-rotating file handler whose path embeds the current UTC date.
+
+    `filename_template` contains a `{date}` placeholder (`%Y%m%d`); at UTC midnight the handler
+    switches to the new day's file on the next record instead of being rebuilt by callers.
+    """
+
+    def __init__(self, filename_template: str | Path, max_bytes: int, backup_count: int) -> None:
+        self.filename_template = str(filename_template)
+        now = datetime.now(UTC)
+        self._rollover_at = _next_utc_midnight(now)
+        super().__init__(
+            self.filename_template.format(date=now.strftime("%Y%m%d")),
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.created >= self._rollover_at:
+            created = datetime.fromtimestamp(record.created, UTC)
+            self._rollover_at = _next_utc_midnight(created)
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+            self.baseFilename = os.path.abspath(self.filename_template.format(date=created.strftime("%Y%m%d")))
+        super().emit(record)
+
+
+def _next_utc_midnight(now: datetime) -> float:
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    return midnight.timestamp()
+
+
+class _RegisteredLogger(NamedTuple):
+    config: tuple[Any, ...]
+    file_handler: logging.Handler
+    listener: QueueListener | None
+
+
+_registry: dict[str, _RegisteredLogger] = {}
+_registry_lock = threading.Lock()
+
+
+def _queue_handler(name: str) -> BoundedQueueHandler | None:
+    return next((h for h in logging.getLogger(name).handlers if isinstance(h, BoundedQueueHandler)), None)
+
+
+def _report_dropped(name: str, file_handler: logging.Handler, dropped: int) -> None:
+    event = {
+        "timestamp": _event_timestamp(),
+        "logger": name,
+        "operation": "log_records_dropped",
+        "status": "failure",
+        "dropped": dropped,
+    }
+    file_handler.handle(
+        logging.makeLogRecord({"name": name, "levelno": logging.WARNING, "levelname": "WARNING", "msg": _event_serializer(event)})
+    )
+    warnings.warn(f"logger {name!r} dropped {dropped} records because its async queue was full", RuntimeWarning)
+
+
+def _release(name: str) -> None:
+    entry = _registry.pop(name, None)
+    if entry is None:
+        return
+    queue_handler = _queue_handler(name)
+    if entry.listener is not None:
+        entry.listener.stop()
+    if queue_handler is not None and queue_handler.dropped:
+        _report_dropped(name, entry.file_handler, queue_handler.dropped)
+    entry.file_handler.close()
+    logger = logging.getLogger(name)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def dropped_record_counts() -> dict[str, int]:
+    """Records dropped so far by each registered async logger with `overflow="drop"`."""
+    with _registry_lock:
+        handlers = {name: _queue_handler(name) for name, entry in _registry.items() if entry.listener is not None}
+    return {name: handler.dropped for name, handler in handlers.items() if handler is not None}
+
+
+def shutdown_loggers() -> None:
+    """Drain async queues, close every registered handler and forget them; registered with `atexit`."""
+    with _registry_lock:
+        for name in list(_registry):
+            _release(name)
+
+
+atexit.register(shutdown_loggers)
+
+
+def build_file_logger(
+    name: str,
+    log_file: str | Path,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    backup_count: int = DEFAULT_BACKUP_COUNT,
+    *,
+    async_mode: bool = False,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    overflow: OverflowPolicy = "drop",
+) -> logging.Logger:
+    """Return logger `name` with a DEBUG rotating file handler, creating it once per process.
+
+    Repeated calls with the same configuration reuse the registered handlers; a changed
+    configuration closes them and opens new ones. A `{date}` placeholder in `log_file` selects
+    `DatedRotatingFileHandler`. With `async_mode`, callers only enqueue records; a background
+    `QueueListener` thread does the file writes and rotation, and `overflow` decides whether a
+    full queue drops records or blocks.
+    """
+    config = (str(log_file), max_bytes, backup_count, async_mode, queue_size, overflow)
+    logger = logging.getLogger(name)
+    with _registry_lock:
+        entry = _registry.get(name)
+        if entry is not None and entry.config == config:
+            return logger
+        _release(name)
+
+        Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+        logger.setLevel(logging.DEBUG)
+        logger.handlers.clear()
+
+        if "{date}" in str(log_file):
+            handler: RotatingFileHandler = DatedRotatingFileHandler(log_file, max_bytes, backup_count)
+        else:
+            handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
+        handler.setLevel(logging.DEBUG)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+        listener = None
+        if async_mode:
+            queue_handler = BoundedQueueHandler(queue.Queue(maxsize=queue_size), overflow)
+            queue_handler.setLevel(logging.DEBUG)
+            listener = _DrainingQueueListener(queue_handler.queue, handler, respect_handler_level=True)
+            listener.start()
+            logger.addHandler(queue_handler)
+        else:
+            logger.addHandler(handler)
+
+        _registry[name] = _RegisteredLogger(config, handler, listener)
+    return logger
 
 
 def build_topic_logger(
@@ -20,22 +218,73 @@ def build_topic_logger(
     log_dir: str = "logs",
     max_bytes: int = DEFAULT_MAX_BYTES,
     backup_count: int = DEFAULT_BACKUP_COUNT,
+    *,
+    async_mode: bool = False,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    overflow: OverflowPolicy = "drop",
 ) -> logging.Logger:
-    Path(log_dir).mkdir(parents=True, exist_ok=True)
-    date_part = datetime.now(UTC).strftime("%Y%m%d")
-    log_file = Path(log_dir) / f"{topic}_{component}_{date_part}.log"
-
-    logger = logging.getLogger(f"{topic}.{component}")
-    logger.setLevel(logging.DEBUG)
-    logger.handlers.clear()
-
-    handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
-    handler.setLevel(logging.DEBUG)
-    handler.setFormatter(logging.Formatter("%(message)s"))
-    logger.addHandler(handler)
-    return logger
+    log_file = Path(log_dir) / f"{topic}_{component}_{{date}}.log"
+    return build_file_logger(
+        f"{topic}.{component}",
+        log_file,
+        max_bytes,
+        backup_count,
+        async_mode=async_mode,
+        queue_size=queue_size,
+        overflow=overflow,
+    )
+
+
+def _stdlib_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def serialize_event_json(payload: dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False, default=_stdlib_default)
+
+
+def _orjson_default(value: Any) -> Any:
+    # Splice the model's own JSON in as-is instead of building a model_dump() dict first.
+    if isinstance(value, BaseModel):
+        return orjson.Fragment(value.__pydantic_serializer__.to_json(value))
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def serialize_event_orjson(payload: dict[str, Any]) -> str:
+    return orjson.dumps(payload, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+EventSerializer = Callable[[dict[str, Any]], str]
+
+_default_event_serializer: EventSerializer = (
+    serialize_event_orjson if orjson is not None and hasattr(orjson, "Fragment") else serialize_event_json
+)
+_event_serializer = _default_event_serializer
+_timestamp_cache: tuple[int, str] = (0, "")
+
+
+def set_event_serializer(serializer: EventSerializer | None) -> None:
+    """Replace the structured-event serializer; `None` restores the default (orjson when installed)."""
+    global _event_serializer
+    _event_serializer = serializer or _default_event_serializer
+
+
+def _event_timestamp() -> str:
+    """UTC ISO-8601 timestamp with millisecond precision, formatted once per millisecond."""
+    global _timestamp_cache
+    now_ms = time.time_ns() // 1_000_000
+    cached_ms, text = _timestamp_cache
+    if now_ms != cached_ms:
+        text = datetime.fromtimestamp(now_ms / 1000, UTC).isoformat(timespec="milliseconds")
+        _timestamp_cache = (now_ms, text)
+    return text
 
 
 def log_event(logger: logging.Logger, **payload: Any) -> None:
-    payload.setdefault("timestamp", datetime.now(UTC).isoformat())
-    logger.debug(json.dumps(payload, ensure_ascii=False))
+    """Emit one JSON-lines event at DEBUG; Pydantic models in the payload are encoded directly."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    payload.setdefault("timestamp", _event_timestamp())
+    logger.debug(_event_serializer(payload))
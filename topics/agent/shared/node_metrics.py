@@ -0,0 +1,231 @@
+"""Local per-node latency, CPU, state-size and token instrumentation for graph workflows."""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections.abc import Callable, Mapping
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+from .logging_adapter import log_event
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended.
+DEFAULT_BUCKETS_MS: tuple[float, ...] = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1_000, 2_000, 5_000, 10_000, 30_000)
+
+
+class NodeLatencySummary(BaseModel):
+    node: str
+    calls: int
+    errors: int
+    wall_ms_mean: float
+    wall_ms_p50: float
+    wall_ms_p95: float
+    wall_ms_max: float
+    cpu_ms_mean: float
+    input_tokens: int
+    output_tokens: int
+
+
+def state_chars(value: Any) -> int:
+    """Approximate payload size: total characters of strings and message contents in a state or update."""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, Mapping):
+        return sum(state_chars(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(state_chars(item) for item in value)
+    content = getattr(value, "content", None)
+    if content is not None:
+        return state_chars(content)
+    update = getattr(value, "update", None)
+    if update is not None:
+        return state_chars(update)
+    return 0
+
+
+def _token_usage(update: Any) -> tuple[int, int]:
+    """Sum `usage_metadata` of messages a node emitted (LangChain AIMessage convention)."""
+    if not isinstance(update, Mapping):
+        # LangGraph `Command(update=...)`
+        update = getattr(update, "update", None)
+    if not isinstance(update, Mapping):
+        return 0, 0
+    input_tokens = output_tokens = 0
+    for values in update.values():
+        for message in values if isinstance(values, (list, tuple)) else (values,):
+            usage = getattr(message, "usage_metadata", None)
+            if usage:
+                input_tokens += usage.get("input_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+    return input_tokens, output_tokens
+
+
+class _NodeStats:
+    __slots__ = ("bucket_counts", "calls", "errors", "wall_ms_total", "wall_ms_max", "cpu_ms_total",
+                 "input_tokens", "output_tokens")
+
+    def __init__(self, bucket_count: int) -> None:
+        self.bucket_counts = [0] * bucket_count
+        self.calls = 0
+        self.errors = 0
+        self.wall_ms_total = 0.0
+        self.wall_ms_max = 0.0
+        self.cpu_ms_total = 0.0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+
+class NodeMetrics:
+    """Wraps graph nodes to time them and log one `node_complete`/`node_failed` event per call.
+
+    Each event carries `wall_ms`, `cpu_ms` (CPU of the calling thread, so for async nodes it
+    also includes other coroutines scheduled during the await), `input_chars`/`output_chars`
+    (see `state_chars`) and `input_tokens`/`output_tokens` from emitted messages. Latencies
+    are also kept in a fixed-bucket histogram per node, so `summary()` works offline without
+    storing samples; percentiles are bucket upper bounds.
+
+    `logger` may be a zero-argument factory (e.g. `partial(build_topic_logger, ...)`); it is
+    called on the first recorded node call, so module-level instances create no log files or
+    listener threads at import time.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger | Callable[[], logging.Logger] | None = None,
+        *,
+        graph_name: str = "graph",
+        buckets_ms: tuple[float, ...] = DEFAULT_BUCKETS_MS,
+    ) -> None:
+        self._logger = logger
+        self.graph_name = graph_name
+        self.buckets_ms = buckets_ms
+        self._stats: dict[str, _NodeStats] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def logger(self) -> logging.Logger | None:
+        if self._logger is not None and not isinstance(self._logger, logging.Logger):
+            with self._lock:
+                if not isinstance(self._logger, logging.Logger):
+                    self._logger = self._logger()
+        return self._logger  # type: ignore[return-value]
+
+    def wrap(self, name: str, node: F) -> F:
+        """Return `node` instrumented under `name`; signature is preserved so graph frameworks
+        still inject `config`/`store` arguments the original node asks for."""
+        if inspect.iscoroutinefunction(node):
+
+            @functools.wraps(node)
+            async def async_wrapper(state: Any, *args: Any, **kwargs: Any) -> Any:
+                wall_start, cpu_start = time.perf_counter(), time.thread_time()
+                try:
+                    update = await node(state, *args, **kwargs)
+                except Exception as exc:
+                    self._record(name, state, None, wall_start, cpu_start, exc)
+                    raise
+                self._record(name, state, update, wall_start, cpu_start, None)
+                return update
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(node)
+        def wrapper(state: Any, *args: Any, **kwargs: Any) -> Any:
+            wall_start, cpu_start = time.perf_counter(), time.thread_time()
+            try:
+                update = node(state, *args, **kwargs)
+            except Exception as exc:
+                self._record(name, state, None, wall_start, cpu_start, exc)
+                raise
+            self._record(name, state, update, wall_start, cpu_start, None)
+            return update
+
+        return wrapper  # type: ignore[return-value]
+
+    def _record(
+        self,
+        name: str,
+        state: Any,
+        update: Any,
+        wall_start: float,
+        cpu_start: float,
+        exc: Exception | None,
+    ) -> None:
+        wall_ms = (time.perf_counter() - wall_start) * 1000
+        cpu_ms = (time.thread_time() - cpu_start) * 1000
+        input_tokens, output_tokens = _token_usage(update)
+
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = _NodeStats(len(self.buckets_ms) + 1)
+            stats.bucket_counts[bisect.bisect_left(self.buckets_ms, wall_ms)] += 1
+            stats.calls += 1
+            stats.errors += exc is not None
+            stats.wall_ms_total += wall_ms
+            stats.wall_ms_max = max(stats.wall_ms_max, wall_ms)
+            stats.cpu_ms_total += cpu_ms
+            stats.input_tokens += input_tokens
+            stats.output_tokens += output_tokens
+
+        logger = self.logger
+        if logger is None or not logger.isEnabledFor(logging.DEBUG):
+            return
+        fields: dict[str, Any] = {
+            "graph": self.graph_name,
+            "node": name,
+            "operation": "node_complete" if exc is None else "node_failed",
+            "status": "success" if exc is None else "failure",
+            "wall_ms": round(wall_ms, 3),
+            "cpu_ms": round(cpu_ms, 3),
+            "input_chars": state_chars(state),
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+        }
+        if exc is None:
+            fields["output_chars"] = state_chars(update)
+        else:
+            fields["error_type"] = type(exc).__name__
+            fields["error_message"] = str(exc)
+        log_event(logger, **fields)
+
+    def _percentile(self, stats: _NodeStats, quantile: float) -> float:
+        target = quantile * stats.calls
+        cumulative = 0
+        for index, count in enumerate(stats.bucket_counts):
+            cumulative += count
+            if cumulative >= target:
+                return self.buckets_ms[index] if index < len(self.buckets_ms) else stats.wall_ms_max
+        return stats.wall_ms_max
+
+    def summary(self) -> list[NodeLatencySummary]:
+        """Per-node latency summary, slowest total time first."""
+        with self._lock:
+            rows = [
+                NodeLatencySummary(
+                    node=name,
+                    calls=stats.calls,
+                    errors=stats.errors,
+                    wall_ms_mean=stats.wall_ms_total / stats.calls,
+                    wall_ms_p50=min(self._percentile(stats, 0.50), stats.wall_ms_max),
+                    wall_ms_p95=min(self._percentile(stats, 0.95), stats.wall_ms_max),
+                    wall_ms_max=stats.wall_ms_max,
+                    cpu_ms_mean=stats.cpu_ms_total / stats.calls,
+                    input_tokens=stats.input_tokens,
+                    output_tokens=stats.output_tokens,
+                )
+                for name, stats in self._stats.items()
+            ]
+        return sorted(rows, key=lambda row: row.wall_ms_mean * row.calls, reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
@@ -2,7 +2,13 @@
 
 from __future__ import annotations
 
-from typing import Callable
+import asyncio
+import inspect
+import threading
+import time
+from collections import OrderedDict, deque
+from types import MappingProxyType
+from typing import Awaitable, Callable, Iterable, Mapping, NamedTuple
 
 from pydantic import BaseModel, Field
 
@@ -26,5 +32,235 @@ def route_by_rules(user_input: str, rules: dict[str, str]) -> RoutingDecision:
     return RoutingDecision(tool_name="default", reason="no_keyword_match", confidence=1.0)
 
 
-def execute_with_policy(user_input: str, router: Callable[[str], RoutingDecision]) -> RoutingDecision:
+class _CompiledRules(NamedTuple):
+    """Everything one routing call reads, published as a single reference."""
+
+    version: int
+    rules: Mapping[str, str]
+    keywords: tuple[str, ...]
+    goto: tuple[dict[str, int], ...]
+    fail: tuple[int, ...]
+    best: tuple[int, ...]
+
+
+def _compile_rules(rules: dict[str, str], version: int) -> _CompiledRules:
+    keywords = tuple(rules)
+    no_match = len(keywords)
+
+    goto: list[dict[str, int]] = [{}]
+    best = [no_match]
+    for rule_index, keyword in enumerate(keywords):
+        state = 0
+        for char in keyword.lower():
+            next_state = goto[state].get(char)
+            if next_state is None:
+                next_state = len(goto)
+                goto[state][char] = next_state
+                goto.append({})
+                best.append(no_match)
+            state = next_state
+        best[state] = min(best[state], rule_index)
+
+    # Breadth-first failure links; each state's `best` also covers keywords that end at it
+    # as a suffix, so matching only needs to look at the current state.
+    fail = [0] * len(goto)
+    pending = deque(goto[0].values())
+    while pending:
+        state = pending.popleft()
+        for char, next_state in goto[state].items():
+            fallback = fail[state]
+            while fallback and char not in goto[fallback]:
+                fallback = fail[fallback]
+            target = goto[fallback].get(char, 0)
+            fail[next_state] = target if target != next_state else 0
+            best[next_state] = min(best[next_state], best[fail[next_state]])
+            pending.append(next_state)
+
+    return _CompiledRules(version, MappingProxyType(dict(rules)), keywords, tuple(goto), tuple(fail), tuple(best))
+
+
+class CompiledRuleRouter:
+    """`route_by_rules` compiled once into an Aho-Corasick automaton over the lowercased keywords.
+
+    One pass over the input finds every keyword occurrence; the earliest rule (in `rules` order)
+    among them wins, exactly as in `route_by_rules`. Instances are callable routers for
+    `execute_with_policy` and are safe to share across threads: `update_rules` builds the new
+    automaton aside and swaps it in with one assignment, so a call sees either the old rules or
+    the new ones. `rules_version` increases on every `update_rules` so caches in front of the
+    router can invalidate themselves.
+    """
+
+    def __init__(self, rules: dict[str, str]) -> None:
+        self._update_lock = threading.Lock()
+        self._compiled = _compile_rules(rules, 0)
+
+    @property
+    def rules(self) -> Mapping[str, str]:
+        return self._compiled.rules
+
+    @property
+    def rules_version(self) -> int:
+        return self._compiled.version
+
+    def update_rules(self, rules: dict[str, str]) -> None:
+        with self._update_lock:
+            self._compiled = _compile_rules(rules, self._compiled.version + 1)
+
+    def __call__(self, user_input: str) -> RoutingDecision:
+        compiled = self._compiled
+        goto, fail, best = compiled.goto, compiled.fail, compiled.best
+        state = 0
+        found = best[0]
+        for char in user_input.lower():
+            if found == 0:
+                break
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if best[state] < found:
+                found = best[state]
+
+        if found == len(compiled.keywords):
+            return RoutingDecision(tool_name="default", reason="no_keyword_match", confidence=1.0)
+        keyword = compiled.keywords[found]
+        return RoutingDecision(tool_name=compiled.rules[keyword], reason=f"keyword:{keyword}", confidence=1.0)
+
+
+Router = Callable[[str], RoutingDecision]
+AsyncRouter = Callable[[str], Awaitable[RoutingDecision]]
+
+
+class RouterCacheStats(BaseModel):
+    hits: int
+    misses: int
+    size: int
+    hit_rate: float
+
+
+class MemoizedRouter:
+    """Bounded LRU of normalized input to `RoutingDecision` in front of a deterministic router.
+
+    Caching applies only when `policy.deterministic` is true; otherwise every call goes to the
+    wrapped router. `normalize` must not change the routing outcome (`str.lower` is exact for
+    keyword rules). The cache is cleared whenever the wrapped router's `rules_version` changes.
+    """
+
+    def __init__(
+        self,
+        router: Router,
+        policy: RoutingPolicy,
+        max_size: int = 10_000,
+        ttl_s: float | None = None,
+        normalize: Callable[[str], str] = str.lower,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self.router = router
+        self.policy = policy
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self.normalize = normalize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, RoutingDecision]] = OrderedDict()
+        self._rules_version = getattr(router, "rules_version", None)
+        self._lock = threading.Lock()
+
+    def __call__(self, user_input: str) -> RoutingDecision:
+        if not self.policy.deterministic:
+            return self.router(user_input)
+
+        key = self.normalize(user_input)
+        now = time.monotonic()
+        with self._lock:
+            rules_version = getattr(self.router, "rules_version", None)
+            if rules_version != self._rules_version:
+                self._entries.clear()
+                self._rules_version = rules_version
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl_s is None or now - entry[0] < self.ttl_s):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        decision = self.router(user_input)
+        with self._lock:
+            self._entries[key] = (now, decision)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return decision
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> RouterCacheStats:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return RouterCacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                size=len(self._entries),
+                hit_rate=self.hits / lookups if lookups else 0.0,
+            )
+
+
+def execute_with_policy(user_input: str, router: Router) -> RoutingDecision:
     return router(user_input)
+
+
+def execute_batch_with_policy(inputs: Iterable[str], router: Router) -> list[RoutingDecision]:
+    """Route a list or stream of inputs in order, calling `router` once per distinct input."""
+    decisions: dict[str, RoutingDecision] = {}
+    results: list[RoutingDecision] = []
+    for user_input in inputs:
+        decision = decisions.get(user_input)
+        if decision is None:
+            decision = decisions[user_input] = router(user_input)
+        results.append(decision)
+    return results
+
+
+def _is_async_router(router: Router | AsyncRouter) -> bool:
+    return inspect.iscoroutinefunction(router) or inspect.iscoroutinefunction(getattr(router, "__call__", None))
+
+
+async def aexecute_with_policy(user_input: str, router: Router | AsyncRouter) -> RoutingDecision:
+    """Await an async router (e.g. a model-based classifier); sync routers run in a worker thread."""
+    if _is_async_router(router):
+        return await router(user_input)
+    return await asyncio.to_thread(router, user_input)
+
+
+async def aexecute_batch_with_policy(
+    inputs: Iterable[str],
+    router: Router | AsyncRouter,
+    max_concurrency: int = 16,
+) -> list[RoutingDecision]:
+    """Route inputs concurrently, at most `max_concurrency` in flight, one call per distinct input.
+
+    Decisions are returned in input order. The first routing error cancels the batch and is re-raised.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be >= 1")
+    inputs = list(inputs)
+    decisions: dict[str, RoutingDecision] = {}
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def route(user_input: str) -> None:
+        try:
+            decisions[user_input] = await aexecute_with_policy(user_input, router)
+        finally:
+            semaphore.release()
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            for user_input in dict.fromkeys(inputs):
+                await semaphore.acquire()
+                group.create_task(route(user_input))
+    except ExceptionGroup as errors:
+        raise errors.exceptions[0] from errors
+
+    return [decisions[user_input] for user_input in inputs]
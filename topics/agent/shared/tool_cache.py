@@ -0,0 +1,313 @@
+"""Result caching for deterministic agent tools, keyed by tool name and schema-validated arguments."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Protocol, TypeVar
+
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+logger = logging.getLogger(__name__)
+
+# Returned by cache backends on a miss, so that `None` remains a cacheable tool result.
+CACHE_MISS = object()
+
+
+def tool_cache_key(tool_name: str, args: BaseModel) -> str:
+    """Hash the tool name with the validated arguments in canonical JSON form.
+
+    Validation through the tool's `args_schema` applies defaults and coercions first, so
+    `search("x")`, `search(query="x")` and `search(query="x", top_k=5)` with `top_k=5` as the
+    default all share one key.
+    """
+    canonical = json.dumps(args.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256()
+    digest.update(tool_name.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(canonical.encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Tuples are tagged so they come back as tuples, e.g. the (content, artifact) pair of
+# `response_format="content_and_artifact"` tools.
+_TUPLE_TAG = "__tool_cache_tuple__"
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, tuple):
+        return {_TUPLE_TAG: [_to_json(item) for item in value]}
+    if isinstance(value, list):
+        return [_to_json(item) for item in value]
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            raise TypeError("only str dict keys survive a JSON round trip")
+        return {key: _to_json(item) for key, item in value.items()}
+    return value
+
+
+def _from_json_object(obj: dict[str, Any]) -> Any:
+    if obj.keys() == {_TUPLE_TAG}:
+        return tuple(obj[_TUPLE_TAG])
+    return obj
+
+
+class ToolCacheStats(BaseModel):
+    hits: int
+    misses: int
+    size: int
+    hit_rate: float
+
+
+class ToolResultCache(Protocol):
+    def get(self, key: str) -> Any:
+        """Return the stored value, or `CACHE_MISS` when absent or expired."""
+        ...
+
+    def set(self, key: str, value: Any, ttl_s: float | None) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def __len__(self) -> int: ...
+
+
+class InMemoryToolCache:
+    """Thread-safe LRU of tool results bounded to `max_entries`, with optional per-entry TTL."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return CACHE_MISS
+            expires_at, value = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                return CACHE_MISS
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_s: float | None) -> None:
+        expires_at = None if ttl_s is None else time.monotonic() + ttl_s
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskToolCache:
+    """SQLite-backed tool results shared across processes and restarts.
+
+    Values must be JSON-serializable (tuples are preserved, dict keys must be strings);
+    `set` raises TypeError or ValueError otherwise.
+
+    Expired rows are skipped on read and purged on write; the table is bounded to `max_entries`
+    by least-recent use.
+    """
+
+    def __init__(self, path: str = "cache/tool_results.sqlite", max_entries: int = 100_000) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tool_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, last_access INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tool_cache_lru ON tool_cache (last_access)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM tool_cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            ).fetchone()
+            if row is None:
+                return CACHE_MISS
+            self._conn.execute("UPDATE tool_cache SET last_access = ? WHERE key = ?", (time.time_ns(), key))
+            self._conn.commit()
+        return json.loads(row[0], object_hook=_from_json_object)
+
+    def set(self, key: str, value: Any, ttl_s: float | None) -> None:
+        encoded = json.dumps(_to_json(value))
+        now = time.time()
+        expires_at = None if ttl_s is None else now + ttl_s
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tool_cache (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, encoded, expires_at, time.time_ns()),
+            )
+            self._conn.execute("DELETE FROM tool_cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM tool_cache").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM tool_cache WHERE key IN "
+                    "(SELECT key FROM tool_cache ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM tool_cache")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM tool_cache").fetchone()
+        return count
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def cacheable(
+    args_schema: type[BaseModel] | None = None,
+    *,
+    cache: ToolResultCache | None = None,
+    ttl_s: float | None = 300.0,
+    name: str | None = None,
+) -> Callable[[F], F]:
+    """Declare a deterministic tool cacheable; apply it above `@tool`.
+
+        @cacheable(ttl_s=600)
+        @tool(args_schema=SearchArgs)
+        def search(query: str) -> str: ...
+
+    The tool's registered `name` and `args_schema` are used, and a copy of the tool with a
+    caching `func`/`coroutine` is returned. Applied to a plain function (or beneath `@tool`),
+    `args_schema` must be passed explicitly.
+
+    Arguments are validated with the schema to build the key, so only results of calls that
+    the tool itself would accept are stored. Keys are namespaced by the defining module plus
+    the tool name (or function qualname), so same-named tools from different modules never
+    share entries in one cache; pass `name` to choose the namespace explicitly. Exceptions
+    are never cached, and a result the store cannot serialize is returned uncached with a
+    logged warning. The cached callables expose `cache_stats()` and `cache_clear()`
+    (e.g. `search.func.cache_stats()`).
+    """
+
+    def decorate(target: F) -> F:
+        if isinstance(target, BaseTool):
+            schema = args_schema or target.args_schema
+            funcs = {attr: getattr(target, attr, None) for attr in ("func", "coroutine")}
+            funcs = {attr: func for attr, func in funcs.items() if func is not None}
+            if not funcs:
+                raise TypeError(f"cacheable needs a function-backed tool (@tool / StructuredTool), got {target!r}")
+            if not (isinstance(schema, type) and issubclass(schema, BaseModel)):
+                raise TypeError(f"tool {target.name!r} has no pydantic args_schema to key the cache on")
+            module = next(iter(funcs.values())).__module__
+            wrapped = _cached_callables(funcs, schema, name or f"{module}.{target.name}", cache, ttl_s)
+            return target.model_copy(update=wrapped)  # type: ignore[return-value]
+
+        if args_schema is None:
+            raise TypeError("cacheable(args_schema) is required when decorating a plain function")
+        tool_name = name or f"{target.__module__}.{target.__qualname__}"
+        return _cached_callables({"func": target}, args_schema, tool_name, cache, ttl_s)["func"]
+
+    return decorate
+
+
+def _cached_callables(
+    funcs: dict[str, Callable[..., Any]],
+    args_schema: type[BaseModel],
+    tool_name: str,
+    cache: ToolResultCache | None,
+    ttl_s: float | None,
+) -> dict[str, Callable[..., Any]]:
+    """Wrap each callable with one shared store and hit/miss counters (sync and async variants of one tool)."""
+    store: ToolResultCache = cache if cache is not None else InMemoryToolCache()
+    counters = {"hits": 0, "misses": 0}
+    counters_lock = threading.Lock()
+
+    def lookup(key: str) -> Any:
+        value = store.get(key)
+        with counters_lock:
+            counters["hits" if value is not CACHE_MISS else "misses"] += 1
+        return value
+
+    def cache_stats() -> ToolCacheStats:
+        with counters_lock:
+            hits, misses = counters["hits"], counters["misses"]
+        lookups = hits + misses
+        return ToolCacheStats(hits=hits, misses=misses, size=len(store), hit_rate=hits / lookups if lookups else 0.0)
+
+    def remember(key: str, value: Any) -> None:
+        try:
+            store.set(key, value, ttl_s)
+        except (TypeError, ValueError) as exc:
+            logger.warning(
+                "tool_cache_write_skipped tool=%s error_type=%s error_message=%s", tool_name, type(exc).__name__, exc
+            )
+
+    def cache_clear() -> None:
+        store.clear()
+        with counters_lock:
+            counters["hits"] = counters["misses"] = 0
+
+    def wrap(func: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(func)
+
+        def key_for(args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+            bound = signature.bind(*args, **kwargs)
+            return tool_cache_key(tool_name, args_schema.model_validate(bound.arguments))
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                key = key_for(args, kwargs)
+                value = lookup(key)
+                if value is CACHE_MISS:
+                    value = await func(*args, **kwargs)
+                    remember(key, value)
+                return value
+
+        else:
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                key = key_for(args, kwargs)
+                value = lookup(key)
+                if value is CACHE_MISS:
+                    value = func(*args, **kwargs)
+                    remember(key, value)
+                return value
+
+        wrapper.cache_stats = cache_stats  # type: ignore[attr-defined]
+        wrapper.cache_clear = cache_clear  # type: ignore[attr-defined]
+        wrapper.__cacheable__ = True  # type: ignore[attr-defined]
+        return wrapper
+
+    return {attr: wrap(func) for attr, func in funcs.items()}
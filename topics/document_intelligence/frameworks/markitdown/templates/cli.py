@@ -3,35 +3,133 @@
 from __future__ import annotations
 
 import argparse
+import json
+import os
+import sys
 from pathlib import Path
 
-from .converter import convert_bytes_to_markdown
+from topics.document_intelligence.shared.bulk_conversion import collect_input_paths
+from topics.document_intelligence.shared.conversion_cache import ConversionCache
+
+from .converter import convert_file_to_markdown, convert_files_to_markdown, stream_file_to_markdown
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Convert document bytes to markdown")
-    parser.add_argument("input_file", help="Path to input document")
-    parser.add_argument("--extension", required=True, help="File extension, e.g. .pdf")
-    parser.add_argument("--output", required=True, help="Output markdown path")
+    parser.add_argument("input_file", nargs="?", help="Path to input document (single-file mode)")
+    parser.add_argument("--extension", help="File extension, e.g. .pdf (single-file mode; default: input suffix)")
+    parser.add_argument("--output", help="Output markdown path (single-file mode)")
     parser.add_argument("--visual-mode", action="store_true", help="Enable optional visual mode")
     parser.add_argument(
         "--debug-log",
         default="logs/document_intelligence/markitdown_debug.log",
         help="Debug log file path",
     )
+    parser.add_argument("--cache", help="Conversion cache file; unchanged documents are not re-parsed")
+
+    bulk = parser.add_argument_group("bulk mode")
+    bulk.add_argument("--input-dir", help="Convert every file under this directory (recursive)")
+    bulk.add_argument("--glob", dest="pattern", help="Convert files matching this glob, e.g. 'in/**/*.pdf'")
+    bulk.add_argument("--manifest", help="Text file listing one input path per line")
+    bulk.add_argument("--output-dir", help="Directory for <input name>.md outputs, mirroring the input tree")
+    bulk.add_argument("--extensions", nargs="*", help="Only convert these suffixes, e.g. .pdf .docx")
+    bulk.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    bulk.add_argument(
+        "--executor",
+        choices=["process", "thread"],
+        help="Worker pool type (default: thread with --visual-mode, otherwise process)",
+    )
     return parser
 
 
+def _output_root(paths: list[Path], input_dir: str | None) -> Path:
+    """Deepest directory containing every input, so the output tree mirrors the input tree."""
+    roots = [Path(os.path.abspath(path)).parent for path in paths]
+    if input_dir:
+        roots.append(Path(os.path.abspath(input_dir)))
+    return Path(os.path.commonpath(roots)) if roots else Path(".")
+
+
+def _output_path(source: Path, output_dir: Path, root: Path) -> Path:
+    # Keep the source suffix (`a.pdf.md`) so `a.pdf` and `a.docx` do not collide.
+    relative = Path(os.path.abspath(source)).relative_to(root)
+    return output_dir / relative.with_name(relative.name + ".md")
+
+
+def run_bulk(args: argparse.Namespace) -> int:
+    """Convert all matched inputs; print one JSON line per file and return 1 if any failed."""
+    paths = collect_input_paths(
+        input_dir=args.input_dir,
+        pattern=args.pattern,
+        manifest=args.manifest,
+        extensions=args.extensions,
+    )
+    output_dir = Path(args.output_dir)
+    root = _output_root(paths, args.input_dir)
+    written: dict[Path, str] = {}
+    failures = 0
+    for item in convert_files_to_markdown(
+        paths,
+        enable_visual_mode=args.visual_mode,
+        max_workers=args.workers,
+        executor=args.executor,
+        cache_path=args.cache,
+        log_file=args.debug_log,
+    ):
+        record = {"source": item.source_path, "status": "success" if item.ok else "failure"}
+        target = _output_path(Path(item.source_path), output_dir, root)
+        if item.ok and target in written:
+            failures += 1
+            record.update(
+                status="failure",
+                error_type="OutputCollision",
+                error_message=f"{target} was already written for {written[target]}",
+            )
+        elif item.ok:
+            record["cache_hit"] = item.result.metadata.get("cache_hit", False)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(item.result.markdown, encoding="utf-8")
+            written[target] = item.source_path
+            record["output"] = str(target)
+        else:
+            failures += 1
+            record.update(error_type=item.error_type, error_message=item.error_message)
+        print(json.dumps(record), flush=True)
+    return 1 if failures else 0
+
+
 def main() -> None:
-    args = build_parser().parse_args()
-    content = Path(args.input_file).read_bytes()
+    parser = build_parser()
+    args = parser.parse_args()
+
+    if args.input_dir or args.pattern or args.manifest:
+        if args.input_file or not args.output_dir:
+            parser.error("bulk mode takes --input-dir/--glob/--manifest with --output-dir and no input_file")
+        sys.exit(run_bulk(args))
+
+    if not (args.input_file and args.output):
+        parser.error("single-file mode requires input_file and --output")
+
+    if args.cache is None:
+        # Markdown reaches the output file section by section (row batches for CSV/text).
+        stream_file_to_markdown(
+            args.input_file,
+            args.output,
+            extension=args.extension,
+            enable_visual_mode=args.visual_mode,
+            llm_client=None,
+            log_file=args.debug_log,
+        )
+        return
 
-    result = convert_bytes_to_markdown(
+    # MarkItDown reads the open file directly; the document is never loaded as bytes.
+    result = convert_file_to_markdown(
+        args.input_file,
         extension=args.extension,
-        content_bytes=content,
         enable_visual_mode=args.visual_mode,
         llm_client=None,
         log_file=args.debug_log,
+        cache=ConversionCache(args.cache),
     )
 
     Path(args.output).write_text(result.markdown, encoding="utf-8")
@@ -1,9 +1,19 @@
 """Template conversion entrypoint for MarkItDown."""
 
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any, Literal
+
+from topics.document_intelligence.shared.bulk_conversion import convert_paths
+from topics.document_intelligence.shared.conversion_cache import ConversionCache
+from topics.document_intelligence.shared.markdown_streaming import write_markdown_stream
 from topics.document_intelligence.shared.markitdown_wrapper import convert_document
 from topics.document_intelligence.shared.structured_models import (
+    BulkConversionItem,
     ConversionRequest,
     ConversionResult,
+    FileConversionRequest,
+    StreamedConversionResult,
 )
 
 
@@ -23,3 +33,67 @@ def convert_bytes_to_markdown(
         llm_model=llm_model,
     )
     return convert_document(req, llm_client=llm_client, log_file=log_file)
+
+
+def convert_file_to_markdown(
+    path: str | Path,
+    *,
+    extension: str | None = None,
+    enable_visual_mode: bool = False,
+    llm_model: str | None = None,
+    llm_client=None,
+    log_file: str = "logs/document_intelligence/markitdown_debug.log",
+    cache: ConversionCache | None = None,
+) -> ConversionResult:
+    """Convert a document on disk without loading it into memory first (large PDFs, scans)."""
+    req = FileConversionRequest(
+        source_path=Path(path),
+        extension=extension,
+        enable_visual_mode=enable_visual_mode,
+        llm_model=llm_model,
+    )
+    return convert_document(req, llm_client=llm_client, log_file=log_file, cache=cache)
+
+
+def stream_file_to_markdown(
+    path: str | Path,
+    output_path: str | Path,
+    *,
+    extension: str | None = None,
+    enable_visual_mode: bool = False,
+    llm_model: str | None = None,
+    llm_client=None,
+    log_file: str = "logs/document_intelligence/markitdown_debug.log",
+) -> StreamedConversionResult:
+    """Convert a document on disk and write its markdown to `output_path` section by section."""
+    req = FileConversionRequest(
+        source_path=Path(path),
+        extension=extension,
+        enable_visual_mode=enable_visual_mode,
+        llm_model=llm_model,
+    )
+    return write_markdown_stream(req, output_path, llm_client=llm_client, log_file=log_file)
+
+
+def convert_files_to_markdown(
+    paths: Iterable[str | Path],
+    *,
+    enable_visual_mode: bool = False,
+    llm_model: str | None = None,
+    llm_client_factory: Callable[[], Any] | None = None,
+    max_workers: int | None = None,
+    executor: Literal["process", "thread"] | None = None,
+    cache_path: str | None = None,
+    log_file: str = "logs/document_intelligence/markitdown_debug.log",
+) -> Iterator[BulkConversionItem]:
+    """Stream per-file results for many documents converted in parallel workers."""
+    return convert_paths(
+        paths,
+        max_workers=max_workers,
+        executor=executor,
+        enable_visual_mode=enable_visual_mode,
+        llm_model=llm_model,
+        llm_client_factory=llm_client_factory,
+        cache_path=cache_path,
+        log_file=log_file,
+    )
@@ -0,0 +1,182 @@
+import json
+import os
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from topics.document_intelligence.shared import bulk_conversion, markitdown_wrapper
+
+
+class FakeMarkItDown:
+    def __init__(self, llm_client=None):
+        self.llm_client = llm_client
+
+    def convert_stream(self, stream, file_extension):
+        payload = stream.read()
+        if payload == b"corrupt":
+            raise ValueError("cannot parse")
+        if payload == b"crash":
+            os._exit(1)
+        return SimpleNamespace(text_content=f"# {file_extension} {payload.decode()} pid={os.getpid()}")
+
+
+def _write_inputs(root):
+    (root / "nested").mkdir()
+    (root / "a.pdf").write_bytes(b"alpha")
+    (root / "nested" / "b.docx").write_bytes(b"beta")
+    (root / "bad.pdf").write_bytes(b"corrupt")
+    (root / "notes.txt").write_bytes(b"skip")
+
+
+def test_collect_input_paths_merges_dir_glob_and_manifest(tmp_path):
+    _write_inputs(tmp_path)
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# nightly batch\nnotes.txt\n\na.pdf\n", encoding="utf-8")
+
+    from_dir = bulk_conversion.collect_input_paths(input_dir=str(tmp_path), extensions=[".pdf", ".docx"])
+    from_glob = bulk_conversion.collect_input_paths(pattern=str(tmp_path / "**" / "*.docx"))
+    from_manifest = bulk_conversion.collect_input_paths(manifest=str(manifest))
+
+    assert [p.name for p in from_dir] == ["a.pdf", "bad.pdf", "b.docx"]
+    assert [p.name for p in from_glob] == ["b.docx"]
+    assert [p.name for p in from_manifest] == ["a.pdf", "notes.txt"]
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_convert_paths_streams_results_and_reports_failures(monkeypatch, tmp_path, executor):
+    monkeypatch.setattr(markitdown_wrapper, "MarkItDown", FakeMarkItDown)
+    _write_inputs(tmp_path)
+    paths = bulk_conversion.collect_input_paths(input_dir=str(tmp_path), extensions=[".pdf", ".docx"])
+
+    items = list(bulk_conversion.convert_paths(
+        paths, max_workers=2, executor=executor, log_file=str(tmp_path / "debug.log")
+    ))
+
+    by_name = {os.path.basename(item.source_path): item for item in items}
+    assert set(by_name) == {"a.pdf", "b.docx", "bad.pdf"}
+    assert by_name["a.pdf"].result.markdown.startswith("# .pdf alpha")
+    assert by_name["b.docx"].result.metadata["extension"] == ".docx"
+    assert not by_name["bad.pdf"].ok
+    assert (by_name["bad.pdf"].error_type, by_name["bad.pdf"].error_message) == ("ValueError", "cannot parse")
+    if executor == "process":
+        assert all(f"pid={os.getpid()}" not in item.result.markdown for item in items if item.ok)
+
+
+def test_worker_crashes_fail_only_the_file_that_kills_its_worker(monkeypatch, tmp_path):
+    monkeypatch.setattr(markitdown_wrapper, "MarkItDown", FakeMarkItDown)
+    crashers = {f"{index}.pdf" for index in (3, 17, 30)}
+    for index in range(40):
+        name = f"{index}.pdf"
+        (tmp_path / name).write_bytes(b"crash" if name in crashers else name.encode())
+
+    items = list(bulk_conversion.convert_paths(
+        sorted(tmp_path.glob("*.pdf")), max_workers=2, executor="process", log_file=str(tmp_path / "debug.log")
+    ))
+
+    assert sorted(os.path.basename(item.source_path) for item in items) == sorted(f"{i}.pdf" for i in range(40))
+    failures = [item for item in items if not item.ok]
+    assert {os.path.basename(item.source_path) for item in failures} == crashers
+    assert {item.error_type for item in failures} == {"BrokenProcessPool"}
+
+
+def test_thread_workers_keep_their_own_llm_client_and_close_caches(monkeypatch, tmp_path):
+    class ClientCheckingMarkItDown(FakeMarkItDown):
+        def convert_stream(self, stream, file_extension):
+            owner = self.llm_client.thread if self.llm_client is not None else None
+            return SimpleNamespace(text_content="own" if owner == threading.get_ident() else "foreign")
+
+    closed = []
+    monkeypatch.setattr(markitdown_wrapper, "MarkItDown", ClientCheckingMarkItDown)
+    monkeypatch.setattr(bulk_conversion.ConversionCache, "close", lambda self: closed.append(self))
+    markitdown_wrapper.clear_markitdown_pool()
+    for index in range(12):
+        (tmp_path / f"{index}.pdf").write_bytes(str(index).encode())
+    paths = sorted(tmp_path.glob("*.pdf"))
+
+    items = list(bulk_conversion.convert_paths(
+        paths,
+        max_workers=3,
+        executor="thread",
+        enable_visual_mode=True,
+        llm_client_factory=lambda: SimpleNamespace(thread=threading.get_ident()),
+        cache_path=str(tmp_path / "cache.sqlite"),
+        log_file=str(tmp_path / "debug.log"),
+    ))
+
+    assert [item.result.markdown for item in items] == ["own"] * 12
+    assert 1 <= len(closed) <= 3
+
+
+def test_cli_bulk_mode_writes_outputs_and_json_report(monkeypatch, tmp_path, capsys):
+    from topics.document_intelligence.frameworks.markitdown.templates import cli
+
+    monkeypatch.setattr(markitdown_wrapper, "MarkItDown", FakeMarkItDown)
+    (tmp_path / "in").mkdir()
+    _write_inputs(tmp_path / "in")
+    monkeypatch.setattr("sys.argv", [
+        "cli", "--input-dir", str(tmp_path / "in"), "--extensions", ".pdf", ".docx",
+        "--output-dir", str(tmp_path / "out"), "--workers", "2", "--debug-log", str(tmp_path / "debug.log"),
+    ])
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert exit_info.value.code == 1
+    assert sorted(r["status"] for r in records) == ["failure", "success", "success"]
+    assert (tmp_path / "out" / "nested" / "b.docx.md").read_text(encoding="utf-8").startswith("# .docx beta")
+    assert (tmp_path / "out" / "a.pdf.md").exists()
+
+
+def test_cli_bulk_outputs_keep_suffix_and_mirror_glob_tree(monkeypatch, tmp_path, capsys):
+    from topics.document_intelligence.frameworks.markitdown.templates import cli
+
+    monkeypatch.setattr(markitdown_wrapper, "MarkItDown", FakeMarkItDown)
+    for relative, payload in {"x/r.pdf": b"x", "y/r.pdf": b"y", "x/a.pdf": b"pdf", "x/a.docx": b"docx"}.items():
+        (tmp_path / "in" / relative).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / "in" / relative).write_bytes(payload)
+    monkeypatch.setattr("sys.argv", [
+        "cli", "--glob", str(tmp_path / "in" / "**" / "*.*"), "--output-dir", str(tmp_path / "out"),
+        "--executor", "thread", "--debug-log", str(tmp_path / "debug.log"),
+    ])
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert exit_info.value.code == 0
+    assert [r["status"] for r in records] == ["success"] * 4
+    out = tmp_path / "out"
+    assert sorted(str(p.relative_to(out)) for p in out.rglob("*.md")) == [
+        "x/a.docx.md", "x/a.pdf.md", "x/r.pdf.md", "y/r.pdf.md",
+    ]
+    assert (out / "y" / "r.pdf.md").read_text(encoding="utf-8").startswith("# .pdf y")
+
+
+def test_cli_bulk_reports_output_collisions_as_failures(monkeypatch, tmp_path, capsys):
+    from topics.document_intelligence.frameworks.markitdown.templates import cli
+
+    monkeypatch.setattr(markitdown_wrapper, "MarkItDown", FakeMarkItDown)
+    # e.g. `A.pdf` and `a.pdf` on a case-insensitive output volume
+    monkeypatch.setattr(cli, "_output_path", lambda source, output_dir, root: output_dir / "same.md")
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "a.pdf").write_bytes(b"first")
+    (tmp_path / "in" / "b.pdf").write_bytes(b"second")
+    monkeypatch.setattr("sys.argv", [
+        "cli", "--input-dir", str(tmp_path / "in"), "--output-dir", str(tmp_path / "out"),
+        "--executor", "thread", "--debug-log", str(tmp_path / "debug.log"),
+    ])
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert exit_info.value.code == 1
+    assert sorted(r["status"] for r in records) == ["failure", "success"]
+    collision = next(r for r in records if r["status"] == "failure")
+    assert collision["error_type"] == "OutputCollision"
+    winner = next(r for r in records if r["status"] == "success")
+    assert (tmp_path / "out" / "same.md").read_text(encoding="utf-8").startswith(
+        "# .pdf first" if winner["source"].endswith("a.pdf") else "# .pdf second"
+    )
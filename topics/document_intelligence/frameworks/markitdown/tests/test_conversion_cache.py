@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+from topics.document_intelligence.shared.conversion_cache import ConversionCache
+from topics.document_intelligence.shared.structured_models import ConversionRequest, FileConversionRequest
+from topics.document_intelligence.shared import bulk_conversion, markitdown_wrapper
+
+
+class CountingMarkItDown:
+    calls = 0
+
+    def __init__(self, llm_client=None):
+        self.llm_client = llm_client
+
+    def convert_stream(self, stream, file_extension):
+        CountingMarkItDown.calls += 1
+        return SimpleNamespace(text_content=f"# {stream.read().decode()}")
+
+
+def test_identical_content_and_mode_is_served_from_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(markitdown_wrapper, "MarkItDown", CountingMarkItDown)
+    CountingMarkItDown.calls = 0
+    cache = ConversionCache(str(tmp_path / "cache.sqlite"))
+    log_file = str(tmp_path / "debug.log")
+    document = tmp_path / "a.pdf"
+    document.write_bytes(b"attachment")
+
+    def convert(req):
+        return markitdown_wrapper.convert_document(req, llm_client=object(), log_file=log_file, cache=cache)
+
+    first = convert(ConversionRequest(extension=".pdf", content_bytes=b"attachment"))
+    again = convert(ConversionRequest(extension=".pdf", content_bytes=b"attachment"))
+    from_file = convert(FileConversionRequest(source_path=document))
+    visual = convert(ConversionRequest(extension=".pdf", content_bytes=b"attachment", enable_visual_mode=True, llm_model="m1"))
+    other_model = convert(ConversionRequest(extension=".pdf", content_bytes=b"attachment", enable_visual_mode=True, llm_model="m2"))
+    other_ext = convert(ConversionRequest(extension=".txt", content_bytes=b"attachment"))
+
+    assert [r.metadata["cache_hit"] for r in (first, again, from_file, visual, other_model, other_ext)] == [
+        False, True, True, False, False, False,
+    ]
+    assert again.markdown == from_file.markdown == "# attachment"
+    assert again.metadata["extension"] == ".pdf"
+    assert CountingMarkItDown.calls == 4
+
+
+def test_cache_evicts_least_recently_used_entries_by_size(tmp_path):
+    cache = ConversionCache(str(tmp_path / "cache.sqlite"), max_bytes=25)
+    cache.put("a", "x" * 10, {})
+    cache.put("b", "y" * 10, {})
+    assert cache.get("a") == ("x" * 10, {})
+
+    cache.put("c", "z" * 10, {})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.total_bytes() == 20
+    cache.put("huge", "w" * 100, {})
+    assert cache.get("huge") is None
+
+
+def test_bulk_workers_share_one_cache_file(monkeypatch, tmp_path):
+    monkeypatch.setattr(markitdown_wrapper, "MarkItDown", CountingMarkItDown)
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.pdf").write_bytes(name.encode())
+    paths = sorted(tmp_path.glob("*.pdf"))
+    options = dict(max_workers=2, cache_path=str(tmp_path / "cache.sqlite"), log_file=str(tmp_path / "debug.log"))
+
+    first = list(bulk_conversion.convert_paths(paths, **options))
+    second = list(bulk_conversion.convert_paths(paths, **options))
+
+    assert [item.result.metadata["cache_hit"] for item in first] == [False] * 3
+    assert [item.result.metadata["cache_hit"] for item in second] == [True] * 3
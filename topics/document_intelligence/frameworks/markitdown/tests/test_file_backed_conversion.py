@@ -0,0 +1,87 @@
+import io
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+from topics.document_intelligence.shared.structured_models import FileConversionRequest
+from topics.document_intelligence.shared import markitdown_wrapper
+
+
+class ChunkReadingMarkItDown:
+    """Reads the stream in small chunks like a streaming parser; records what it was given."""
+
+    seen = []
+
+    def __init__(self, llm_client=None):
+        self.llm_client = llm_client
+
+    def convert_stream(self, stream, file_extension):
+        assert stream.seekable()
+        total = 0
+        while chunk := stream.read(64 * 1024):
+            total += len(chunk)
+        ChunkReadingMarkItDown.seen.append((type(stream), getattr(stream, "name", None), file_extension))
+        return SimpleNamespace(text_content=f"# {total} bytes")
+
+
+class NonSeekable(io.RawIOBase):
+    def __init__(self, payload):
+        self._inner = io.BytesIO(payload)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self._inner.readinto(buffer)
+
+
+def test_path_request_feeds_open_file_handle_without_loading_bytes(monkeypatch, tmp_path):
+    monkeypatch.setattr(markitdown_wrapper, "MarkItDown", ChunkReadingMarkItDown)
+    markitdown_wrapper.clear_markitdown_pool()
+    ChunkReadingMarkItDown.seen = []
+    size = 32 * 1024 * 1024
+    document = tmp_path / "scan.PDF"
+    with open(document, "wb") as handle:
+        handle.truncate(size)
+
+    tracemalloc.start()
+    result = markitdown_wrapper.convert_document(
+        FileConversionRequest(source_path=document), log_file=str(tmp_path / "debug.log")
+    )
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert result.markdown == f"# {size} bytes"
+    assert result.metadata["extension"] == ".pdf"
+    assert ChunkReadingMarkItDown.seen == [(io.BufferedReader, str(document), ".pdf")]
+    assert peak < size // 8
+
+
+def test_stream_requests_pass_seekable_streams_and_spool_others(monkeypatch, tmp_path):
+    monkeypatch.setattr(markitdown_wrapper, "MarkItDown", ChunkReadingMarkItDown)
+    ChunkReadingMarkItDown.seen = []
+    log_file = str(tmp_path / "debug.log")
+    seekable = io.BytesIO(b"x" * 1000)
+
+    first = markitdown_wrapper.convert_document(
+        FileConversionRequest(stream=seekable, extension=".docx"), log_file=log_file
+    )
+    second = markitdown_wrapper.convert_document(
+        FileConversionRequest(stream=NonSeekable(b"y" * 1000), extension=".docx"), log_file=log_file
+    )
+
+    assert first.markdown == second.markdown == "# 1000 bytes"
+    assert ChunkReadingMarkItDown.seen[0][0] is io.BytesIO
+    assert ChunkReadingMarkItDown.seen[1][0] is not NonSeekable
+
+
+def test_file_request_requires_exactly_one_source_and_an_extension(tmp_path):
+    with pytest.raises(ValidationError):
+        FileConversionRequest(extension=".pdf")
+    with pytest.raises(ValidationError):
+        FileConversionRequest(source_path=tmp_path / "a.pdf", stream=io.BytesIO(b""))
+    with pytest.raises(ValidationError):
+        FileConversionRequest(stream=io.BytesIO(b""))
+    assert FileConversionRequest(source_path=tmp_path / "noext", extension=".txt").extension == ".txt"
@@ -0,0 +1,75 @@
+import gc
+import threading
+import weakref
+from types import SimpleNamespace
+
+from topics.document_intelligence.shared.structured_models import ConversionRequest
+from topics.document_intelligence.shared import markitdown_wrapper
+
+
+class CountingMarkItDown:
+    constructed = []
+
+    def __init__(self, llm_client=None):
+        self.llm_client = llm_client
+        CountingMarkItDown.constructed.append(self)
+
+    def convert_stream(self, stream, file_extension):
+        return SimpleNamespace(text_content=f"client={self.llm_client is not None}")
+
+
+def test_instances_are_built_once_per_mode_client_and_thread(monkeypatch, tmp_path):
+    monkeypatch.setattr(markitdown_wrapper, "MarkItDown", CountingMarkItDown)
+    CountingMarkItDown.constructed = []
+    markitdown_wrapper.clear_markitdown_pool()
+    log_file = str(tmp_path / "debug.log")
+    client_a, client_b = object(), object()
+
+    def convert(visual, client=None):
+        req = ConversionRequest(extension=".png", content_bytes=b"x", enable_visual_mode=visual)
+        return markitdown_wrapper.convert_document(req, llm_client=client, log_file=log_file)
+
+    for _ in range(3):
+        assert convert(False).markdown == "client=False"
+        assert convert(False, client_a).markdown == "client=False"
+        assert convert(True, client_a).markdown == "client=True"
+        convert(True, client_b)
+    assert len(CountingMarkItDown.constructed) == 3
+
+    other_thread = threading.Thread(target=convert, args=(False,))
+    other_thread.start()
+    other_thread.join()
+    assert len(CountingMarkItDown.constructed) == 4
+
+    markitdown_wrapper.clear_markitdown_pool()
+    convert(False)
+    assert len(CountingMarkItDown.constructed) == 5
+
+
+def test_pool_is_bounded_and_releases_per_request_clients(monkeypatch, tmp_path):
+    built = []
+
+    class ForgetfulMarkItDown:
+        def __init__(self, llm_client=None):
+            self.llm_client = llm_client
+            built.append(llm_client is not None)
+
+    class Client:
+        pass
+
+    monkeypatch.setattr(markitdown_wrapper, "MarkItDown", ForgetfulMarkItDown)
+    monkeypatch.setattr(markitdown_wrapper, "MARKITDOWN_POOL_MAX_INSTANCES", 2)
+    markitdown_wrapper.clear_markitdown_pool()
+    client_refs = []
+
+    default = markitdown_wrapper.get_markitdown()
+    for _ in range(5):
+        client = Client()
+        client_refs.append(weakref.ref(client))
+        markitdown_wrapper.get_markitdown(enable_visual_mode=True, llm_client=client)
+        assert markitdown_wrapper.get_markitdown() is default
+        del client
+    gc.collect()
+
+    assert built == [False, True, True, True, True, True]
+    assert [ref() is None for ref in client_refs] == [True, True, True, True, False]
@@ -0,0 +1,175 @@
+import asyncio
+import io
+from types import SimpleNamespace
+
+from topics.document_intelligence.shared import markdown_streaming, markitdown_wrapper
+from topics.document_intelligence.shared.structured_models import ConversionRequest, FileConversionRequest
+
+
+class SlideDeckMarkItDown:
+    calls = 0
+
+    def __init__(self, llm_client=None):
+        self.llm_client = llm_client
+
+    def convert_stream(self, stream, file_extension):
+        SlideDeckMarkItDown.calls += 1
+        return SimpleNamespace(
+            text_content="<!-- Slide number: 1 -->\n# Intro\n\n<!-- Slide number: 2 -->\n## Body\ntext\n"
+        )
+
+
+def test_csv_stream_matches_markitdown_table_across_chunks(monkeypatch, tmp_path):
+    payload = (
+        "\ufeff\n\nname,note\n\n"
+        'a,"pipe | and \\\\| escaped"\n'
+        'b,"multi\nline",extra\n'
+        "\n"
+        "c\n"
+        "d,4\n"
+        "e,5\n\n\n"
+    ).encode("utf-8")
+    # Output of MarkItDown 0.1.8's CsvConverter for the payload above.
+    expected = "\n".join([
+        "| name | note |  |",
+        "| --- | --- | --- |",
+        r"| a | pipe \| and \\\\\| escaped |  |",
+        "| b | multi line | extra |",
+        "|  |  |  |",
+        "| c |  |  |",
+        "| d | 4 |  |",
+        "| e | 5 |  |",
+    ])
+    monkeypatch.setattr(markdown_streaming, "CSV_ROWS_PER_CHUNK", 3)
+
+    chunks = list(
+        markdown_streaming.iter_markdown_sections(
+            ConversionRequest(extension=".csv", content_bytes=payload), log_file=str(tmp_path / "debug.log")
+        )
+    )
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == expected
+
+
+def test_text_stream_matches_markitdown_normalization_across_chunks(monkeypatch, tmp_path):
+    # Inputs and outputs of MarkItDown 0.1.8's convert_stream for .txt/.md (CRLF to LF,
+    # right-stripped lines, 3+ newlines collapsed, byte-order mark kept).
+    cases = {
+        b"hello\r\nworld\n": "hello\nworld\n",
+        b"\xef\xbb\xbfbom line  \n\n\n\nnext\t \r\n": "\ufeffbom line\n\nnext\n",
+        "José  \r\n\r\n\r\n\r\nZürich \t\n".encode(): "José\n\nZürich\n",
+        b"# T\n\n\n\nx  \n": "# T\n\nx\n",
+    }
+    log_file = str(tmp_path / "debug.log")
+
+    for chunk_bytes in (1, 3, 1024):
+        monkeypatch.setattr(markdown_streaming, "TEXT_CHUNK_BYTES", chunk_bytes)
+        for payload, expected in cases.items():
+            for extension in (".txt", ".md"):
+                chunks = markdown_streaming.iter_markdown_sections(
+                    ConversionRequest(extension=extension, content_bytes=payload), log_file=log_file
+                )
+                assert "".join(chunks) == expected
+
+
+def test_formats_without_incremental_streamer_are_split_per_section(monkeypatch, tmp_path):
+    monkeypatch.setattr(markitdown_wrapper, "MarkItDown", SlideDeckMarkItDown)
+    markitdown_wrapper.clear_markitdown_pool()
+    SlideDeckMarkItDown.calls = 0
+
+    chunks = list(
+        markdown_streaming.iter_markdown_sections(
+            ConversionRequest(extension=".pptx", content_bytes=b"deck"), log_file=str(tmp_path / "debug.log")
+        )
+    )
+
+    assert chunks == [
+        "<!-- Slide number: 1 -->\n# Intro\n\n",
+        "<!-- Slide number: 2 -->\n## Body\ntext\n",
+    ]
+    assert SlideDeckMarkItDown.calls == 1
+
+
+def test_joined_sections_equal_full_markdown_including_page_breaks(monkeypatch, tmp_path):
+    markdown = "page one\fpage two\n# Heading\nbody\f\fpage four"
+
+    class PdfMarkItDown(SlideDeckMarkItDown):
+        def convert_stream(self, stream, file_extension):
+            return SimpleNamespace(text_content=markdown)
+
+    monkeypatch.setattr(markitdown_wrapper, "MarkItDown", PdfMarkItDown)
+    markitdown_wrapper.clear_markitdown_pool()
+
+    chunks = list(
+        markdown_streaming.iter_markdown_sections(
+            ConversionRequest(extension=".pdf", content_bytes=b"%PDF"), log_file=str(tmp_path / "debug.log")
+        )
+    )
+
+    assert chunks == ["page one\f", "page two\n", "# Heading\nbody\f", "\f", "page four"]
+    assert "".join(chunks) == markdown
+
+
+def test_non_utf8_text_and_csv_fall_back_to_markitdown_charset_detection(monkeypatch, tmp_path):
+    seen = []
+
+    class DetectingMarkItDown(SlideDeckMarkItDown):
+        def convert_stream(self, stream, file_extension):
+            seen.append(file_extension)
+            return SimpleNamespace(text_content=stream.read().decode("cp1252"))
+
+    monkeypatch.setattr(markitdown_wrapper, "MarkItDown", DetectingMarkItDown)
+    markitdown_wrapper.clear_markitdown_pool()
+    log_file = str(tmp_path / "debug.log")
+
+    for extension in (".csv", ".txt"):
+        payload = "José,Zürich\n".encode("cp1252")
+        chunks = list(
+            markdown_streaming.iter_markdown_sections(
+                ConversionRequest(extension=extension, content_bytes=payload), log_file=log_file
+            )
+        )
+        assert "".join(chunks) == "José,Zürich\n"
+    utf8 = list(
+        markdown_streaming.iter_markdown_sections(
+            ConversionRequest(extension=".csv", content_bytes="José,Zürich\n".encode()), log_file=log_file
+        )
+    )
+
+    assert seen == [".csv", ".txt"]
+    assert utf8 == ["| José | Zürich |\n| --- | --- |"]
+
+
+def test_write_markdown_stream_writes_all_sections_to_file(tmp_path):
+    source = tmp_path / "notes.txt"
+    source.write_text("héllo " * 30_000, encoding="utf-8")
+    output = tmp_path / "notes.md"
+
+    result = markdown_streaming.write_markdown_stream(
+        FileConversionRequest(source_path=source), output, log_file=str(tmp_path / "debug.log")
+    )
+
+    assert output.read_text(encoding="utf-8") == ("héllo " * 30_000).rstrip()
+    assert result.sections > 1
+    assert result.markdown_length == len(("héllo " * 30_000).rstrip())
+    assert result.metadata["extension"] == ".txt"
+
+
+def test_async_iterator_yields_in_order_and_stops_on_early_close(monkeypatch, tmp_path):
+    monkeypatch.setattr(markdown_streaming, "TEXT_CHUNK_BYTES", 4)
+    req = ConversionRequest(extension=".txt", content_bytes=b"0123456789abcdefghij" * 10)
+    log_file = str(tmp_path / "debug.log")
+
+    async def consume(limit=None):
+        seen = []
+        stream = markdown_streaming.aiter_markdown_sections(req, log_file=log_file, max_buffered=2)
+        async for chunk in stream:
+            seen.append(chunk)
+            if limit is not None and len(seen) == limit:
+                break
+        await stream.aclose()
+        return seen
+
+    assert "".join(asyncio.run(consume())) == req.content_bytes.decode()
+    assert asyncio.run(asyncio.wait_for(consume(limit=3), timeout=5)) == ["0123", "4567", "89ab"]
@@ -0,0 +1,60 @@
+"""Micro-benchmark: per-call cost of `convert_document` on small documents, fresh vs pooled MarkItDown.
+
+Requires the real `markitdown` package. Run with
+`python -m topics.document_intelligence.shared.BENCHMARK_markitdown_pool`.
+"""
+
+from __future__ import annotations
+
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from markitdown import MarkItDown
+
+from topics.document_intelligence.shared.markitdown_wrapper import clear_markitdown_pool, convert_document
+from topics.document_intelligence.shared.structured_models import ConversionRequest
+
+
+CALLS = 200
+DOCUMENTS = {
+    ".html": b"<html><body><h1>Invoice 42</h1><p>Total: 10 EUR</p><ul><li>a</li><li>b</li></ul></body></html>",
+    ".csv": b"sku,qty,price\nA-1,2,3.50\nB-7,1,12.00\n",
+    ".txt": b"Short plain-text attachment body.\n",
+}
+
+
+def _baseline_convert(req: ConversionRequest) -> str:
+    # Previous behaviour: a new MarkItDown (all converters re-registered) on every call.
+    return MarkItDown().convert_stream(io.BytesIO(req.content_bytes), file_extension=req.extension).text_content
+
+
+def _ms_per_call(convert, req: ConversionRequest) -> float:
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        convert(req)
+    return (time.perf_counter() - start) / CALLS * 1000
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = str(Path(tmp) / "debug.log")
+
+        def pooled(req: ConversionRequest) -> str:
+            return convert_document(req, log_file=log_file).markdown
+
+        for extension, content in DOCUMENTS.items():
+            req = ConversionRequest(extension=extension, content_bytes=content)
+            clear_markitdown_pool()
+            pooled(req)  # warm-up builds the pooled instance once
+            baseline_ms = _ms_per_call(_baseline_convert, req)
+            pooled_ms = _ms_per_call(pooled, req)
+            print(
+                f"{extension:6} new MarkItDown per call: {baseline_ms:7.2f} ms/call   "
+                f"pooled: {pooled_ms:7.2f} ms/call   ({baseline_ms / pooled_ms:4.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
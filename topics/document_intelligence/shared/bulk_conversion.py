@@ -0,0 +1,249 @@
+"""Bulk document conversion fanned out over a worker pool.
+
+Complies with:
+- core/GLOBAL_RULES.md
+- core/LOGGING_STANDARD.md
+- core/STRUCTURED_OUTPUT_STANDARD.md
+"""
+
+from __future__ import annotations
+
+import glob
+import os
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    CancelledError,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Literal
+
+from .conversion_cache import ConversionCache
+from .logging_adapter import get_debug_file_logger
+from .markitdown_wrapper import convert_document
+from .structured_models import BulkConversionItem, FileConversionRequest
+
+DEFAULT_LOG_FILE = "logs/document_intelligence/markitdown_debug.log"
+# A file in flight during this many worker crashes is retried alone; a crash while it runs
+# alone is reported as its failure.
+CRASHES_BEFORE_ISOLATION = 2
+
+# Set once per worker by `_init_worker`; LLM clients and SQLite connections are not
+# picklable, so each worker builds its own instead of receiving one per task. Thread-local,
+# so thread-pool workers (and concurrent `convert_paths` calls) keep separate state.
+_worker = threading.local()
+
+
+def collect_input_paths(
+    *,
+    input_dir: str | None = None,
+    pattern: str | None = None,
+    manifest: str | None = None,
+    extensions: Iterable[str] | None = None,
+) -> list[Path]:
+    """Resolve a directory (recursive), a glob pattern and/or a manifest into a sorted, de-duplicated file list.
+
+    A manifest is a text file with one path per line; blank lines and `#` comments are skipped
+    and relative paths are resolved against the manifest's directory. `extensions` (e.g.
+    `{".pdf", ".docx"}`) filters directory and glob matches, not explicit manifest entries.
+    """
+    allowed = {ext.lower() for ext in extensions} if extensions else None
+
+    def wanted(path: Path) -> bool:
+        return path.is_file() and (allowed is None or path.suffix.lower() in allowed)
+
+    paths: set[Path] = set()
+    if input_dir is not None:
+        paths.update(path for path in Path(input_dir).rglob("*") if wanted(path))
+    if pattern is not None:
+        paths.update(path for path in map(Path, glob.glob(pattern, recursive=True)) if wanted(path))
+    if manifest is not None:
+        base = Path(manifest).parent
+        for line in Path(manifest).read_text(encoding="utf-8").splitlines():
+            entry = line.strip()
+            if entry and not entry.startswith("#"):
+                path = Path(entry)
+                paths.add(path if path.is_absolute() else base / path)
+    return sorted(paths)
+
+
+def _init_worker(
+    llm_client_factory: Callable[[], Any] | None,
+    cache_path: str | None,
+    opened_caches: list[ConversionCache] | None = None,
+) -> None:
+    _worker.llm_client = llm_client_factory() if llm_client_factory is not None else None
+    _worker.cache = ConversionCache(cache_path) if cache_path is not None else None
+    if opened_caches is not None and _worker.cache is not None:
+        opened_caches.append(_worker.cache)
+
+
+def _convert_path(
+    path: str,
+    enable_visual_mode: bool,
+    llm_model: str | None,
+    log_file: str,
+) -> BulkConversionItem:
+    """Worker entry point: read, convert and report one file; never raises for per-file errors."""
+    try:
+        req = FileConversionRequest(
+            source_path=Path(path),
+            extension=Path(path).suffix.lower(),
+            enable_visual_mode=enable_visual_mode,
+            llm_model=llm_model,
+        )
+        result = convert_document(
+            req,
+            llm_client=getattr(_worker, "llm_client", None),
+            log_file=log_file,
+            cache=getattr(_worker, "cache", None),
+        )
+    except Exception as exc:
+        return BulkConversionItem(source_path=path, error_type=type(exc).__name__, error_message=str(exc))
+    return BulkConversionItem(source_path=path, result=result)
+
+
+def convert_paths(
+    paths: Iterable[str | Path],
+    *,
+    max_workers: int | None = None,
+    executor: Literal["process", "thread"] | None = None,
+    enable_visual_mode: bool = False,
+    llm_model: str | None = None,
+    llm_client_factory: Callable[[], Any] | None = None,
+    max_in_flight: int | None = None,
+    cache_path: str | None = None,
+    log_file: str = DEFAULT_LOG_FILE,
+) -> Iterator[BulkConversionItem]:
+    """Convert many files concurrently, yielding one `BulkConversionItem` per file as each finishes.
+
+    MarkItDown parsing is CPU-bound, so the default is a process pool (one interpreter per
+    core); visual mode waits on the LLM instead and defaults to `executor="thread"`. Each worker opens its own file
+    and MarkItDown reads it directly, so document bytes are never pickled or held as `bytes`. At most `max_in_flight` files
+    (default 4 x workers) are queued at once, which keeps memory flat for very large inputs.
+    Failures are reported per file and never abort the batch. If a worker process dies, a
+    fresh pool takes over and the files in flight with it are resubmitted; a file caught in
+    `CRASHES_BEFORE_ISOLATION` crashes is retried alone and reported as a `BrokenProcessPool`
+    failure only if it kills its worker again.
+    Results arrive in completion order, not input order. With `cache_path`, every worker
+    shares one `ConversionCache` file, so re-ingested documents are not parsed again.
+    """
+    logger = get_debug_file_logger("document_intelligence.bulk", log_file)
+    if executor is None:
+        executor = "thread" if enable_visual_mode else "process"
+    pending_paths = iter(str(path) for path in paths)
+    # Thread workers share this process, so their caches are closed here once the pool is done;
+    # process workers release theirs when the process exits.
+    opened_caches: list[ConversionCache] = []
+
+    def new_pool() -> Executor:
+        if executor == "process":
+            return ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_worker, initargs=(llm_client_factory, cache_path)
+            )
+        return ThreadPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(llm_client_factory, cache_path, opened_caches),
+        )
+
+    pool = new_pool()
+    window = max_in_flight or 4 * (max_workers or os.cpu_count() or 1)
+    # Each future remembers the pool it ran on, so a late failure from a replaced pool is not
+    # mistaken for a crash of the current one.
+    in_flight: dict[Future[BulkConversionItem], tuple[str, Executor]] = {}
+    retries: deque[str] = deque()
+    suspects: deque[str] = deque()
+    crashes: dict[str, int] = {}
+    isolated: str | None = None
+    converted = failed = 0
+
+    def replace_pool(dead: Executor) -> None:
+        nonlocal pool
+        if dead is pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+            pool = new_pool()
+            logger.debug("bulk_conversion_pool_replaced in_flight=%s", len(in_flight))
+
+    def submit(path: str) -> None:
+        try:
+            future = pool.submit(_convert_path, path, enable_visual_mode, llm_model, log_file)
+        except BrokenProcessPool:
+            replace_pool(pool)
+            future = pool.submit(_convert_path, path, enable_visual_mode, llm_model, log_file)
+        in_flight[future] = (path, pool)
+
+    def fill() -> None:
+        nonlocal isolated
+        while len(in_flight) < window and isolated is None:
+            if suspects:
+                if in_flight:
+                    return
+                isolated = suspects.popleft()
+                submit(isolated)
+                return
+            path = retries.popleft() if retries else next(pending_paths, None)
+            if path is None:
+                return
+            submit(path)
+
+    def crashed(path: str, owner: Executor, cancelled: bool) -> BulkConversionItem | None:
+        """Requeue a file lost with its pool; return a failure only for a file that crashed alone."""
+        replace_pool(owner)
+        if cancelled:
+            retries.appendleft(path)
+            return None
+        if path == isolated:
+            return BulkConversionItem(
+                source_path=path,
+                error_type=BrokenProcessPool.__name__,
+                error_message="worker process died while converting this file",
+            )
+        crashes[path] = crashes.get(path, 0) + 1
+        (suspects if crashes[path] >= CRASHES_BEFORE_ISOLATION else retries).append(path)
+        return None
+
+    logger.debug("bulk_conversion_started executor=%s visual_mode=%s", executor, enable_visual_mode)
+    try:
+        fill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, owner = in_flight.pop(future)
+                try:
+                    item = future.result()
+                except (BrokenProcessPool, CancelledError) as exc:
+                    # A crashed worker (e.g. OOM-killed) breaks the whole process pool; queued
+                    # futures of a replaced pool are cancelled.
+                    item = crashed(path, owner, isinstance(exc, CancelledError))
+                except Exception as exc:
+                    item = BulkConversionItem(source_path=path, error_type=type(exc).__name__, error_message=str(exc))
+                if path == isolated:
+                    isolated = None
+                if item is None:
+                    continue
+                if item.ok:
+                    converted += 1
+                else:
+                    failed += 1
+                    logger.debug(
+                        "bulk_conversion_failed path=%s error_type=%s error_message=%s",
+                        path,
+                        item.error_type,
+                        item.error_message,
+                    )
+                yield item
+            fill()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        for cache in opened_caches:
+            cache.close()
+        logger.debug("bulk_conversion_finished converted=%s failed=%s", converted, failed)
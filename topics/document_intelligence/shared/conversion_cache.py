@@ -0,0 +1,127 @@
+"""Content-addressed on-disk cache of converted markdown with size-based LRU eviction.
+
+Complies with:
+- core/GLOBAL_RULES.md
+- core/STRUCTURED_OUTPUT_STANDARD.md
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import BinaryIO
+
+from .structured_models import ConversionRequest, FileConversionRequest
+
+_DIGEST_CHUNK_BYTES = 1024 * 1024
+
+
+@lru_cache(maxsize=1)
+def markitdown_version() -> str:
+    try:
+        return version("markitdown")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def stream_digest(stream: BinaryIO) -> str:
+    """SHA-256 of the stream from its current position, read in chunks; the position is restored."""
+    start = stream.tell()
+    digest = hashlib.sha256()
+    while chunk := stream.read(_DIGEST_CHUNK_BYTES):
+        digest.update(chunk)
+    stream.seek(start)
+    return digest.hexdigest()
+
+
+def conversion_cache_key(req: ConversionRequest | FileConversionRequest, content_digest: str) -> str:
+    """Hash everything that can change the markdown: content, extension, mode, LLM model, MarkItDown version.
+
+    The `llm_client` object itself is not part of the key; visual-mode callers must keep
+    `llm_model` in sync with the client they pass.
+    """
+    identity = json.dumps(
+        [content_digest, req.extension, req.enable_visual_mode, req.llm_model, markitdown_version()],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+class ConversionCache:
+    """SQLite-backed map of conversion key to markdown and metadata, bounded to `max_bytes` of markdown.
+
+    Safe to share between threads and between worker processes pointing at the same file;
+    the least recently used entries are evicted once the stored markdown exceeds `max_bytes`.
+    """
+
+    def __init__(self, path: str = "cache/document_conversions.sqlite", max_bytes: int = 1024**3) -> None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS conversion_cache ("
+            "key TEXT PRIMARY KEY, markdown TEXT NOT NULL, metadata TEXT NOT NULL, "
+            "size INTEGER NOT NULL, last_access INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS conversion_cache_lru ON conversion_cache (last_access)")
+        self._conn.commit()
+
+    def get(self, key: str) -> tuple[str, dict] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT markdown, metadata FROM conversion_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE conversion_cache SET last_access = ? WHERE key = ?", (time.time_ns(), key))
+            self._conn.commit()
+        return row[0], json.loads(row[1])
+
+    def put(self, key: str, markdown: str, metadata: dict) -> None:
+        size = len(markdown.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO conversion_cache (key, markdown, metadata, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, markdown, json.dumps(metadata), size, time.time_ns()),
+            )
+            (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM conversion_cache").fetchone()
+            if total > self.max_bytes:
+                # Walk entries oldest first and drop them until the remainder fits.
+                excess = total - self.max_bytes
+                doomed: list[str] = []
+                for old_key, old_size in self._conn.execute(
+                    "SELECT key, size FROM conversion_cache WHERE key != ? ORDER BY last_access ASC", (key,)
+                ):
+                    doomed.append(old_key)
+                    excess -= old_size
+                    if excess <= 0:
+                        break
+                self._conn.executemany("DELETE FROM conversion_cache WHERE key = ?", [(k,) for k in doomed])
+            self._conn.commit()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM conversion_cache").fetchone()
+        return total
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM conversion_cache").fetchone()
+        return count
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,273 @@
+"""Incremental markdown output for document conversion.
+
+Complies with:
+- core/GLOBAL_RULES.md
+- core/LOGGING_STANDARD.md
+- core/STRUCTURED_OUTPUT_STANDARD.md
+"""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import csv
+import io
+import re
+import threading
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+from .logging_adapter import get_debug_file_logger
+from .markitdown_wrapper import get_markitdown, open_request_stream
+from .structured_models import ConversionRequest, FileConversionRequest, StreamedConversionResult
+
+DEFAULT_LOG_FILE = "logs/document_intelligence/markitdown_debug.log"
+TEXT_CHUNK_BYTES = 64 * 1024
+CSV_ROWS_PER_CHUNK = 1_000
+
+# Converts a seekable binary stream to markdown chunk by chunk, never holding the whole document.
+SectionStreamer = Callable[[BinaryIO], Iterator[str]]
+
+# Same cell escaping as MarkItDown's CsvConverter: double the backslashes before a pipe, then escape it.
+_PIPE_ESCAPE_RE = re.compile(r"(?<!\\)(\\*)\|")
+
+# Fallback split points in converted markdown: page breaks, PPTX slide markers, XLSX sheet
+# and other level-1/2 headings (unless the heading opens a slide).
+# Zero-width, so the form feed stays with its page and the pieces join back losslessly.
+_SECTION_BREAK = re.compile(r"(?<=\f)|^(?=<!-- Slide number: )|^(?<!-->\n)(?=#{1,2} )", re.MULTILINE)
+
+
+def _is_utf8(stream: BinaryIO) -> bool:
+    """Check the stream decodes as UTF-8, reading it in chunks; the position is restored."""
+    start = stream.tell()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        while raw := stream.read(TEXT_CHUNK_BYTES):
+            decoder.decode(raw)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    finally:
+        stream.seek(start)
+    return True
+
+
+def _split_sections(markdown: str) -> Iterator[str]:
+    start = 0
+    for match in _SECTION_BREAK.finditer(markdown):
+        if match.start() > start:
+            yield markdown[start:match.start()]
+            start = match.start()
+    if start < len(markdown):
+        yield markdown[start:]
+
+
+def _text_reader(stream: BinaryIO) -> io.TextIOWrapper:
+    return io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+
+def _normalize_lines(texts: Iterable[str]) -> Iterator[str]:
+    """MarkItDown's output normalization, applied as text arrives.
+
+    Like `MarkItDown.convert`: lines split on `\n` (dropping a `\r` before it) are
+    right-stripped and runs of 3+ newlines collapse to two. Trailing whitespace of the
+    current line is held back until non-whitespace follows it on the same line.
+    """
+    newlines = 0
+    held = ""
+    for text in texts:
+        out = []
+        for index, part in enumerate(text.split("\n")):
+            if index:
+                newlines += 1
+                held = ""
+            content = held + part
+            stripped = content.rstrip()
+            if stripped:
+                out.append("\n" * min(newlines, 2) + stripped)
+                newlines = 0
+                held = content[len(stripped):]
+            else:
+                held = content
+        if out:
+            yield "".join(out)
+    if newlines:
+        yield "\n" * min(newlines, 2)
+
+
+def _decoded_chunks(stream: BinaryIO) -> Iterator[str]:
+    # Plain "utf-8": MarkItDown keeps a byte-order mark in text output.
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while raw := stream.read(TEXT_CHUNK_BYTES):
+        yield decoder.decode(raw)
+    yield decoder.decode(b"", final=True)
+
+
+def stream_text(stream: BinaryIO) -> Iterator[str]:
+    """Plain text / markdown: decoded UTF-8 in fixed-size chunks, normalized like MarkItDown's output."""
+    yield from _normalize_lines(_decoded_chunks(stream))
+
+
+def _table_row(cells: list[str], width: int) -> str:
+    cells = [
+        _PIPE_ESCAPE_RE.sub(lambda m: m.group(1) * 2 + r"\|", cell).replace("\r\n", " ").replace("\n", " ").replace("\r", " ")
+        for cell in cells
+    ]
+    return "| " + " | ".join(cells + [""] * (width - len(cells))) + " |"
+
+
+def stream_csv(stream: BinaryIO) -> Iterator[str]:
+    """CSV: the same table layout as MarkItDown's CsvConverter, emitted every CSV_ROWS_PER_CHUNK rows.
+
+    A first pass finds the widest row (rows are padded to it); the second pass formats. Blank
+    rows at the start, right after the header and at the end are dropped; input must be UTF-8.
+    """
+    start = stream.tell()
+    reader = _text_reader(stream)
+    width = max((len(row) for row in csv.reader(reader)), default=0)
+    reader.detach()
+    stream.seek(start)
+    if width == 0:
+        return
+
+    reader = _text_reader(stream)
+    rows = csv.reader(reader)
+    header = next((row for row in rows if row), None)
+    lines = [_table_row(header, width), "| " + " | ".join(["---"] * width) + " |"]
+    pending_blank = 0
+    first_chunk = True
+    for row in rows:
+        if not row:
+            pending_blank += 1
+            continue
+        if len(lines) > 2 or not first_chunk:
+            lines.extend([_table_row([], width)] * pending_blank)
+        pending_blank = 0
+        lines.append(_table_row(row, width))
+        if len(lines) >= CSV_ROWS_PER_CHUNK:
+            yield ("" if first_chunk else "\n") + "\n".join(lines)
+            lines, first_chunk = [], False
+    if lines:
+        yield ("" if first_chunk else "\n") + "\n".join(lines)
+    reader.detach()
+
+
+SECTION_STREAMERS: dict[str, SectionStreamer] = {
+    ".csv": stream_csv,
+    ".txt": stream_text,
+    ".md": stream_text,
+}
+
+
+def iter_markdown_sections(
+    req: ConversionRequest | FileConversionRequest,
+    *,
+    llm_client=None,
+    log_file: str = DEFAULT_LOG_FILE,
+    streamers: dict[str, SectionStreamer] | None = None,
+) -> Iterator[str]:
+    """Yield the document's markdown in pieces; concatenated they form the full markdown.
+
+    Extensions with a `SectionStreamer` (CSV, plain text) are converted incrementally with
+    memory bounded by one chunk, provided the input is valid UTF-8; other encodings go to
+    MarkItDown, which detects the charset. MarkItDown itself only returns whole documents,
+    so every other format (and visual mode) is converted in one call and then yielded per
+    page, slide, sheet or top-level section, letting consumers start before writing completes.
+    """
+    logger = get_debug_file_logger("document_intelligence.markitdown", log_file)
+    streamer = None if req.enable_visual_mode else (streamers or SECTION_STREAMERS).get(req.extension.lower())
+
+    sections = length = 0
+    with open_request_stream(req) as stream:
+        if streamer is not None and not _is_utf8(stream):
+            streamer = None
+        logger.debug(
+            "conversion_stream_started extension=%s incremental=%s enable_visual_mode=%s",
+            req.extension,
+            streamer is not None,
+            req.enable_visual_mode,
+        )
+        if streamer is not None:
+            chunks: Iterator[str] = streamer(stream)
+        else:
+            md = get_markitdown(enable_visual_mode=req.enable_visual_mode, llm_client=llm_client)
+            markdown = md.convert_stream(stream, file_extension=req.extension).text_content
+            chunks = _split_sections(markdown)
+        for chunk in chunks:
+            sections += 1
+            length += len(chunk)
+            yield chunk
+
+    logger.debug(
+        "conversion_stream_finished extension=%s sections=%s markdown_length=%s",
+        req.extension,
+        sections,
+        length,
+    )
+
+
+def write_markdown_stream(
+    req: ConversionRequest | FileConversionRequest,
+    output_path: str | Path,
+    *,
+    llm_client=None,
+    log_file: str = DEFAULT_LOG_FILE,
+) -> StreamedConversionResult:
+    """Write markdown to `output_path` section by section instead of building one string."""
+    sections = length = 0
+    with open(output_path, "w", encoding="utf-8") as handle:
+        for chunk in iter_markdown_sections(req, llm_client=llm_client, log_file=log_file):
+            handle.write(chunk)
+            sections += 1
+            length += len(chunk)
+    return StreamedConversionResult(
+        output_path=str(output_path),
+        sections=sections,
+        markdown_length=length,
+        metadata={"extension": req.extension, "visual_mode": req.enable_visual_mode, "llm_model": req.llm_model},
+    )
+
+
+async def aiter_markdown_sections(
+    req: ConversionRequest | FileConversionRequest,
+    *,
+    llm_client=None,
+    log_file: str = DEFAULT_LOG_FILE,
+    max_buffered: int = 8,
+) -> AsyncIterator[str]:
+    """Async variant for event-loop consumers; conversion runs on a worker thread.
+
+    At most `max_buffered` chunks wait in memory: a slow consumer pauses the converter
+    (backpressure). Closing the iterator early stops the converter at its next chunk.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered)
+    stop = threading.Event()
+    finished = object()
+
+    def produce() -> None:
+        outcome: object = finished
+        try:
+            for chunk in iter_markdown_sections(req, llm_client=llm_client, log_file=log_file):
+                if stop.is_set():
+                    return
+                asyncio.run_coroutine_threadsafe(queue.put(chunk), loop).result()
+        except Exception as exc:
+            outcome = exc
+        if not stop.is_set():
+            asyncio.run_coroutine_threadsafe(queue.put(outcome), loop).result()
+
+    producer = loop.run_in_executor(None, produce)
+    try:
+        while (item := await queue.get()) is not finished:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        # Unblock a producer waiting on a full queue, then let its thread exit.
+        while not producer.done():
+            while not queue.empty():
+                queue.get_nowait()
+            await asyncio.sleep(0.01)
@@ -9,21 +9,94 @@ Complies with:
 
 from __future__ import annotations
 
+import hashlib
 import io
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, BinaryIO
 
 from markitdown import MarkItDown
 
+from .conversion_cache import ConversionCache, conversion_cache_key, stream_digest
 from .logging_adapter import get_debug_file_logger
-from .structured_models import ConversionRequest, ConversionResult
+from .structured_models import ConversionRequest, ConversionResult, FileConversionRequest
+
+# Non-seekable inputs are spooled in memory up to this size, then to a temp file on disk.
+SPOOL_MAX_MEMORY_BYTES = 8 * 1024 * 1024
+# Per-thread bound on pooled MarkItDown instances (least recently used are dropped).
+MARKITDOWN_POOL_MAX_INSTANCES = 8
+
+
+# Per-thread MarkItDown instances: construction registers every built-in converter
+# (and loads magika), which costs more than converting a small document. Instances
+# are never shared between threads, so converters need not be thread-safe.
+_local = threading.local()
+
+
+def get_markitdown(*, enable_visual_mode: bool = False, llm_client=None) -> Any:
+    """Return this thread's MarkItDown for the mode, building it on first use only.
+
+    Instances are keyed by the MarkItDown class, the mode and, in visual mode, the identity
+    of `llm_client`; a pooled instance keeps its client alive, so the id cannot be reused
+    while the entry exists. Each thread keeps at most MARKITDOWN_POOL_MAX_INSTANCES, so
+    callers that build a client per request do not grow the pool (or pin clients) unboundedly.
+    """
+    instances: OrderedDict[tuple, Any] = _local.__dict__.setdefault("instances", OrderedDict())
+    key = (MarkItDown, enable_visual_mode, id(llm_client) if enable_visual_mode else None)
+    md = instances.get(key)
+    if md is None:
+        md = MarkItDown(llm_client=llm_client) if enable_visual_mode else MarkItDown()
+        instances[key] = md
+        while len(instances) > MARKITDOWN_POOL_MAX_INSTANCES:
+            instances.popitem(last=False)
+    else:
+        instances.move_to_end(key)
+    return md
+
+
+def clear_markitdown_pool() -> None:
+    """Drop the calling thread's cached instances (e.g. after swapping plugins or clients)."""
+    _local.__dict__.pop("instances", None)
+
+
+@contextmanager
+def open_request_stream(req: ConversionRequest | FileConversionRequest) -> Iterator[BinaryIO]:
+    """Yield a seekable binary stream over the request payload without copying it.
+
+    `BytesIO(bytes)` shares the request's buffer until written to; a path is opened as a
+    buffered file handle; a non-seekable stream is spooled (MarkItDown would otherwise
+    buffer it fully in memory).
+    """
+    if isinstance(req, ConversionRequest):
+        yield io.BytesIO(req.content_bytes)
+    elif req.source_path is not None:
+        with open(req.source_path, "rb") as handle:
+            yield handle
+    elif req.stream.seekable():
+        yield req.stream
+    else:
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_BYTES) as spool:
+            shutil.copyfileobj(req.stream, spool)
+            spool.seek(0)
+            yield spool
 
 
 def convert_document(
-    req: ConversionRequest,
+    req: ConversionRequest | FileConversionRequest,
     *,
     llm_client=None,
     log_file: str = "logs/document_intelligence/markitdown_debug.log",
+    cache: ConversionCache | None = None,
 ) -> ConversionResult:
-    """Convert document bytes to markdown via binary stream conversion only."""
+    """Convert document bytes, a file or a stream to markdown via binary stream conversion only.
+
+    With `cache`, identical content converted with the same extension, mode, LLM model and
+    MarkItDown version is served from disk; `metadata["cache_hit"]` reports which happened.
+    """
     logger = get_debug_file_logger("document_intelligence.markitdown", log_file)
     logger.debug(
         "conversion_started extension=%s enable_visual_mode=%s llm_model=%s",
@@ -32,15 +105,35 @@ def convert_document(
         req.llm_model,
     )
 
-    stream = io.BytesIO(req.content_bytes)
-    md = MarkItDown(llm_client=llm_client) if req.enable_visual_mode else MarkItDown()
-    result = md.convert_stream(stream, file_extension=req.extension)
+    with open_request_stream(req) as stream:
+        cache_key = None
+        if cache is not None:
+            content_digest = (
+                hashlib.sha256(req.content_bytes).hexdigest()
+                if isinstance(req, ConversionRequest)
+                else stream_digest(stream)
+            )
+            cache_key = conversion_cache_key(req, content_digest)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                markdown, metadata = cached
+                logger.debug(
+                    "conversion_cache_hit extension=%s markdown_length=%s",
+                    req.extension,
+                    len(markdown),
+                )
+                return ConversionResult(markdown=markdown, metadata={**metadata, "cache_hit": True})
+
+        md = get_markitdown(enable_visual_mode=req.enable_visual_mode, llm_client=llm_client)
+        result = md.convert_stream(stream, file_extension=req.extension)
 
     metadata = {
         "extension": req.extension,
         "visual_mode": req.enable_visual_mode,
         "llm_model": req.llm_model,
     }
+    if cache_key is not None:
+        cache.put(cache_key, result.text_content, metadata)
 
     logger.debug(
         "conversion_finished extension=%s markdown_length=%s",
@@ -48,4 +141,4 @@ def convert_document(
         len(result.text_content),
     )
 
-    return ConversionResult(markdown=result.text_content, metadata=metadata)
+    return ConversionResult(markdown=result.text_content, metadata={**metadata, "cache_hit": False})
@@ -5,7 +5,10 @@ Complies with:
 - core/STRUCTURED_OUTPUT_STANDARD.md
 """
 
-from pydantic import BaseModel, Field
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, Field, model_validator
 
 
 class ConversionRequest(BaseModel):
@@ -15,6 +18,50 @@ class ConversionRequest(BaseModel):
     llm_model: str | None = Field(default=None)
 
 
+class FileConversionRequest(BaseModel):
+    """Request variant for large documents: MarkItDown reads from the file or stream directly.
+
+    Exactly one of `source_path` / `stream` is required. The payload is never materialized as
+    `bytes`; non-seekable streams are spooled to a temporary file rather than to memory.
+    """
+
+    source_path: Path | None = Field(default=None, description="Document path, opened read-only")
+    stream: Any = Field(default=None, description="Open binary stream (anything with read()), read from its current position")
+    extension: str | None = Field(default=None, description="Defaults to the suffix of source_path")
+    enable_visual_mode: bool = Field(default=False)
+    llm_model: str | None = Field(default=None)
+
+    @model_validator(mode="after")
+    def _check_source(self) -> "FileConversionRequest":
+        if (self.source_path is None) == (self.stream is None):
+            raise ValueError("exactly one of source_path or stream is required")
+        if self.stream is not None and not callable(getattr(self.stream, "read", None)):
+            raise ValueError("stream must be a binary file-like object with read()")
+        if self.extension is None:
+            if self.source_path is None or not self.source_path.suffix:
+                raise ValueError("extension is required when it cannot be taken from source_path")
+            self.extension = self.source_path.suffix.lower()
+        return self
+
+
 class ConversionResult(BaseModel):
     markdown: str
     metadata: dict
+
+
+class StreamedConversionResult(BaseModel):
+    output_path: str = Field(..., description="Markdown file written incrementally")
+    sections: int = Field(..., description="Number of chunks written")
+    markdown_length: int = Field(..., description="Characters written")
+    metadata: dict
+
+
+class BulkConversionItem(BaseModel):
+    source_path: str = Field(..., description="Input document path")
+    result: ConversionResult | None = Field(default=None, description="Set when conversion succeeded")
+    error_type: str | None = Field(default=None, description="Exception class name on failure")
+    error_message: str | None = Field(default=None, description="Exception message on failure")
+
+    @property
+    def ok(self) -> bool:
+        return self.result is not None
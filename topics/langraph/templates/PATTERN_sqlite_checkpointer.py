@@ -0,0 +1,406 @@
+"""
+PATTERN: SQLite checkpoint store for durable, resumable LangGraph threads
+
+Compile a graph with `checkpointer=SqliteCheckpointSaver("checkpoints/agent.sqlite")`
+and invoke it with `{"configurable": {"thread_id": ...}}`. Every super-step is then
+persisted to a local file, so a thread interrupted by a crash or worker restart
+resumes from its last completed step:
+
+    graph.invoke(None, {"configurable": {"thread_id": "user_123"}})
+
+Storage layout (same model as the official Postgres/SQLite savers):
+- `checkpoints`: one small row per super-step (channel versions, metadata, parent).
+- `blobs`: channel values keyed by (channel, version). `put` only receives the
+  channels whose version changed in that step (`new_versions`), so unchanged
+  channels point at blobs written by earlier steps. List channels that only grew
+  since the blob last written for them (e.g. `messages` under `add_messages`)
+  store just the appended items plus `base_version`, the blob they extend; reads
+  follow the chain back to a full value. A list that was edited (a message
+  replaced or removed, e.g. by `compaction_node`), the first write after a
+  restart, and every `MAX_DELTA_CHAIN`-th delta are stored whole, which bounds
+  the read cost.
+- `writes`: per-task outputs recorded as soon as each task finishes. On resume,
+  LangGraph replays these pending writes instead of re-running the tasks that
+  already completed in the interrupted super-step (finished LLM/tool calls are
+  not repeated).
+
+Each `put` / `put_writes` call is one transaction, i.e. one fsync per
+super-step checkpoint and one per finished task. WAL journaling with
+synchronous=NORMAL keeps those commits cheap while staying crash-safe.
+"""
+
+import asyncio
+import random
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+    writes_sort_key,
+)
+
+
+# A list blob is stored whole again after this many consecutive appended-only deltas.
+MAX_DELTA_CHAIN = 32
+# (thread, namespace, channel) entries remembered as delta bases; older threads start a new full blob.
+DELTA_BASE_CACHE_SIZE = 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    checkpoint_type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    value_type TEXT NOT NULL,
+    value BLOB,
+    base_version TEXT,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    value_type TEXT NOT NULL,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+
+# Marks a channel with no stored value (distinct from a stored None).
+_EMPTY = object()
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    File-backed checkpointer storing changed channels per step and per-task writes.
+
+    One connection is shared by all threads behind a lock; async methods run the
+    same queries on a worker thread so the event loop is never blocked on disk.
+    The last list written per thread and channel is kept in memory (bounded LRU)
+    to detect appended-only updates without reading the previous blob back.
+    """
+
+    def __init__(self, path: str = "checkpoints/langgraph.sqlite", *, serde: SerializerProtocol | None = None):
+        super().__init__(serde=serde)
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        # (thread_id, checkpoint_ns, channel) -> (version, value, delta chain length)
+        self._delta_bases: OrderedDict[tuple[str, str, str], tuple[str, list, int]] = OrderedDict()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------ reads
+
+    def _tuple_from_row(self, row: tuple) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, c_type, c_blob, m_type, m_blob = row
+        checkpoint: Checkpoint = self.serde.loads_typed((c_type, c_blob))
+
+        channel_values: dict[str, Any] = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            value = self._load_blob(thread_id, checkpoint_ns, channel, str(version))
+            if value is not _EMPTY:
+                channel_values[channel] = value
+
+        writes = self._conn.execute(
+            "SELECT task_id, idx, channel, value_type, value, task_path FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        writes.sort(key=lambda w: writes_sort_key(w[5], w[0], w[1]))
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=self.serde.loads_typed((m_type, m_blob)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((v_type, value)))
+                for task_id, _, channel, v_type, value, _ in writes
+            ],
+        )
+
+    def _load_blob(self, thread_id: str, checkpoint_ns: str, channel: str, version: str) -> Any:
+        """Channel value at `version`, joining appended-item deltas onto their full base value."""
+        suffixes: list[list] = []
+        while True:
+            blob = self._conn.execute(
+                "SELECT value_type, value, base_version FROM blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, version),
+            ).fetchone()
+            if blob is None or blob[0] == "empty":
+                return _EMPTY
+            value_type, value, base_version = blob
+            value = self.serde.loads_typed((value_type, value))
+            if base_version is None:
+                break
+            suffixes.append(value)
+            version = base_version
+        for suffix in reversed(suffixes):
+            value = [*value, *suffix]
+        return value
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "checkpoint_type, checkpoint, metadata_type, metadata FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        params: tuple = (thread_id, checkpoint_ns)
+        if checkpoint_id := get_checkpoint_id(config):
+            query += " AND checkpoint_id = ?"
+            params += (checkpoint_id,)
+        else:
+            # Checkpoint ids are time-ordered (uuid6), so the max id is the latest step.
+            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+            return self._tuple_from_row(row) if row else None
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+                "checkpoint_type, checkpoint, metadata_type, metadata FROM checkpoints"
+                f"{where} ORDER BY checkpoint_id DESC",
+                params,
+            ).fetchall()
+
+        for row in rows:
+            if limit is not None and limit <= 0:
+                break
+            with self._lock:
+                checkpoint_tuple = self._tuple_from_row(row)
+            if filter and not all(checkpoint_tuple.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            if limit is not None:
+                limit -= 1
+            yield checkpoint_tuple
+
+    # ----------------------------------------------------------------- writes
+
+    def _blob_row(
+        self, thread_id: str, checkpoint_ns: str, channel: str, version: str, values: dict[str, Any]
+    ) -> tuple[tuple, tuple[str, list, int] | None]:
+        """Row for one changed channel, plus the delta base to remember once it is committed."""
+        if channel not in values:
+            return (thread_id, checkpoint_ns, channel, version, "empty", None, None), None
+        value = values[channel]
+        if not isinstance(value, list):
+            return (thread_id, checkpoint_ns, channel, version, *self.serde.dumps_typed(value), None), None
+
+        with self._lock:
+            base = self._delta_bases.get((thread_id, checkpoint_ns, channel))
+        if base is not None:
+            base_version, base_value, depth = base
+            if (
+                depth < MAX_DELTA_CHAIN
+                and len(value) >= len(base_value)
+                and all(old is new or old == new for old, new in zip(base_value, value))
+            ):
+                suffix = value[len(base_value):]
+                row = (thread_id, checkpoint_ns, channel, version, *self.serde.dumps_typed(suffix), base_version)
+                return row, (version, list(value), depth + 1)
+        row = (thread_id, checkpoint_ns, channel, version, *self.serde.dumps_typed(value), None)
+        return row, (version, list(value), 0)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_copy = checkpoint.copy()
+        values: dict[str, Any] = checkpoint_copy.pop("channel_values")  # type: ignore[misc]
+
+        # Only channels updated in this super-step are written; grown lists as deltas.
+        blob_rows = []
+        new_bases = {}
+        for channel, version in new_versions.items():
+            row, base = self._blob_row(thread_id, checkpoint_ns, channel, str(version), values)
+            blob_rows.append(row)
+            if base is not None:
+                new_bases[(thread_id, checkpoint_ns, channel)] = base
+        c_type, c_blob = self.serde.dumps_typed(checkpoint_copy)
+        m_type, m_blob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+
+        with self._lock:
+            with self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?, ?)", blob_rows)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, checkpoint["id"], config["configurable"].get("checkpoint_id"),
+                     c_type, c_blob, m_type, m_blob),
+                )
+            # Bases are remembered only once their blobs are committed.
+            for key, base in new_bases.items():
+                self._delta_bases[key] = base
+                self._delta_bases.move_to_end(key)
+            while len(self._delta_bases) > DELTA_BASE_CACHE_SIZE:
+                self._delta_bases.popitem(last=False)
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = [
+            (thread_id, checkpoint_ns, checkpoint_id, task_id, WRITES_IDX_MAP.get(channel, idx),
+             channel, *self.serde.dumps_typed(value), task_path)
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        # Special writes (errors, interrupts) are overwritten; regular writes are first-wins,
+        # so a retried task cannot clobber the output recorded for the original attempt.
+        verb = "INSERT OR REPLACE" if all(channel in WRITES_IDX_MAP for channel, _ in writes) else "INSERT OR IGNORE"
+        with self._lock, self._conn:
+            self._conn.executemany(f"{verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock, self._conn:
+            for table in ("checkpoints", "blobs", "writes"):
+                self._conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            for key in [key for key in self._delta_bases if key[0] == thread_id]:
+                del self._delta_bases[key]
+
+    def get_next_version(self, current: str | None, channel: None) -> str:
+        # Same scheme as InMemorySaver: zero-padded counter plus a random suffix so
+        # versions stay unique (and sortable) across forks of the same thread.
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # ------------------------------------------------------------------ async
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
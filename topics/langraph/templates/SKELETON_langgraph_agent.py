@@ -15,15 +15,39 @@ To use:
 4. Extend state schema or add nodes as needed
 """
 
-from typing import Annotated, TypedDict
-
+import asyncio
+import contextvars
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Annotated, Any, Callable, TypedDict
+
+from langgraph.errors import GraphBubbleUp
 from langgraph.graph import StateGraph, START, END
-from langgraph.graph.message import add_messages
+from langgraph.graph.message import REMOVE_ALL_MESSAGES, add_messages
 from langgraph.prebuilt import ToolNode
 from langgraph.types import Command
 
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
-from langchain_core.tools import tool
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+    ToolCall,
+    ToolMessage,
+    get_buffer_string,
+)
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.tools import BaseTool, tool
+from pydantic import BaseModel, Field, ValidationError
+
+from topics.agent.shared.logging_adapter import build_topic_logger
+from topics.agent.shared.node_metrics import NodeMetrics
+from topics.agent.shared.tool_cache import cacheable
+from topics.langraph.templates.PATTERN_sqlite_checkpointer import SqliteCheckpointSaver
 
 
 # ============================================================================
@@ -44,7 +68,15 @@ class AgentState(TypedDict):
 # STEP 2: Define Tools (Example)
 # ============================================================================
 
-@tool
+class ExampleToolArgs(BaseModel):
+    query: str = Field(..., description="Query to process")
+
+
+# Deterministic tools can opt into result caching: repeated calls with the same
+# validated arguments (within or across conversations) skip the tool body until
+# the TTL expires. Pass cache=DiskToolCache() to share results across processes.
+@cacheable(ttl_s=600)
+@tool(args_schema=ExampleToolArgs)
 def example_tool(query: str) -> str:
     """
     Example tool that processes a query.
@@ -101,24 +133,352 @@ def agent_node(state: AgentState) -> Command[AgentState]:
         )
 
 
+# ============================================================================
+# STEP 4b: Parallel Tool Execution
+# ============================================================================
+
+ToolErrorHandling = bool | str | Callable[[Exception], str] | type[Exception] | tuple[type[Exception], ...]
+
+
+def _default_tool_error_handler(exc: Exception) -> str:
+    """ToolNode's default: only invalid tool arguments are reported back to the model."""
+    if isinstance(exc, ValidationError):
+        return f"Error: invalid arguments: {exc}"
+    raise exc
+
+
+class ParallelToolNode:
+    """
+    Runs every tool call of the last AIMessage concurrently, so a multi-tool turn
+    costs max(tool latency) instead of sum(tool latency).
+
+    - Sync tools run on a shared thread pool; async tools run on the event loop
+      (`ainvoke`) or, when the graph is invoked synchronously, via asyncio.run on
+      a pool thread.
+    - Each call gets its own timeout (`timeouts[tool_name]`, else `default_timeout_s`);
+      a timed-out call or an unknown tool becomes a ToolMessage with status="error" so
+      the LLM can react. A timed-out sync tool keeps its pool thread until it returns.
+    - Tool exceptions follow ToolNode's `handle_tool_errors`: by default only invalid
+      arguments are reported to the model and everything else is raised; True turns every
+      exception into an error ToolMessage, a string replaces the message, a callable builds
+      it, and exception types limit which errors are caught. GraphInterrupt and other
+      GraphBubbleUp signals are always re-raised, so `interrupt()` pauses the graph.
+    - ToolMessages are returned in tool_calls order regardless of completion order. Tools
+      that return a `Command` have it returned alongside the messages, as ToolNode does;
+      the Command's update must carry the call's ToolMessage.
+    - The graph's RunnableConfig is passed to every tool and pool threads run in a copy
+      of the caller's context, so callbacks, LangSmith tracing and get_config() behave
+      as under ToolNode. Tools with injected arguments (InjectedState, InjectedStore,
+      ToolRuntime) are executed through a single-tool ToolNode, which does the injection.
+    """
+
+    def __init__(
+        self,
+        tools: list[BaseTool],
+        *,
+        max_workers: int = 8,
+        default_timeout_s: float = 30.0,
+        timeouts: dict[str, float] | None = None,
+        handle_tool_errors: ToolErrorHandling = _default_tool_error_handler,
+    ):
+        self.tools_by_name = {t.name: t for t in tools}
+        self.handle_tool_errors = handle_tool_errors
+        self._injecting_nodes = {
+            t.name: ToolNode([t], handle_tool_errors=handle_tool_errors) for t in tools if self._has_injected_args(t)
+        }
+        self.default_timeout_s = default_timeout_s
+        self.timeouts = timeouts or {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+
+    def _timeout(self, name: str) -> float:
+        return self.timeouts.get(name, self.default_timeout_s)
+
+    @staticmethod
+    def _has_injected_args(tool_: BaseTool) -> bool:
+        # Injected parameters are part of the input schema but hidden from the model's schema.
+        model_fields = getattr(tool_.tool_call_schema, "model_fields", None)
+        return model_fields is not None and bool(set(tool_.get_input_schema().model_fields) - set(model_fields))
+
+    @staticmethod
+    def _tool_calls(state: AgentState) -> list[ToolCall]:
+        return state["messages"][-1].tool_calls
+
+    @staticmethod
+    def _error(call: ToolCall, message: str) -> ToolMessage:
+        return ToolMessage(content=message, name=call["name"], tool_call_id=call["id"], status="error")
+
+    def _handle_error(self, call: ToolCall, exc: Exception) -> ToolMessage:
+        flag = self.handle_tool_errors
+        if isinstance(exc, GraphBubbleUp) or flag is False:
+            raise exc
+        if isinstance(flag, (type, tuple)):
+            if not isinstance(exc, flag):
+                raise exc
+            return self._error(call, f"Error: {exc!r}")
+        if isinstance(flag, str):
+            return self._error(call, flag)
+        if callable(flag):
+            return self._error(call, flag(exc))
+        return self._error(call, f"Error: {exc!r}")
+
+    @staticmethod
+    def _combine(outputs: list[ToolMessage | Command]) -> dict[str, Any] | list[Any]:
+        commands = [output for output in outputs if isinstance(output, Command)]
+        messages = [output for output in outputs if not isinstance(output, Command)]
+        if not commands:
+            return {"messages": messages}
+        return [*commands, {"messages": messages}] if messages else commands
+
+    @staticmethod
+    def _single_call_state(state: AgentState, call: ToolCall) -> dict[str, Any]:
+        return {**state, "messages": [*state["messages"][:-1], AIMessage(content="", tool_calls=[call])]}
+
+    @staticmethod
+    def _node_output(output: dict[str, Any] | list[Any]) -> ToolMessage | Command:
+        # A single-call ToolNode returns {"messages": [message]} or [command].
+        return output["messages"][0] if isinstance(output, dict) else output[0]
+
+    def _run_one(self, call: ToolCall, state: AgentState, config: RunnableConfig | None) -> ToolMessage | Command:
+        if call["name"] in self._injecting_nodes:
+            node = self._injecting_nodes[call["name"]]
+            return self._node_output(node.invoke(self._single_call_state(state, call), config))
+        tool_ = self.tools_by_name[call["name"]]
+        tool_call = {**call, "type": "tool_call"}
+        if getattr(tool_, "func", None) is None and getattr(tool_, "coroutine", None) is not None:
+            # Async-only tool inside a synchronous graph run: give it a private loop on this pool thread
+            return asyncio.run(tool_.ainvoke(tool_call, config))
+        return tool_.invoke(tool_call, config)
+
+    async def _arun_one(
+        self, call: ToolCall, state: AgentState, config: RunnableConfig | None
+    ) -> ToolMessage | Command:
+        if call["name"] in self._injecting_nodes:
+            node = self._injecting_nodes[call["name"]]
+            return self._node_output(await node.ainvoke(self._single_call_state(state, call), config))
+        tool_ = self.tools_by_name[call["name"]]
+        tool_call = {**call, "type": "tool_call"}
+        if getattr(tool_, "coroutine", None) is not None:
+            return await tool_.ainvoke(tool_call, config)
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._executor, context.run, tool_.invoke, tool_call, config)
+
+    def invoke(self, state: AgentState, config: RunnableConfig | None = None) -> dict[str, Any] | list[Any]:
+        calls = self._tool_calls(state)
+        start = time.monotonic()
+        futures = {
+            index: self._executor.submit(contextvars.copy_context().run, self._run_one, call, state, config)
+            for index, call in enumerate(calls)
+            if call["name"] in self.tools_by_name
+        }
+        outputs: list[ToolMessage | Command] = []
+        for index, call in enumerate(calls):
+            if index not in futures:
+                outputs.append(self._error(call, f"Error: unknown tool {call['name']!r}"))
+                continue
+            remaining = self._timeout(call["name"]) - (time.monotonic() - start)
+            try:
+                outputs.append(futures[index].result(timeout=max(remaining, 0.0)))
+            except TimeoutError:
+                futures[index].cancel()
+                outputs.append(self._error(call, f"Error: {call['name']} timed out after {self._timeout(call['name'])}s"))
+            except Exception as exc:
+                outputs.append(self._handle_error(call, exc))
+        return self._combine(outputs)
+
+    async def ainvoke(self, state: AgentState, config: RunnableConfig | None = None) -> dict[str, Any] | list[Any]:
+        async def run_with_timeout(call: ToolCall) -> ToolMessage | Command:
+            if call["name"] not in self.tools_by_name:
+                return self._error(call, f"Error: unknown tool {call['name']!r}")
+            try:
+                return await asyncio.wait_for(
+                    self._arun_one(call, state, config), timeout=self._timeout(call["name"])
+                )
+            except TimeoutError:
+                return self._error(call, f"Error: {call['name']} timed out after {self._timeout(call['name'])}s")
+            except Exception as exc:
+                return self._handle_error(call, exc)
+
+        # gather preserves argument order, so messages follow tool_calls order.
+        outputs = await asyncio.gather(*(run_with_timeout(call) for call in self._tool_calls(state)))
+        return self._combine(list(outputs))
+
+
+# Tool failures go back to the model as error ToolMessages so it can retry or explain.
+parallel_tools = ParallelToolNode(TOOLS, timeouts={"example_tool": 10.0}, handle_tool_errors=True)
+
+
+# ============================================================================
+# STEP 4c: History Compaction
+# ============================================================================
+
+# Per-call prompt budget for the message history (approximate tokens).
+HISTORY_TOKEN_BUDGET = 4_000
+# Tool outputs at least this long are stored once; later identical outputs become references.
+LARGE_TOOL_OUTPUT_CHARS = 2_000
+HISTORY_SUMMARY_ID = "history_summary"
+
+
+def summarize_with_llm(messages: list[BaseMessage]) -> str:
+    """Condense dropped turns (and any earlier summary) into a short running summary."""
+    prompt = (
+        "Summarize this conversation so far in a few sentences, keeping facts, "
+        "decisions and open questions the assistant will still need:\n\n"
+        + get_buffer_string(messages)
+    )
+    return llm.invoke(prompt).content
+
+
+def _duplicate_output_note(tool_call_id: str) -> str:
+    return f"[identical to the output of tool call {tool_call_id}]"
+
+
+def _dedupe_tool_outputs(messages: list[BaseMessage], large_output_chars: int) -> list[BaseMessage]:
+    """Replace repeated large ToolMessage outputs with a reference to the first one in `messages`."""
+    first_call_by_digest: dict[str, str] = {}
+    deduped: list[BaseMessage] = []
+    for message in messages:
+        if isinstance(message, ToolMessage) and isinstance(message.content, str) \
+                and len(message.content) >= large_output_chars:
+            digest = hashlib.sha256(message.content.encode("utf-8")).hexdigest()
+            first_call = first_call_by_digest.setdefault(digest, message.tool_call_id)
+            if first_call != message.tool_call_id:
+                message = message.model_copy(update={"content": _duplicate_output_note(first_call)})
+        deduped.append(message)
+    return deduped
+
+
+def _restore_tool_outputs(messages: list[BaseMessage]) -> list[BaseMessage]:
+    """Undo `_dedupe_tool_outputs` (from an earlier compaction) so references can be rebuilt."""
+    outputs = {
+        _duplicate_output_note(m.tool_call_id): m.content for m in messages if isinstance(m, ToolMessage)
+    }
+    return [
+        m.model_copy(update={"content": outputs[m.content]})
+        if isinstance(m, ToolMessage) and isinstance(m.content, str) and m.content in outputs
+        else m
+        for m in messages
+    ]
+
+
+def compact_history(
+    messages: list[BaseMessage],
+    *,
+    max_tokens: int = HISTORY_TOKEN_BUDGET,
+    summarize: Callable[[list[BaseMessage]], str] | None = None,
+    large_output_chars: int = LARGE_TOOL_OUTPUT_CHARS,
+) -> list[BaseMessage] | None:
+    """
+    Bound the history sent to the LLM. Returns None when nothing changed.
+
+    1. Large ToolMessage outputs repeated verbatim are replaced by a reference to
+       the first surviving tool call that produced them (references are rebuilt
+       after turns are dropped, so they never point at a removed call).
+    2. Whole turns (a HumanMessage and everything up to the next one) are dropped
+       oldest first until the history fits `max_tokens`; the current turn is always
+       kept, so tool calls stay paired with their ToolMessages. Leading system
+       messages are pinned.
+    3. With `summarize`, dropped turns are folded into a single summary
+       SystemMessage (id=HISTORY_SUMMARY_ID) together with the previous summary;
+       without it they are simply dropped.
+    """
+    restored = _restore_tool_outputs(messages)
+    # Deduplicated sizes decide how many turns fit; the kept turns are deduplicated again below.
+    sized = _dedupe_tool_outputs(restored, large_output_chars)
+
+    pinned: list[BaseMessage] = []
+    summary: SystemMessage | None = None
+    index = 0
+    while index < len(restored) and isinstance(restored[index], SystemMessage):
+        if restored[index].id == HISTORY_SUMMARY_ID:
+            summary = restored[index]
+        else:
+            pinned.append(restored[index])
+        index += 1
+
+    turn_starts: list[int] = []
+    for position in range(index, len(restored)):
+        if isinstance(restored[position], HumanMessage) or not turn_starts:
+            turn_starts.append(position)
+    turn_bounds = list(zip(turn_starts, turn_starts[1:] + [len(restored)]))
+
+    turn_tokens = [count_tokens_approximately(sized[begin:end]) for begin, end in turn_bounds]
+    fixed_tokens = count_tokens_approximately(pinned + ([summary] if summary else []))
+    total = fixed_tokens + sum(turn_tokens)
+    dropped_turns = 0
+    while total > max_tokens and dropped_turns < len(turn_bounds) - 1:
+        total -= turn_tokens[dropped_turns]
+        dropped_turns += 1
+
+    kept_from = turn_bounds[dropped_turns][0] if turn_bounds else index
+    dropped = restored[index:kept_from]
+    if dropped and summarize is not None:
+        summary = SystemMessage(
+            content=summarize(([summary] if summary else []) + dropped),
+            id=HISTORY_SUMMARY_ID,
+        )
+
+    compacted = pinned + ([summary] if summary else []) \
+        + _dedupe_tool_outputs(restored[kept_from:], large_output_chars)
+    if compacted == messages:
+        return None
+    return compacted
+
+
+def compaction_node(state: AgentState) -> dict[str, Any]:
+    """
+    Runs before every LLM call. When compaction applies, the whole message list is
+    replaced (RemoveMessage(REMOVE_ALL_MESSAGES)), so state and prompt size stay
+    roughly constant across turns; otherwise no update is written.
+    """
+    compacted = compact_history(
+        state["messages"], max_tokens=HISTORY_TOKEN_BUDGET, summarize=summarize_with_llm
+    )
+    if compacted is None:
+        return {}
+    return {"messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *compacted]}
+
+
 # ============================================================================
 # STEP 5: Build Graph
 # ============================================================================
 
 graph = StateGraph(AgentState)
 
+# Local per-node instrumentation: one node_complete/node_failed JSON event per
+# node call (wall/CPU ms, state size, LLM tokens) plus node_metrics.summary()
+node_metrics = NodeMetrics(
+    partial(build_topic_logger, "langgraph", "agent_nodes", async_mode=True), graph_name="agent_graph"
+)
+
 # Add nodes
-graph.add_node("agent", agent_node)
-graph.add_node("tools", ToolNode(TOOLS))
+graph.add_node("compact", node_metrics.wrap("compact", compaction_node))
+graph.add_node("agent", node_metrics.wrap("agent", agent_node))
+# Replaces ToolNode(TOOLS), which gives no control over scheduling or timeouts
+graph.add_node("tools", RunnableLambda(
+    node_metrics.wrap("tools", parallel_tools.invoke),
+    afunc=node_metrics.wrap("tools", parallel_tools.ainvoke),
+))
 
 # Define edges
-graph.add_edge(START, "agent")
-graph.add_edge("tools", "agent")  # After tool execution, return to agent
+graph.add_edge(START, "compact")
+graph.add_edge("compact", "agent")  # Every LLM call sees a budget-bounded history
+graph.add_edge("tools", "compact")  # After tool execution, compact then return to agent
 
 # Compile the graph
 agent_graph = graph.compile()
 
 
+def build_durable_agent_graph(path: str = "checkpoints/langgraph_agent.sqlite"):
+    """
+    Same graph, checkpointed to a local SQLite file after every super-step.
+    Invoke with {"configurable": {"thread_id": ...}}; after a crash, invoking
+    the thread again with input None resumes from the last completed step
+    without repeating finished LLM/tool calls.
+    """
+    return graph.compile(checkpointer=SqliteCheckpointSaver(path))
+
+
 # ============================================================================
 # STEP 6: Usage Examples
 # ============================================================================
@@ -151,6 +511,7 @@ if __name__ == "__main__":
         result = agent_graph.invoke({"messages": messages})
         # Extract assistant response
         assistant_msg = result["messages"][-1]
+        # Already compacted by compaction_node, so this does not grow without bound
         messages = result["messages"]
         
         print(f"Turn {turn + 1}: {assistant_msg.content[:100]}...")
@@ -164,25 +525,32 @@ if __name__ == "__main__":
 NOTES FOR EXTENSION:
 
 1. **Add Durable Execution (Thread ID)**
+   durable_graph = build_durable_agent_graph("checkpoints/agent.sqlite")
    config = {"configurable": {"thread_id": "user_123"}}
-   result = agent_graph.invoke(input_state, config=config)
-   # Next invoke with same thread_id resumes from saved state
+   result = durable_graph.invoke(input_state, config=config)
+   # Next invoke with same thread_id continues the saved conversation;
+   # durable_graph.invoke(None, config) resumes an interrupted run
 
 2. **Add Human-in-the-Loop Interrupts**
    compiled = graph.compile(interrupt_before=["tools"])
    # Execution pauses before calling tools; user can inspect/modify state
 
-3. **Enable LangSmith Tracing**
+3. **Find the Slow Node Offline**
+   for row in node_metrics.summary():
+       print(row.node, row.calls, row.wall_ms_p50, row.wall_ms_p95, row.output_tokens)
+   # Per-call events are in logs/langgraph_agent_nodes_<date>.log
+
+4. **Enable LangSmith Tracing**
    export LANGSMITH_TRACING=true
    export LANGSMITH_API_KEY=<your-api-key>
    # Traces appear automatically in LangSmith UI
 
-4. **Custom State & Nodes**
+5. **Custom State & Nodes**
    - Extend AgentState with domain-specific fields
    - Add conditional edges for complex routing
    - Use stream() to debug intermediate steps
 
-5. **Error Handling**
+6. **Error Handling**
    - Wrap node logic in try/except
    - Return error messages instead of raising exceptions
    - Use LangSmith to analyze failure patterns
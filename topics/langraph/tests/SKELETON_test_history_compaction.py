@@ -0,0 +1,110 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+import topics.langraph.templates.SKELETON_langgraph_agent as skeleton
+from topics.langraph.templates.SKELETON_langgraph_agent import (
+    HISTORY_SUMMARY_ID,
+    compact_history,
+)
+
+
+def _turn(index: int, words: int = 200) -> list:
+    return [
+        HumanMessage(content=f"question {index} " + "word " * words, id=f"h{index}"),
+        AIMessage(content="", tool_calls=[{"name": "example_tool", "args": {"query": "q"}, "id": f"c{index}"}], id=f"a{index}"),
+        ToolMessage(content=f"result {index}", tool_call_id=f"c{index}", id=f"t{index}"),
+        AIMessage(content=f"answer {index}", id=f"f{index}"),
+    ]
+
+
+def test_small_history_is_left_untouched() -> None:
+    assert compact_history([SystemMessage(content="sys"), *_turn(0)], max_tokens=10_000) is None
+
+
+def test_old_turns_are_dropped_whole_and_system_prompt_is_pinned() -> None:
+    messages = [SystemMessage(content="sys", id="sys"), *_turn(0), *_turn(1), *_turn(2)]
+
+    compacted = compact_history(messages, max_tokens=500)
+
+    assert [m.id for m in compacted] == ["sys", "h2", "a2", "t2", "f2"]
+
+
+def test_dropped_turns_are_folded_into_a_running_summary() -> None:
+    seen: list[list[str]] = []
+
+    def summarize(dropped):
+        seen.append([m.id for m in dropped])
+        return f"summary of {len(dropped)} messages"
+
+    first = compact_history([*_turn(0), *_turn(1)], max_tokens=500, summarize=summarize)
+    assert first[0].id == HISTORY_SUMMARY_ID and first[0].content == "summary of 4 messages"
+
+    second = compact_history([*first, *_turn(2)], max_tokens=500, summarize=summarize)
+    assert seen[1] == [HISTORY_SUMMARY_ID, "h1", "a1", "t1", "f1"]
+    assert [m.id for m in second] == [HISTORY_SUMMARY_ID, "h2", "a2", "t2", "f2"]
+
+
+def test_repeated_large_tool_outputs_are_stored_once() -> None:
+    big = "x" * 5_000
+    messages = [
+        HumanMessage(content="q"),
+        AIMessage(content="", tool_calls=[
+            {"name": "example_tool", "args": {"query": "a"}, "id": "c1"},
+            {"name": "example_tool", "args": {"query": "a"}, "id": "c2"},
+        ]),
+        ToolMessage(content=big, tool_call_id="c1"),
+        ToolMessage(content=big, tool_call_id="c2"),
+    ]
+
+    compacted = compact_history(messages, max_tokens=100_000)
+
+    assert compacted[2].content == big
+    assert compacted[3].content == "[identical to the output of tool call c1]"
+    assert compacted[3].tool_call_id == "c2"
+
+
+def test_duplicate_output_is_restored_when_the_referenced_turn_is_dropped() -> None:
+    big = "x" * 5_000
+    turn0, turn1 = _turn(0, words=400), _turn(1, words=10)
+    turn0[2] = ToolMessage(content=big, tool_call_id="c0", id="t0")
+    turn1[2] = ToolMessage(content=big, tool_call_id="c1", id="t1")
+
+    compacted = compact_history(turn0 + turn1, max_tokens=1000)
+
+    assert [m.id for m in compacted] == ["h1", "a1", "t1", "f1"]
+    assert compacted[2].content == big
+
+
+def test_references_from_an_earlier_compaction_are_rebuilt_after_dropping() -> None:
+    big = "x" * 5_000
+    turn0, turn1, turn2 = _turn(0, words=400), _turn(1, words=10), _turn(2, words=10)
+    turn0[2] = ToolMessage(content=big, tool_call_id="c0", id="t0")
+    turn1[2] = ToolMessage(content=big, tool_call_id="c1", id="t1")
+    turn2[2] = ToolMessage(content=big, tool_call_id="c2", id="t2")
+    first = compact_history(turn0 + turn1 + turn2, max_tokens=100_000)
+    assert first[6].content == first[10].content == "[identical to the output of tool call c0]"
+
+    second = compact_history(first, max_tokens=1500)
+
+    assert [m.id for m in second] == ["h1", "a1", "t1", "f1", "h2", "a2", "t2", "f2"]
+    assert second[2].content == big
+    assert second[6].content == "[identical to the output of tool call c1]"
+
+
+def test_graph_history_stays_bounded_across_turns(monkeypatch) -> None:
+    class FakeLLM:
+        def invoke(self, messages):
+            return AIMessage(content="reply " + "word " * 200)
+
+    monkeypatch.setattr(skeleton, "llm_with_tools", FakeLLM())
+    monkeypatch.setattr(skeleton, "summarize_with_llm", lambda dropped: "earlier turns")
+    monkeypatch.setattr(skeleton, "HISTORY_TOKEN_BUDGET", 600)
+
+    messages: list = []
+    sizes = []
+    for turn in range(20):
+        messages.append(HumanMessage(content=f"turn {turn} " + "word " * 200))
+        messages = skeleton.agent_graph.invoke({"messages": messages})["messages"]
+        sizes.append(len(messages))
+
+    assert max(sizes[5:]) <= 5
+    assert messages[0].id == HISTORY_SUMMARY_ID
@@ -0,0 +1,168 @@
+import asyncio
+import time
+from typing import Annotated
+
+import pytest
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import InjectedToolCallId, tool
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.config import get_config
+from langgraph.graph import END, START, StateGraph
+from langgraph.prebuilt import InjectedState
+from langgraph.types import Command, interrupt
+
+from topics.langraph.templates.SKELETON_langgraph_agent import AgentState, ParallelToolNode
+
+
+@tool
+def slow_sync(query: str) -> str:
+    """Sleep, then echo."""
+    time.sleep(0.2)
+    return f"sync:{query}"
+
+
+@tool
+async def slow_async(query: str) -> str:
+    """Sleep asynchronously, then echo."""
+    await asyncio.sleep(0.2)
+    return f"async:{query}"
+
+
+@tool
+def hangs(query: str) -> str:
+    """Outlives its timeout."""
+    time.sleep(0.5)
+    return query
+
+
+@tool
+def fails(query: str) -> str:
+    """Always raises."""
+    raise ValueError(f"bad {query}")
+
+
+@tool
+def reads_config(query: str) -> str:
+    """Report the thread id of the graph run."""
+    return f"{query}:{get_config()['configurable'].get('thread_id')}"
+
+
+@tool
+async def areads_config(query: str) -> str:
+    """Report the thread id of the graph run."""
+    return f"{query}:{get_config()['configurable'].get('thread_id')}"
+
+
+@tool
+def reads_state(query: str, state: Annotated[dict, InjectedState]) -> str:
+    """Report how many messages the graph state holds."""
+    return f"{query}:{len(state['messages'])}"
+
+
+@tool
+def asks_human(query: str) -> str:
+    """Ask a human to approve the query."""
+    return f"{query}:{interrupt({'approve': query})}"
+
+
+@tool
+def sets_topic(query: str, tool_call_id: Annotated[str, InjectedToolCallId]) -> Command:
+    """Update the graph state directly."""
+    return Command(update={"messages": [ToolMessage(content=f"topic:{query}", tool_call_id=tool_call_id)]})
+
+
+def _graph(node: ParallelToolNode, checkpointer=None):
+    builder = StateGraph(AgentState)
+    builder.add_node("tools", RunnableLambda(node.invoke, afunc=node.ainvoke))
+    builder.add_edge(START, "tools")
+    builder.add_edge("tools", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def _state(*names: str) -> dict:
+    calls = [{"name": name, "args": {"query": str(i)}, "id": f"call_{i}"} for i, name in enumerate(names)]
+    return {"messages": [AIMessage(content="", tool_calls=calls)]}
+
+
+def test_sync_invoke_runs_calls_concurrently_and_keeps_call_order() -> None:
+    node = ParallelToolNode([slow_sync, slow_async])
+
+    start = time.perf_counter()
+    messages = node.invoke(_state("slow_sync", "slow_async", "slow_sync", "slow_async"))["messages"]
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+    assert [m.tool_call_id for m in messages] == ["call_0", "call_1", "call_2", "call_3"]
+    assert [m.content for m in messages] == ["sync:0", "async:1", "sync:2", "async:3"]
+
+
+def test_async_invoke_mixes_thread_pool_and_event_loop_tools() -> None:
+    node = ParallelToolNode([slow_sync, slow_async])
+
+    start = time.perf_counter()
+    messages = asyncio.run(node.ainvoke(_state("slow_async", "slow_sync", "slow_async")))["messages"]
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+    assert [m.content for m in messages] == ["async:0", "sync:1", "async:2"]
+
+
+def test_timeouts_failures_and_unknown_tools_become_error_tool_messages() -> None:
+    node = ParallelToolNode([slow_sync, hangs, fails], timeouts={"hangs": 0.05}, handle_tool_errors=True)
+
+    for result in (node.invoke(_state("hangs", "fails", "missing", "slow_sync")),
+                   asyncio.run(node.ainvoke(_state("hangs", "fails", "missing", "slow_sync")))):
+        messages = result["messages"]
+        assert all(isinstance(m, ToolMessage) for m in messages)
+        assert [m.status for m in messages] == ["error", "error", "error", "success"]
+        assert "timed out" in messages[0].content
+        assert "bad 1" in messages[1].content
+        assert "unknown tool" in messages[2].content
+        assert messages[3].content == "sync:3"
+
+
+def test_tool_errors_are_raised_by_default_like_tool_node() -> None:
+    node = ParallelToolNode([slow_sync, fails])
+
+    with pytest.raises(ValueError, match="bad 1"):
+        node.invoke(_state("slow_sync", "fails"))
+    with pytest.raises(ValueError, match="bad 1"):
+        asyncio.run(node.ainvoke(_state("slow_sync", "fails")))
+
+    bad_args = {"messages": [AIMessage(content="", tool_calls=[{"name": "slow_sync", "args": {}, "id": "call_0"}])]}
+    assert node.invoke(bad_args)["messages"][0].status == "error"
+
+    only_value_errors = ParallelToolNode([fails], handle_tool_errors=(ValueError,))
+    assert only_value_errors.invoke(_state("fails"))["messages"][0].content == "Error: ValueError('bad 0')"
+
+
+def test_interrupt_pauses_the_graph_and_resumes_under_a_checkpointer() -> None:
+    graph = _graph(ParallelToolNode([asks_human, slow_sync], handle_tool_errors=True), InMemorySaver())
+
+    for run, thread_id in ((lambda *a: graph.invoke(*a), "sync"), (lambda *a: asyncio.run(graph.ainvoke(*a)), "async")):
+        config = {"configurable": {"thread_id": thread_id}}
+        paused = run(_state("asks_human", "slow_sync"), config)
+        assert paused["__interrupt__"][0].value == {"approve": "0"}
+        assert graph.get_state(config).next == ("tools",)
+
+        resumed = run(Command(resume="yes"), config)
+        assert [m.content for m in resumed["messages"][1:]] == ["0:yes", "sync:1"]
+
+
+def test_command_results_are_applied_as_graph_updates() -> None:
+    graph = _graph(ParallelToolNode([sets_topic, slow_sync]))
+
+    for result in (graph.invoke(_state("sets_topic", "slow_sync")),
+                   asyncio.run(graph.ainvoke(_state("sets_topic", "slow_sync")))):
+        assert sorted(m.content for m in result["messages"][1:]) == ["sync:1", "topic:0"]
+
+
+def test_tools_see_graph_config_and_injected_state() -> None:
+    node = ParallelToolNode([reads_config, areads_config, reads_state])
+    graph = _graph(node)
+    config = {"configurable": {"thread_id": "T42"}}
+    state = _state("reads_config", "areads_config", "reads_state")
+
+    for result in (graph.invoke(state, config), asyncio.run(graph.ainvoke(state, config))):
+        assert [m.content for m in result["messages"][1:]] == ["0:T42", "1:T42", "2:1"]
@@ -0,0 +1,149 @@
+import asyncio
+import operator
+import sqlite3
+import time
+from typing import Annotated, TypedDict
+
+import pytest
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, RemoveMessage
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+from topics.langraph.templates import PATTERN_sqlite_checkpointer
+from topics.langraph.templates.PATTERN_sqlite_checkpointer import SqliteCheckpointSaver
+
+
+class StepState(TypedDict):
+    log: Annotated[list[str], operator.add]
+    note: str
+
+
+class ChatState(TypedDict):
+    messages: Annotated[list[AnyMessage], add_messages]
+
+
+def _wait_for_pending_write(path: str, timeout_s: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        with sqlite3.connect(path) as conn:
+            if conn.execute("SELECT COUNT(*) FROM writes WHERE channel = 'log'").fetchone()[0]:
+                return
+        time.sleep(0.005)
+
+
+def _build_graph(saver: SqliteCheckpointSaver, calls: list[str], fail_once: set[str], path: str | None = None):
+    def node(name: str):
+        def run(state: StepState) -> dict:
+            calls.append(name)
+            if name in fail_once:
+                fail_once.discard(name)
+                if path is not None:
+                    # Crash only after the sibling's result is saved; a crash that comes earlier
+                    # cancels the sibling, which then legitimately runs again on resume.
+                    _wait_for_pending_write(path)
+                raise RuntimeError(f"{name} crashed")
+            return {"log": [name]}
+        return run
+
+    graph = StateGraph(StepState)
+    for name in ("expensive_llm", "expensive_tool", "finish"):
+        graph.add_node(name, node(name))
+    # expensive_llm and expensive_tool run in the same super-step.
+    graph.add_edge(START, "expensive_llm")
+    graph.add_edge(START, "expensive_tool")
+    graph.add_edge(["expensive_llm", "expensive_tool"], "finish")
+    graph.add_edge("finish", END)
+    return graph.compile(checkpointer=saver)
+
+
+def test_interrupted_thread_resumes_after_restart_without_redoing_finished_steps(tmp_path) -> None:
+    path = str(tmp_path / "checkpoints.sqlite")
+    config = {"configurable": {"thread_id": "t1"}}
+    calls: list[str] = []
+
+    first = SqliteCheckpointSaver(path)
+    with pytest.raises(RuntimeError):
+        _build_graph(first, calls, fail_once={"expensive_tool"}, path=path).invoke({"log": [], "note": "n"}, config)
+    first.close()
+
+    restarted = SqliteCheckpointSaver(path)
+    result = _build_graph(restarted, calls, fail_once=set()).invoke(None, config)
+
+    assert sorted(result["log"]) == ["expensive_llm", "expensive_tool", "finish"]
+    assert calls.count("expensive_llm") == 1
+    assert calls.count("expensive_tool") == 2
+    assert calls.count("finish") == 1
+
+
+def test_checkpoints_store_only_changed_channels(tmp_path) -> None:
+    path = str(tmp_path / "checkpoints.sqlite")
+    saver = SqliteCheckpointSaver(path)
+    _build_graph(saver, [], fail_once=set()).invoke({"log": [], "note": "n"}, {"configurable": {"thread_id": "t1"}})
+
+    with sqlite3.connect(path) as conn:
+        (note_blobs,) = conn.execute("SELECT COUNT(*) FROM blobs WHERE channel = 'note'").fetchone()
+        (checkpoints,) = conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()
+
+    assert checkpoints >= 3
+    assert note_blobs == 1
+    assert [t.checkpoint["channel_values"]["note"] for t in saver.list({"configurable": {"thread_id": "t1"}}, limit=2)] == ["n", "n"]
+
+
+def test_async_graph_uses_same_store(tmp_path) -> None:
+    saver = SqliteCheckpointSaver(str(tmp_path / "checkpoints.sqlite"))
+    graph = _build_graph(saver, [], fail_once=set())
+    config = {"configurable": {"thread_id": "a1"}}
+
+    result = asyncio.run(graph.ainvoke({"log": [], "note": "n"}, config))
+
+    assert sorted(result["log"]) == ["expensive_llm", "expensive_tool", "finish"]
+    assert saver.get_tuple(config).checkpoint["channel_values"]["log"] == result["log"]
+    saver.delete_thread("a1")
+    assert saver.get_tuple(config) is None
+
+
+def _chat_graph(saver: SqliteCheckpointSaver, turns: int):
+    def reply(state: ChatState) -> dict:
+        return {"messages": [AIMessage(content=f"reply {len(state['messages'])} " + "word " * 50)]}
+
+    def route(state: ChatState) -> str:
+        return "reply" if len(state["messages"]) < turns else END
+
+    graph = StateGraph(ChatState)
+    graph.add_node("reply", reply)
+    graph.add_edge(START, "reply")
+    graph.add_conditional_edges("reply", route)
+    return graph.compile(checkpointer=saver)
+
+
+def test_growing_message_lists_are_stored_as_appended_suffixes(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(PATTERN_sqlite_checkpointer, "MAX_DELTA_CHAIN", 10)
+    path = str(tmp_path / "checkpoints.sqlite")
+    config = {"configurable": {"thread_id": "chat"}}
+    saver = SqliteCheckpointSaver(path)
+    graph = _chat_graph(saver, turns=30)
+    result = graph.invoke({"messages": [HumanMessage(content="hi")]}, config)
+
+    with sqlite3.connect(path) as conn:
+        full, deltas = conn.execute(
+            "SELECT SUM(base_version IS NULL), SUM(base_version IS NOT NULL) FROM blobs WHERE channel = 'messages'"
+        ).fetchone()
+    assert deltas >= 25
+    assert full <= 4
+
+    history = [len(t.checkpoint["channel_values"].get("messages", [])) for t in saver.list(config)]
+    assert history == sorted(history, reverse=True) and history[0] == 30
+
+    # An edited list (here: the first message removed) is stored whole again.
+    graph.update_state(config, {"messages": [RemoveMessage(id=result["messages"][0].id)]})
+    with sqlite3.connect(path) as conn:
+        (latest_base,) = conn.execute(
+            "SELECT base_version FROM blobs WHERE channel = 'messages' ORDER BY version DESC LIMIT 1"
+        ).fetchone()
+    assert latest_base is None
+    saver.close()
+
+    restarted = SqliteCheckpointSaver(path)
+    assert restarted.get_tuple(config).checkpoint["channel_values"]["messages"] == result["messages"][1:]
+    previous = list(restarted.list(config, limit=2))[1]
+    assert previous.checkpoint["channel_values"]["messages"] == result["messages"]
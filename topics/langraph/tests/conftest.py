@@ -0,0 +1,4 @@
+import os
+
+# The agent skeleton builds ChatOpenAI at import time; no request is sent in these tests.
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
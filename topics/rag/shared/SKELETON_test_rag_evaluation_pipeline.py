@@ -1,9 +1,24 @@
+import asyncio
+import time
+
+import pytest
 from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
 
+import topics.rag.shared.rag_evaluation_pipeline as pipeline
+from topics.rag.shared.rag_evaluation_cache import SampleMetricCache
 from topics.rag.shared.rag_evaluation_pipeline import (
     EvaluationSample,
+    JudgeConcurrencyConfig,
+    MetricEngineConfig,
+    arun_rag_evaluation,
+    build_metric_evaluator,
+    iter_jsonl_samples,
+    run_metric_evaluation,
     run_rag_evaluation,
+    run_rag_evaluation_stream,
 )
+from topics.rag.shared.rag_evaluation_runs import diff_runs
+from topics.rag.shared.rag_lexical_metrics import lexical_evaluator, lexical_sample_scores
 
 
 def test_run_rag_evaluation_stubbed() -> None:
@@ -30,3 +45,219 @@ def test_run_rag_evaluation_stubbed() -> None:
 
     assert result.context_precision == 0.9
     assert result.threshold_failures == []
+
+
+def stub_context_precision(sample: EvaluationSample) -> float:
+    return 1.0 if sample.answer.startswith("good") else 0.0
+
+
+def stub_constant(_: EvaluationSample) -> float:
+    return 0.9
+
+
+STUB_METRICS = {
+    "context_precision": stub_context_precision,
+    "context_recall": stub_constant,
+    "faithfulness": stub_constant,
+    "answer_relevancy": stub_constant,
+}
+
+
+def test_run_metric_evaluation_batches_across_pools() -> None:
+    samples = [
+        EvaluationSample(
+            question=f"q{i}",
+            ground_truth="gt",
+            answer="good" if i % 4 else "bad",
+            contexts=["c"],
+        )
+        for i in range(10)
+    ]
+
+    for executor in ("thread", "process"):
+        config = MetricEngineConfig(batch_size=3, max_workers=2, executor=executor)
+        result = run_metric_evaluation(samples=samples, metrics=STUB_METRICS, config=config)
+
+        assert result.context_precision == pytest.approx(0.7)
+        assert result.faithfulness == pytest.approx(0.9)
+        assert result.threshold_failures == ["context_precision"]
+
+
+def test_run_rag_evaluation_stream_from_jsonl(tmp_path) -> None:
+    dataset = tmp_path / "samples.jsonl"
+    dataset.write_text(
+        "\n".join(
+            EvaluationSample(
+                question=f"q{i}",
+                ground_truth="gt",
+                answer="good" if i % 4 else "bad",
+                contexts=["c"],
+            ).model_dump_json()
+            for i in range(10)
+        ),
+        encoding="utf-8",
+    )
+    evaluator = build_metric_evaluator(STUB_METRICS)
+
+    streamed = run_rag_evaluation_stream(iter_jsonl_samples(dataset), evaluator, chunk_size=4)
+    in_memory = run_rag_evaluation(list(iter_jsonl_samples(dataset)), evaluator)
+
+    assert streamed.context_precision == pytest.approx(in_memory.context_precision)
+    assert streamed.answer_relevancy == pytest.approx(in_memory.answer_relevancy)
+    assert streamed.threshold_failures == in_memory.threshold_failures
+
+
+def test_metric_evaluator_reuses_one_pool_across_stream_chunks(monkeypatch) -> None:
+    built = []
+    build_executor = pipeline._build_executor
+    monkeypatch.setattr(pipeline, "_build_executor", lambda config: built.append(config) or build_executor(config))
+    samples = [
+        EvaluationSample(question=f"q{i}", ground_truth="gt", answer="good" if i % 4 else "bad", contexts=["c"])
+        for i in range(10)
+    ]
+
+    with build_metric_evaluator(STUB_METRICS, MetricEngineConfig(max_workers=2)) as evaluator:
+        result = run_rag_evaluation_stream(iter(samples), evaluator, chunk_size=3)
+
+    assert len(built) == 1
+    assert evaluator._pool is None
+    assert result.context_precision == pytest.approx(0.7)
+
+
+def test_small_chunks_are_split_across_all_workers() -> None:
+    assert pipeline._batch_size(1000, MetricEngineConfig(max_workers=16)) == 63
+    assert pipeline._batch_size(10_000, MetricEngineConfig(max_workers=4)) == 256
+    assert pipeline._batch_size(1, MetricEngineConfig(max_workers=8)) == 1
+
+
+def test_run_rag_evaluation_stream_rejects_empty_input() -> None:
+    with pytest.raises(ValueError):
+        run_rag_evaluation_stream(iter([]), build_metric_evaluator(STUB_METRICS))
+
+
+def test_metric_cache_rescores_only_changed_samples(tmp_path) -> None:
+    scored_answers: list[str] = []
+
+    def counting_precision(sample: EvaluationSample) -> float:
+        scored_answers.append(sample.answer)
+        return stub_context_precision(sample)
+
+    metrics = {**STUB_METRICS, "context_precision": counting_precision}
+    samples = [
+        EvaluationSample(question=f"q{i}", ground_truth="gt", answer=f"good{i}", contexts=["c"])
+        for i in range(6)
+    ]
+    cache = SampleMetricCache(path=str(tmp_path / "metrics.sqlite"))
+    config = MetricEngineConfig(batch_size=4)
+
+    first = run_metric_evaluation(samples, metrics, config=config, cache=cache)
+    samples[2] = samples[2].model_copy(update={"answer": "bad"})
+    samples[4] = samples[4].model_copy(update={"sample_id": "regenerated-id"})
+    second = run_metric_evaluation(samples, metrics, config=config, cache=cache)
+
+    assert len(scored_answers) == 7
+    assert scored_answers[-1] == "bad"
+    assert first.context_precision == 1.0
+    assert second.context_precision == pytest.approx(5 / 6)
+
+
+def test_metric_cache_evicts_least_recently_used(tmp_path) -> None:
+    cache = SampleMetricCache(path=str(tmp_path / "metrics.sqlite"), max_entries=2)
+    cache.put_many({"a": {"faithfulness": 1.0}})
+    cache.put_many({"b": {"faithfulness": 0.5}})
+    cache.get_many(["a"])
+    cache.put_many({"c": {"faithfulness": 0.0}})
+
+    assert len(cache) == 2
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+
+def test_diff_runs_lists_largest_drops(tmp_path) -> None:
+    samples = [
+        EvaluationSample(sample_id=f"s{i}", question=f"q{i}", ground_truth="gt", answer="good", contexts=["c"])
+        for i in range(5)
+    ]
+    runs_dir = str(tmp_path / "runs")
+
+    base = run_metric_evaluation(samples, STUB_METRICS, runs_dir=runs_dir)
+    samples[1] = samples[1].model_copy(update={"answer": "bad"})
+    samples[3] = samples[3].model_copy(update={"answer": "bad"})
+    head = run_metric_evaluation(samples, STUB_METRICS, runs_dir=runs_dir)
+
+    regressions = diff_runs(runs_dir, base.run_id, head.run_id, metric="context_precision", top_k=5)
+
+    assert head.sample_scores_path is not None
+    assert [r.sample_id for r in regressions] == ["s1", "s3"]
+    assert regressions[0].delta == -1.0
+    assert diff_runs(runs_dir, base.run_id, head.run_id, metric="faithfulness") == []
+
+
+JUDGE_LATENCY_S = 0.02
+
+
+async def fake_judge(sample: EvaluationSample) -> float:
+    await asyncio.sleep(JUDGE_LATENCY_S)
+    return stub_context_precision(sample)
+
+
+FAKE_JUDGE_METRICS = {name: fake_judge for name in STUB_METRICS}
+
+
+def test_arun_rag_evaluation_overlaps_judge_latency() -> None:
+    samples = [
+        EvaluationSample(question=f"q{i}", ground_truth="gt", answer="good" if i % 4 else "bad", contexts=["c"])
+        for i in range(20)
+    ]
+    config = JudgeConcurrencyConfig(max_concurrency=16)
+
+    start = time.perf_counter()
+    result = asyncio.run(arun_rag_evaluation(samples, FAKE_JUDGE_METRICS, config=config))
+    elapsed = time.perf_counter() - start
+
+    sequential_s = len(samples) * len(FAKE_JUDGE_METRICS) * JUDGE_LATENCY_S
+    assert elapsed < sequential_s / 4
+    assert result.faithfulness == pytest.approx(0.75)
+
+
+def test_arun_rag_evaluation_retries_then_fails_on_timeout() -> None:
+    calls: list[str] = []
+
+    async def flaky_judge(sample: EvaluationSample) -> float:
+        calls.append(sample.question)
+        if len(calls) == 1:
+            raise RuntimeError("transient judge error")
+        return 1.0
+
+    async def hanging_judge(_: EvaluationSample) -> float:
+        await asyncio.sleep(1)
+        return 1.0
+
+    sample = EvaluationSample(question="q", ground_truth="gt", answer="good", contexts=["c"])
+    config = JudgeConcurrencyConfig(max_concurrency=1, timeout_s=0.01, max_retries=1, backoff_s=0)
+
+    result = asyncio.run(arun_rag_evaluation([sample], {name: flaky_judge for name in STUB_METRICS}, config=config))
+    assert result.context_recall == 1.0
+    assert len(calls) == 5
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(arun_rag_evaluation([sample], {**FAKE_JUDGE_METRICS, "faithfulness": hanging_judge}, config=config))
+
+
+def test_lexical_metrics_are_deterministic_token_overlaps() -> None:
+    samples = [
+        EvaluationSample(
+            question="What is the capital of France?",
+            ground_truth="Paris is the capital of France",
+            answer="The capital is Paris",
+            contexts=["France's capital city is Paris.", "Berlin is in Germany"],
+        ),
+        EvaluationSample(question="empty", ground_truth="", answer="", contexts=[]),
+    ]
+
+    scores = lexical_sample_scores(samples)
+    result = run_rag_evaluation(samples, lexical_evaluator)
+
+    assert scores[0].tolist() == pytest.approx([4 / 9, 4 / 6, 3 / 4, 2 * 4 / (4 + 6)])
+    assert scores[1].tolist() == [0.0, 0.0, 0.0, 0.0]
+    assert result.faithfulness == pytest.approx(3 / 8)
+    assert "faithfulness" in result.threshold_failures
@@ -0,0 +1,83 @@
+"""Content-addressed on-disk cache of per-sample RAG metric scores with LRU eviction."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from pydantic import BaseModel
+
+
+_SQLITE_MAX_PARAMS = 500
+
+
+def sample_cache_key(sample: BaseModel, evaluator_id: str) -> str:
+    """Hash the sample content together with the identity of the evaluator that scores it.
+
+    `sample_id` only labels the sample for run diffs, so it is left out of the key.
+    """
+    digest = hashlib.sha256()
+    digest.update(evaluator_id.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(sample.model_dump_json(exclude={"sample_id"}).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SampleMetricCache:
+    """SQLite-backed map of sample key to metric scores, bounded to `max_entries` by least-recent use."""
+
+    def __init__(self, path: str = "cache/rag_evaluation_metrics.sqlite", max_entries: int = 100_000) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS metric_cache ("
+            "key TEXT PRIMARY KEY, metrics TEXT NOT NULL, last_access INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS metric_cache_lru ON metric_cache (last_access)")
+        self._conn.commit()
+
+    def get_many(self, keys: list[str]) -> dict[str, dict[str, float]]:
+        found: dict[str, dict[str, float]] = {}
+        now = time.time_ns()
+        for start in range(0, len(keys), _SQLITE_MAX_PARAMS):
+            chunk = keys[start:start + _SQLITE_MAX_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT key, metrics FROM metric_cache WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+            found.update((key, json.loads(metrics)) for key, metrics in rows)
+            self._conn.execute(
+                f"UPDATE metric_cache SET last_access = ? WHERE key IN ({placeholders})", [now, *chunk]
+            )
+        self._conn.commit()
+        return found
+
+    def put_many(self, entries: dict[str, dict[str, float]]) -> None:
+        if not entries:
+            return
+        now = time.time_ns()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO metric_cache (key, metrics, last_access) VALUES (?, ?, ?)",
+            [(key, json.dumps(metrics), now) for key, metrics in entries.items()],
+        )
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM metric_cache").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM metric_cache WHERE key IN "
+                "(SELECT key FROM metric_cache ORDER BY last_access ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM metric_cache").fetchone()
+        return count
+
+    def close(self) -> None:
+        self._conn.close()
@@ -2,22 +2,33 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
+import os
+import threading
 import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, UTC
-from logging.handlers import RotatingFileHandler
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import Callable
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Literal
 
+import numpy as np
 from pydantic import BaseModel, Field
 
+from topics.agent.shared.logging_adapter import build_file_logger, log_event
+
+from .rag_evaluation_cache import SampleMetricCache, sample_cache_key
+from .rag_evaluation_runs import METRIC_NAMES, write_run_scores
+
 
 class EvaluationSample(BaseModel):
     question: str
     ground_truth: str
     answer: str
     contexts: list[str]
+    sample_id: str | None = Field(default=None, description="Stable id used to diff runs; defaults to position")
 
 
 class EvaluationResult(BaseModel):
@@ -28,6 +39,7 @@ class EvaluationResult(BaseModel):
     faithfulness: float
     answer_relevancy: float
     threshold_failures: list[str] = Field(default_factory=list)
+    sample_scores_path: str | None = None
 
 
 class EvaluationThresholds(BaseModel):
@@ -37,47 +49,51 @@ class EvaluationThresholds(BaseModel):
     answer_relevancy: float = 0.75
 
 
+class MetricEngineConfig(BaseModel):
+    batch_size: int = Field(default=256, ge=1)
+    max_workers: int | None = Field(default=None, ge=1)
+    executor: Literal["thread", "process"] = "thread"
+    evaluator_version: str = Field(default="1", description="Bump to invalidate cached scores")
+
+
+class JudgeConcurrencyConfig(BaseModel):
+    max_concurrency: int = Field(default=8, ge=1)
+    timeout_s: float | None = Field(default=30.0, gt=0)
+    max_retries: int = Field(default=2, ge=0)
+    backoff_s: float = Field(default=0.5, ge=0)
+
+
+SampleMetric = Callable[[EvaluationSample], float]
+AsyncSampleMetric = Callable[[EvaluationSample], Awaitable[float]]
+Evaluator = Callable[[list[EvaluationSample]], dict[str, float]]
+
+
 def build_eval_logger(
     log_file: str = "logs/rag_evaluation.log",
     max_bytes: int = 10 * 1024 * 1024,
     backup_count: int = 5,
+    *,
+    async_mode: bool = False,
 ) -> logging.Logger:
-    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
-    logger = logging.getLogger("rag_evaluation")
-    logger.setLevel(logging.DEBUG)
-    logger.handlers.clear()
+    return build_file_logger("rag_evaluation", log_file, max_bytes, backup_count, async_mode=async_mode)
 
-    handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
-    handler.setLevel(logging.DEBUG)
-    handler.setFormatter(logging.Formatter("%(message)s"))
-    logger.addHandler(handler)
-    return logger
 
+def _log_event(logger: logging.Logger, run_id: str, operation: str, status: str, **fields: Any) -> None:
+    log_event(logger, run_id=run_id, operation=operation, status=status, **fields)
 
-def run_rag_evaluation(
-    samples: list[EvaluationSample],
-    evaluator: Callable[[list[EvaluationSample]], dict[str, float]],
-    thresholds: EvaluationThresholds | None = None,
-) -> EvaluationResult:
-    thresholds = thresholds or EvaluationThresholds()
-    logger = build_eval_logger()
-    run_id = str(uuid.uuid4())
 
-    logger.debug(json.dumps({
-        "timestamp": datetime.now(UTC).isoformat(),
-        "run_id": run_id,
-        "operation": "evaluation_start",
-        "status": "pending",
-        "sample_count": len(samples),
-    }))
-
-    metrics = evaluator(samples)
+def _build_result(
+    run_id: str,
+    metrics: dict[str, float],
+    thresholds: EvaluationThresholds,
+    sample_scores_path: str | None = None,
+) -> EvaluationResult:
     failures: list[str] = []
     for metric_name, threshold in thresholds.model_dump().items():
         if metrics[metric_name] < threshold:
             failures.append(metric_name)
 
-    result = EvaluationResult(
+    return EvaluationResult(
         run_id=run_id,
         timestamp=datetime.now(UTC).isoformat(),
         context_precision=metrics["context_precision"],
@@ -85,14 +101,341 @@ def run_rag_evaluation(
         faithfulness=metrics["faithfulness"],
         answer_relevancy=metrics["answer_relevancy"],
         threshold_failures=failures,
+        sample_scores_path=sample_scores_path,
+    )
+
+
+def run_rag_evaluation(
+    samples: list[EvaluationSample],
+    evaluator: Evaluator,
+    thresholds: EvaluationThresholds | None = None,
+) -> EvaluationResult:
+    thresholds = thresholds or EvaluationThresholds()
+    logger = build_eval_logger()
+    run_id = str(uuid.uuid4())
+
+    _log_event(logger, run_id, "evaluation_start", "pending", sample_count=len(samples))
+
+    metrics = evaluator(samples)
+    result = _build_result(run_id, metrics, thresholds)
+
+    _log_event(logger, run_id, "evaluation_complete", "success", output=result)
+
+    return result
+
+
+def _score_batch(metrics: dict[str, SampleMetric], batch: list[EvaluationSample]) -> list[dict[str, float]]:
+    return [{name: float(metric(sample)) for name, metric in metrics.items()} for sample in batch]
+
+
+def _batch_size(sample_count: int, config: MetricEngineConfig) -> int:
+    """Configured batch size, capped so that every worker gets a batch even for small inputs."""
+    workers = config.max_workers or os.cpu_count() or 1
+    return max(1, min(config.batch_size, -(-sample_count // workers)))
+
+
+def _build_executor(config: MetricEngineConfig) -> Executor:
+    if config.executor == "process":
+        return ProcessPoolExecutor(max_workers=config.max_workers)
+    return ThreadPoolExecutor(max_workers=config.max_workers)
+
+
+def metrics_identity(metrics: dict[str, SampleMetric], version: str = "1") -> str:
+    """Stable identity of a metric set, used to namespace cached scores."""
+    names = ",".join(
+        f"{name}={getattr(metric, '__module__', '')}.{getattr(metric, '__qualname__', repr(metric))}"
+        for name, metric in sorted(metrics.items())
+    )
+    return f"{names}@{version}"
+
+
+def iter_scored_batches(
+    samples: list[EvaluationSample],
+    metrics: dict[str, SampleMetric],
+    config: MetricEngineConfig | None = None,
+    cache: SampleMetricCache | None = None,
+    pool: Executor | None = None,
+) -> Iterator[list[dict[str, float]]]:
+    """Score samples batch by batch on a worker pool, yielding per-sample rows in input order.
+
+    With the process executor, metric functions must be picklable (module-level functions).
+    When a cache is given, only samples without stored scores are sent to the pool.
+    A caller-owned `pool` is used as is and left running; otherwise one is built from `config`
+    for this call.
+    """
+    config = config or MetricEngineConfig()
+    missing = [name for name in METRIC_NAMES if name not in metrics]
+    if missing:
+        raise ValueError(f"missing metric functions: {missing}")
+    if pool is None:
+        with _build_executor(config) as owned_pool:
+            yield from iter_scored_batches(samples, metrics, config, cache, owned_pool)
+        return
+
+    batch_size = _batch_size(len(samples), config)
+    batches = [samples[i:i + batch_size] for i in range(0, len(samples), batch_size)]
+    score_batch = partial(_score_batch, metrics)
+    if cache is None:
+        yield from pool.map(score_batch, batches)
+        return
+
+    evaluator_id = metrics_identity(metrics, config.evaluator_version)
+    batch_keys = [[sample_cache_key(sample, evaluator_id) for sample in batch] for batch in batches]
+    batch_hits = [cache.get_many(keys) for keys in batch_keys]
+    batch_misses = [
+        [sample for sample, key in zip(batch, keys) if key not in hits]
+        for batch, keys, hits in zip(batches, batch_keys, batch_hits)
+    ]
+    for keys, hits, fresh_rows in zip(batch_keys, batch_hits, pool.map(score_batch, batch_misses)):
+        fresh = iter(fresh_rows)
+        rows = [hits[key] if key in hits else next(fresh) for key in keys]
+        cache.put_many({key: row for key, row in zip(keys, rows) if key not in hits})
+        yield rows
+
+
+def run_metric_evaluation(
+    samples: list[EvaluationSample],
+    metrics: dict[str, SampleMetric],
+    thresholds: EvaluationThresholds | None = None,
+    config: MetricEngineConfig | None = None,
+    cache: SampleMetricCache | None = None,
+    runs_dir: str | None = None,
+) -> EvaluationResult:
+    """Evaluate with per-sample metric functions fanned out over a thread or process pool.
+
+    Per-sample scores are averaged into the same `EvaluationResult` that `run_rag_evaluation` returns.
+    With `runs_dir`, the per-sample score matrix is also written under `<runs_dir>/<run_id>/`
+    for `rag_evaluation_runs.diff_runs`.
+    """
+    if not samples:
+        raise ValueError("no samples to evaluate")
+
+    thresholds = thresholds or EvaluationThresholds()
+    config = config or MetricEngineConfig()
+    logger = build_eval_logger()
+    run_id = str(uuid.uuid4())
+
+    _log_event(
+        logger,
+        run_id,
+        "evaluation_start",
+        "pending",
+        sample_count=len(samples),
+        batch_size=config.batch_size,
+        executor=config.executor,
+    )
+
+    totals = dict.fromkeys(METRIC_NAMES, 0.0)
+    sample_scores = np.empty((len(samples), len(METRIC_NAMES)), dtype=np.float32) if runs_dir else None
+    scored = 0
+    for batch_index, rows in enumerate(iter_scored_batches(samples, metrics, config, cache), start=1):
+        for row in rows:
+            for name in METRIC_NAMES:
+                totals[name] += row[name]
+        if sample_scores is not None:
+            sample_scores[scored:scored + len(rows)] = [[row[name] for name in METRIC_NAMES] for row in rows]
+        scored += len(rows)
+        _log_event(logger, run_id, "batch_complete", "success", batch_index=batch_index, scored=scored)
+
+    sample_scores_path = None
+    if sample_scores is not None:
+        sample_ids = [sample.sample_id or str(index) for index, sample in enumerate(samples)]
+        sample_scores_path = str(write_run_scores(runs_dir, run_id, sample_ids, sample_scores))
+
+    result = _build_result(
+        run_id,
+        {name: total / scored for name, total in totals.items()},
+        thresholds,
+        sample_scores_path,
     )
 
-    logger.debug(json.dumps({
-        "timestamp": datetime.now(UTC).isoformat(),
-        "run_id": run_id,
-        "operation": "evaluation_complete",
-        "status": "success",
-        "output": result.model_dump(),
-    }))
+    _log_event(logger, run_id, "evaluation_complete", "success", output=result)
+
+    return result
+
+
+class MetricEvaluator:
+    """Batch `evaluator` over per-sample metric functions that keeps one worker pool across calls.
+
+    The pool starts on the first call and is reused by every later one, so
+    `run_rag_evaluation_stream` starts it once per run rather than once per chunk.
+    Call `close()` or use the evaluator as a context manager to shut it down.
+    """
+
+    def __init__(
+        self,
+        metrics: dict[str, SampleMetric],
+        config: MetricEngineConfig | None = None,
+        cache: SampleMetricCache | None = None,
+    ) -> None:
+        self.metrics = metrics
+        self.config = config or MetricEngineConfig()
+        self.cache = cache
+        self._pool: Executor | None = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = _build_executor(self.config)
+            return self._pool
+
+    def __call__(self, samples: list[EvaluationSample]) -> dict[str, float]:
+        totals = dict.fromkeys(METRIC_NAMES, 0.0)
+        for rows in iter_scored_batches(samples, self.metrics, self.config, self.cache, self._get_pool()):
+            for row in rows:
+                for name in METRIC_NAMES:
+                    totals[name] += row[name]
+        return {name: total / len(samples) for name, total in totals.items()}
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def __enter__(self) -> MetricEvaluator:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def build_metric_evaluator(
+    metrics: dict[str, SampleMetric],
+    config: MetricEngineConfig | None = None,
+    cache: SampleMetricCache | None = None,
+) -> MetricEvaluator:
+    """Adapt per-sample metric functions to the batch `evaluator` contract of `run_rag_evaluation`."""
+    return MetricEvaluator(metrics, config, cache)
+
+
+def iter_jsonl_samples(path: str | Path) -> Iterator[EvaluationSample]:
+    """Lazily yield one validated `EvaluationSample` per non-empty JSONL line."""
+    with Path(path).open(encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield EvaluationSample.model_validate_json(line)
+
+
+def run_rag_evaluation_stream(
+    samples: Iterable[EvaluationSample],
+    evaluator: Evaluator,
+    thresholds: EvaluationThresholds | None = None,
+    chunk_size: int = 1000,
+) -> EvaluationResult:
+    """Evaluate an iterable chunk by chunk, keeping only running metric totals in memory.
+
+    Each chunk's mean metrics are weighted by chunk length, so the result matches a
+    single `run_rag_evaluation` call over the same samples for mean-based evaluators.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+
+    thresholds = thresholds or EvaluationThresholds()
+    logger = build_eval_logger()
+    run_id = str(uuid.uuid4())
+
+    _log_event(logger, run_id, "evaluation_start", "pending", chunk_size=chunk_size)
+
+    iterator = iter(samples)
+    totals = dict.fromkeys(METRIC_NAMES, 0.0)
+    sample_count = 0
+    chunk_index = 0
+    while chunk := list(islice(iterator, chunk_size)):
+        chunk_metrics = evaluator(chunk)
+        for name in METRIC_NAMES:
+            totals[name] += chunk_metrics[name] * len(chunk)
+        sample_count += len(chunk)
+        chunk_index += 1
+        _log_event(logger, run_id, "chunk_complete", "success", chunk_index=chunk_index, scored=sample_count)
+
+    if not sample_count:
+        raise ValueError("no samples to evaluate")
+
+    result = _build_result(run_id, {name: total / sample_count for name, total in totals.items()}, thresholds)
+
+    _log_event(logger, run_id, "evaluation_complete", "success", sample_count=sample_count, output=result)
+
+    return result
+
+
+async def _score_with_retry(
+    metric: AsyncSampleMetric,
+    sample: EvaluationSample,
+    config: JudgeConcurrencyConfig,
+) -> float:
+    attempt = 0
+    while True:
+        try:
+            return float(await asyncio.wait_for(metric(sample), timeout=config.timeout_s))
+        except Exception:
+            if attempt >= config.max_retries:
+                raise
+        await asyncio.sleep(config.backoff_s * 2**attempt)
+        attempt += 1
+
+
+async def arun_rag_evaluation(
+    samples: list[EvaluationSample],
+    metrics: dict[str, AsyncSampleMetric],
+    thresholds: EvaluationThresholds | None = None,
+    config: JudgeConcurrencyConfig | None = None,
+) -> EvaluationResult:
+    """Evaluate with async per-sample scorers (e.g. LLM judges), at most `max_concurrency` calls in flight.
+
+    Each call is bounded by `timeout_s` and retried with exponential backoff; a call that still
+    fails after `max_retries` fails the whole run.
+    """
+    if not samples:
+        raise ValueError("no samples to evaluate")
+    missing = [name for name in METRIC_NAMES if name not in metrics]
+    if missing:
+        raise ValueError(f"missing metric functions: {missing}")
+
+    thresholds = thresholds or EvaluationThresholds()
+    config = config or JudgeConcurrencyConfig()
+    logger = build_eval_logger()
+    run_id = str(uuid.uuid4())
+
+    _log_event(
+        logger,
+        run_id,
+        "evaluation_start",
+        "pending",
+        sample_count=len(samples),
+        max_concurrency=config.max_concurrency,
+    )
+
+    totals = dict.fromkeys(METRIC_NAMES, 0.0)
+    semaphore = asyncio.Semaphore(config.max_concurrency)
+
+    async def score(name: str, sample: EvaluationSample) -> None:
+        try:
+            value = await _score_with_retry(metrics[name], sample, config)
+            totals[name] += value
+        finally:
+            semaphore.release()
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            for sample in samples:
+                for name in METRIC_NAMES:
+                    await semaphore.acquire()
+                    group.create_task(score(name, sample))
+    except ExceptionGroup as errors:
+        _log_event(
+            logger,
+            run_id,
+            "evaluation_failed",
+            "failure",
+            error_type=type(errors.exceptions[0]).__name__,
+            error_message=str(errors.exceptions[0]),
+        )
+        raise errors.exceptions[0] from errors
+
+    result = _build_result(run_id, {name: total / len(samples) for name, total in totals.items()}, thresholds)
+
+    _log_event(logger, run_id, "evaluation_complete", "success", output=result)
 
     return result
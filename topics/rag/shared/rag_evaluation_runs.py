@@ -0,0 +1,104 @@
+"""Per-sample score vectors for evaluation runs and a vectorized regression diff between runs."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+from pydantic import BaseModel
+
+
+METRIC_NAMES = ("context_precision", "context_recall", "faithfulness", "answer_relevancy")
+SCORES_FILE = "scores.npy"
+SAMPLE_IDS_FILE = "sample_ids.npy"
+
+
+class SampleRegression(BaseModel):
+    sample_id: str
+    metric: str
+    base_score: float
+    head_score: float
+    delta: float
+
+
+def write_run_scores(runs_dir: str, run_id: str, sample_ids: list[str], scores: np.ndarray) -> Path:
+    """Persist an `(n_samples, n_metrics)` float32 matrix with columns in `METRIC_NAMES` order."""
+    if scores.shape != (len(sample_ids), len(METRIC_NAMES)):
+        raise ValueError(f"scores shape {scores.shape} does not match {len(sample_ids)} samples")
+    run_dir = Path(runs_dir) / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+    np.save(run_dir / SCORES_FILE, scores.astype(np.float32, copy=False))
+    np.save(run_dir / SAMPLE_IDS_FILE, np.asarray(sample_ids, dtype=np.str_))
+    return run_dir
+
+
+def load_run_scores(runs_dir: str, run_id: str) -> tuple[np.ndarray, np.ndarray]:
+    """Memory-map a run's sample ids and score matrix without reading them into RAM."""
+    run_dir = Path(runs_dir) / run_id
+    if not (run_dir / SCORES_FILE).exists():
+        raise FileNotFoundError(f"no sample scores recorded for run {run_id} in {runs_dir}")
+    sample_ids = np.load(run_dir / SAMPLE_IDS_FILE, mmap_mode="r")
+    scores = np.load(run_dir / SCORES_FILE, mmap_mode="r")
+    return sample_ids, scores
+
+
+def diff_runs(
+    runs_dir: str,
+    base_run_id: str,
+    head_run_id: str,
+    metric: str = "faithfulness",
+    top_k: int = 20,
+) -> list[SampleRegression]:
+    """Return up to `top_k` samples present in both runs whose `metric` dropped the most."""
+    if metric not in METRIC_NAMES:
+        raise ValueError(f"unknown metric: {metric}")
+    column = METRIC_NAMES.index(metric)
+    base_ids, base_scores = load_run_scores(runs_dir, base_run_id)
+    head_ids, head_scores = load_run_scores(runs_dir, head_run_id)
+
+    if base_ids.shape == head_ids.shape and np.array_equal(base_ids, head_ids):
+        sample_ids = np.asarray(base_ids)
+        base = np.asarray(base_scores[:, column])
+        head = np.asarray(head_scores[:, column])
+    else:
+        sample_ids, base_index, head_index = np.intersect1d(base_ids, head_ids, return_indices=True)
+        base = np.asarray(base_scores[base_index, column])
+        head = np.asarray(head_scores[head_index, column])
+
+    delta = head - base
+    dropped = np.flatnonzero(delta < 0)
+    if dropped.size > top_k:
+        dropped = dropped[np.argpartition(delta[dropped], top_k)[:top_k]]
+    dropped = dropped[np.argsort(delta[dropped], kind="stable")]
+
+    return [
+        SampleRegression(
+            sample_id=str(sample_ids[i]),
+            metric=metric,
+            base_score=float(base[i]),
+            head_score=float(head[i]),
+            delta=float(delta[i]),
+        )
+        for i in dropped
+    ]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="List samples whose scores dropped between two evaluation runs")
+    parser.add_argument("base_run_id", help="Baseline run_id")
+    parser.add_argument("head_run_id", help="Candidate run_id")
+    parser.add_argument("--runs-dir", default="evaluation_runs", help="Directory holding per-run score files")
+    parser.add_argument("--metric", default="faithfulness", choices=METRIC_NAMES)
+    parser.add_argument("--top-k", type=int, default=20, help="Maximum number of regressions to print")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    for regression in diff_runs(args.runs_dir, args.base_run_id, args.head_run_id, args.metric, args.top_k):
+        print(regression.model_dump_json())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Offline deterministic lexical metrics computed over a whole batch with NumPy.
+
+Every text field of a batch is lowercased, joined into one UTF-8 buffer and tokenized with
+array operations: word bytes are ASCII letters, digits, `_` and any non-ASCII byte. Each token
+gets a 64-bit polynomial hash, and each field becomes a sparse binary bag-of-words matrix
+stored as sorted `(row << 40) | token_hash` keys. Set overlaps between fields are then counted
+for every sample at once with `np.intersect1d` and `np.bincount`; no per-sample Python loops.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from pydantic import BaseModel
+
+from .rag_evaluation_runs import METRIC_NAMES
+
+
+_WORD_BYTES = np.zeros(256, dtype=bool)
+_WORD_BYTES[list(b"0123456789abcdefghijklmnopqrstuvwxyz_")] = True
+_WORD_BYTES[128:] = True
+_HASH_BASE = np.uint64(0x100000001B3)
+_HASH_BASE_INVERSE = np.uint64(pow(0x100000001B3, -1, 2**64))
+_ROW_SHIFT = np.uint64(40)
+_HASH_SHIFT = np.uint64(64 - 40)
+_WINDOW_BYTES = 1 << 20
+_power_tables: tuple[np.ndarray, np.ndarray] | None = None
+
+
+def _hash_powers(size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return cached `base**(i + 1)` and `base**-(i + 1)` tables (mod 2**64) of at least `size` entries."""
+    global _power_tables
+    if _power_tables is None or _power_tables[0].size < size:
+        size = max(size, _WINDOW_BYTES)
+        _power_tables = (
+            np.cumprod(np.full(size, _HASH_BASE, dtype=np.uint64)),
+            np.cumprod(np.full(size, _HASH_BASE_INVERSE, dtype=np.uint64)),
+        )
+    return _power_tables
+
+
+def _token_hashes(data: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Hash every `data[start:end]` token, one bounded window of the buffer at a time.
+
+    Within a window, prefix[i] = sum(data[j] * base**(j + 1) for j < i) modulo 2**64; scaling a
+    token's slice by base**-(start + 1) makes its hash independent of where it occurs.
+    """
+    hashes = np.empty(starts.size, dtype=np.uint64)
+    first = 0
+    while first < starts.size:
+        origin = starts[first]
+        last = max(int(np.searchsorted(ends, origin + _WINDOW_BYTES, side="right")), first + 1)
+        window = data[origin:ends[last - 1]]
+        powers, inverse_powers = _hash_powers(window.size)
+        prefix = np.zeros(window.size + 1, dtype=np.uint64)
+        np.cumsum(window * powers[:window.size], out=prefix[1:])
+        local_starts = starts[first:last] - origin
+        local_ends = ends[first:last] - origin
+        hashes[first:last] = (prefix[local_ends] - prefix[local_starts]) * inverse_powers[local_starts]
+        first = last
+    return hashes
+
+
+def _sorted_unique(keys: np.ndarray) -> np.ndarray:
+    keys = np.sort(keys)
+    if keys.size:
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    return keys
+
+
+def _bag_of_words_keys(texts: list[str]) -> np.ndarray:
+    """Encode one text per row as unique sorted sparse keys `(row << 40) | top 40 bits of token hash`."""
+    encoded = [text.lower().encode("utf-8") for text in texts]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    data = np.frombuffer(b" ".join(encoded), dtype=np.uint8)
+    if not data.size:
+        return np.empty(0, dtype=np.uint64)
+
+    edges = np.diff(_WORD_BYTES[data].view(np.int8), prepend=np.int8(0), append=np.int8(0))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    hashes = _token_hashes(data, starts, ends)
+    text_starts = np.cumsum(lengths + 1) - (lengths + 1)
+    rows = (np.searchsorted(text_starts, starts, side="right") - 1).astype(np.uint64)
+    return _sorted_unique((rows << _ROW_SHIFT) | (hashes >> _HASH_SHIFT))
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator > 0)
+
+
+def lexical_sample_scores(samples: list[BaseModel]) -> np.ndarray:
+    """Return an `(n_samples, 4)` float matrix with columns in `METRIC_NAMES` order.
+
+    - context_precision: share of context tokens that occur in the ground truth
+    - context_recall: share of ground-truth tokens covered by the contexts
+    - faithfulness: share of answer tokens supported by the contexts
+    - answer_relevancy: token F1 between answer and ground truth
+    """
+    n = len(samples)
+    answer = _bag_of_words_keys([sample.answer for sample in samples])
+    ground_truth = _bag_of_words_keys([sample.ground_truth for sample in samples])
+    context = _bag_of_words_keys([" ".join(sample.contexts) for sample in samples])
+
+    def counts(keys: np.ndarray) -> np.ndarray:
+        return np.bincount((keys >> _ROW_SHIFT).astype(np.int64), minlength=n).astype(np.float64)
+
+    def overlap(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        return counts(np.intersect1d(left, right, assume_unique=True))
+
+    answer_n, truth_n, context_n = counts(answer), counts(ground_truth), counts(context)
+    context_truth = overlap(context, ground_truth)
+    answer_context = overlap(answer, context)
+    answer_truth = overlap(answer, ground_truth)
+
+    scores = np.empty((n, len(METRIC_NAMES)))
+    scores[:, 0] = _ratio(context_truth, context_n)
+    scores[:, 1] = _ratio(context_truth, truth_n)
+    scores[:, 2] = _ratio(answer_context, answer_n)
+    scores[:, 3] = _ratio(2 * answer_truth, answer_n + truth_n)
+    return scores
+
+
+def lexical_evaluator(samples: list[BaseModel]) -> dict[str, float]:
+    """Batch evaluator for `run_rag_evaluation` / `run_rag_evaluation_stream` with no model calls."""
+    if not samples:
+        raise ValueError("no samples to evaluate")
+    means = lexical_sample_scores(samples).mean(axis=0)
+    return {name: float(value) for name, value in zip(METRIC_NAMES, means)}